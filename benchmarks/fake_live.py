@@ -0,0 +1,142 @@
+"""
+Deterministic stand-in for the Gemini Live API.
+
+``fake_connect(script)`` has the same shape as ``client.aio.live.connect`` and
+yields sessions that answer every user turn with a scripted stream of audio (or
+text) chunks, an output transcription and ``turn_complete``. A user turn ends
+after ``trigger_audio_ms`` of inbound 16 kHz audio, an ``audio_stream_end`` or
+any text input; every
+``tool_call_every`` turns the reply starts with a tool call that has to be
+answered before the audio follows.
+"""
+
+import asyncio
+import itertools
+import math
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Optional
+
+from google.genai import types
+
+INPUT_SAMPLE_RATE = 16000
+OUTPUT_SAMPLE_RATE = 24000
+
+
+@dataclass
+class FakeLiveScript:
+    modality: str = "audio"  # "audio" or "text"
+    connect_ms: float = 150.0  # Simulated TLS + setup handshake
+    first_chunk_ms: float = 300.0  # Model latency from end of user turn to first chunk
+    chunk_interval_ms: float = 20.0  # Delay between streamed chunks
+    response_chunks: int = 25  # Chunks per reply
+    chunk_audio_ms: int = 40  # Audio per chunk
+    trigger_audio_ms: int = 500  # Inbound audio that ends a user turn
+    tool_call_every: int = 0  # Start every Nth reply with a tool call, 0 disables
+    transcript: str = "Hello there, this is a scripted reply from the fake live server."
+
+
+def scripted_pcm(duration_ms: int, frequency: float = 220.0) -> bytes:
+    """
+    16-bit mono sine at 24 kHz, loud enough to pass as speech.
+    """
+    samples = OUTPUT_SAMPLE_RATE * duration_ms // 1000
+    return b"".join(
+        int(8000 * math.sin(2 * math.pi * frequency * i / OUTPUT_SAMPLE_RATE)).to_bytes(2, "little", signed=True)
+        for i in range(samples)
+    )
+
+
+class FakeLiveSession:
+    def __init__(self, script: FakeLiveScript, session_number: int):
+        self.script = script
+        self.session_number = session_number
+        self._turns: asyncio.Queue = asyncio.Queue()
+        self._tool_responses: asyncio.Queue = asyncio.Queue()
+        self._inbound_audio = 0  # bytes of the current user turn
+        self._trigger_bytes = INPUT_SAMPLE_RATE * script.trigger_audio_ms // 1000 * 2
+        self._replies = 0
+        self._sent_handle = False
+        self._chunk = scripted_pcm(script.chunk_audio_ms)
+        self._words = script.transcript.split()
+
+    async def send_realtime_input(
+            self,
+            *,
+            media: Optional[types.Blob] = None,
+            text: Optional[str] = None,
+            audio_stream_end: Optional[bool] = None,
+            **kwargs
+    ):
+        if text:
+            self._turns.put_nowait(True)
+            return
+        if audio_stream_end:
+            if self._inbound_audio:
+                self._inbound_audio = 0
+                self._turns.put_nowait(True)
+            return
+        if media and media.mime_type.startswith("audio/"):
+            self._inbound_audio += len(media.data)
+            if self._inbound_audio >= self._trigger_bytes:
+                self._inbound_audio = 0
+                self._turns.put_nowait(True)
+
+    async def send_tool_response(self, *, function_responses=None, **kwargs):
+        self._tool_responses.put_nowait(function_responses)
+
+    def _content_message(self, index: int) -> types.LiveServerMessage:
+        if self.script.modality == "text":
+            word = self._words[index % len(self._words)]
+            part = types.Part(text=word + " ")
+        else:
+            part = types.Part(inline_data=types.Blob(data=self._chunk, mime_type=f"audio/pcm;rate={OUTPUT_SAMPLE_RATE}"))
+        return types.LiveServerMessage(server_content=types.LiveServerContent(model_turn=types.Content(role="model", parts=[part])))
+
+    async def receive(self):
+        if not self._sent_handle:
+            self._sent_handle = True
+            yield types.LiveServerMessage(session_resumption_update=types.LiveServerSessionResumptionUpdate(
+                new_handle=f"fake-handle-{self.session_number}", resumable=True
+            ))
+
+        await self._turns.get()
+        self._replies += 1
+        await asyncio.sleep(self.script.first_chunk_ms / 1000)
+
+        if self.script.tool_call_every and self._replies % self.script.tool_call_every == 0:
+            yield types.LiveServerMessage(tool_call=types.LiveServerToolCall(function_calls=[
+                types.FunctionCall(id=f"call-{self.session_number}-{self._replies}", name="turn_on_the_lights", args={})
+            ]))
+            await self._tool_responses.get()
+
+        for index in range(self.script.response_chunks):
+            if index:
+                await asyncio.sleep(self.script.chunk_interval_ms / 1000)
+            yield self._content_message(index)
+
+        yield types.LiveServerMessage(server_content=types.LiveServerContent(
+            output_transcription=types.Transcription(text=self.script.transcript)
+        ))
+        yield types.LiveServerMessage(server_content=types.LiveServerContent(turn_complete=True))
+
+    async def close(self):
+        pass
+
+
+def fake_connect(script: FakeLiveScript):
+    """
+    Build a drop-in replacement for ``client.aio.live.connect``.
+    """
+    counter = itertools.count(1)
+
+    @asynccontextmanager
+    async def connect(*, model: str, config: types.LiveConnectConfig):
+        await asyncio.sleep(script.connect_ms / 1000)
+        session = FakeLiveSession(script, next(counter))
+        try:
+            yield session
+        finally:
+            await session.close()
+
+    return connect
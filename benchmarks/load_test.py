@@ -0,0 +1,416 @@
+"""
+End-to-end load test for ``/api/ws/live``.
+
+The API runs in-process on a background thread with ``client.aio.live.connect``
+swapped for the scripted fake in ``fake_live.py``, so no Gemini quota is used.
+Simulated browsers open sessions, stream 16 kHz PCM (plus the odd JPEG frame)
+until the fake server answers, and time the reply. Lip-sync alignment is
+replaced by a fixed delay unless ``--real-lipsync`` is given.
+
+The report is printed as JSON and optionally written to ``--output``::
+
+    python benchmarks/load_test.py --clients 20 --sessions 200 --output results.json
+"""
+
+import asyncio
+import base64
+import io
+import json
+import logging
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from importlib import metadata
+from pathlib import Path
+from typing import List, Optional
+
+# api.py builds a Gemini client at import time; the fake server never uses the key
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import typer
+import uvicorn
+import websockets
+from PIL import Image
+from typing_extensions import Annotated
+
+from fake_live import FakeLiveScript, fake_connect
+from gemini_live_avatar import api as api_module
+from gemini_live_avatar.app import app
+from gemini_live_avatar.config import RuntimeConfig, RuntimeConfigStore
+from gemini_live_avatar.framing import FRAMING_BINARY, FRAMING_JSON, FrameKind, decode_frame, encode_frame
+from gemini_live_avatar.inference import ModelState
+from gemini_live_avatar.lipsync import empty_word_timings
+
+INPUT_SAMPLE_RATE = 16000
+
+
+class FakeAligner:
+    """
+    Lip-sync executor stand-in that answers every job after a fixed delay.
+    """
+
+    def __init__(self, align_ms: float):
+        self.align_ms = align_ms
+        self.model_state = ModelState.READY
+        self.model_error = None
+        self.queue_depth = 0
+        self.running = 0
+
+    @property
+    def is_ready(self) -> bool:
+        return True
+
+    async def submit(self, pcm: bytes, transcript=None, language=None, timeout=None, on_start=None, fast=False) -> dict:
+        if on_start:
+            on_start()
+        self.running += 1
+        try:
+            await asyncio.sleep(self.align_ms / 1000)
+        finally:
+            self.running -= 1
+        return empty_word_timings()
+
+    async def warmup(self, languages: List[str]) -> None:
+        pass
+
+    def snapshot(self) -> dict:
+        return {"model_state": self.model_state, "fake": True}
+
+    async def close(self) -> None:
+        pass
+
+
+def percentiles(values: List[float]) -> dict:
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def nearest_rank(p: float) -> float:
+        return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+    return {
+        "count": len(ordered),
+        "p50": round(nearest_rank(50), 2),
+        "p95": round(nearest_rank(95), 2),
+        "p99": round(nearest_rank(99), 2),
+        "max": round(ordered[-1], 2),
+        "mean": round(sum(ordered) / len(ordered), 2),
+    }
+
+
+async def monitor_loop_lag(samples: List[float], interval: float = 0.01) -> None:
+    """
+    Record how late the event loop wakes up from a fixed sleep, in milliseconds.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        started_at = loop.time()
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, (loop.time() - started_at - interval) * 1000))
+
+
+class ServerThread(threading.Thread):
+    """
+    Runs the app under uvicorn on its own event loop, sampling that loop's lag.
+    """
+
+    def __init__(self, port: int):
+        super().__init__(name="benchmark-server", daemon=True)
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", ws_max_size=16 * 1024 * 1024))
+        self.lag_samples: List[float] = []
+
+    def run(self) -> None:
+        asyncio.run(self._serve())
+
+    async def _serve(self) -> None:
+        monitor = asyncio.create_task(monitor_loop_lag(self.lag_samples))
+        try:
+            await self.server.serve()
+        finally:
+            monitor.cancel()
+
+    def wait_started(self, timeout: float = 30.0) -> None:
+        deadline = time.monotonic() + timeout
+        while not self.server.started:
+            if time.monotonic() > deadline or not self.is_alive():
+                raise RuntimeError("Benchmark server did not start")
+            time.sleep(0.05)
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        self.join(timeout=30)
+
+
+@dataclass
+class LoadStats:
+    sessions_started: int = 0
+    sessions_completed: int = 0
+    sessions_failed: int = 0
+    turns_completed: int = 0
+    messages_sent: int = 0
+    messages_received: int = 0
+    time_to_first_audio_ms: List[float] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+
+def make_test_media(chunk_ms: int) -> tuple[bytes, bytes]:
+    """
+    A chunk of 16 kHz PCM (a quiet tone) and a small JPEG camera frame.
+    """
+    samples = INPUT_SAMPLE_RATE * chunk_ms // 1000
+    pcm = b"".join(
+        int(2000 * math.sin(2 * math.pi * 180 * i / INPUT_SAMPLE_RATE)).to_bytes(2, "little", signed=True)
+        for i in range(samples)
+    )
+    buffer = io.BytesIO()
+    Image.new("RGB", (640, 480), (90, 120, 150)).save(buffer, format="JPEG", quality=70)
+    return pcm, buffer.getvalue()
+
+
+class SimulatedClient:
+    def __init__(self, url: str, stats: LoadStats, modality: str, binary: bool, turn_timeout: float):
+        self.url = url
+        self.stats = stats
+        self.modality = modality
+        self.binary = binary
+        self.turn_timeout = turn_timeout
+        self._acked = asyncio.Event()
+        self._turn_done = asyncio.Event()
+        self._turn_started_at: Optional[float] = None
+        self._responded = False
+        self._turn_complete = False
+
+    async def _send_media(self, ws, kind: FrameKind, payload: bytes, binary: bool) -> None:
+        if binary:
+            await ws.send(encode_frame(kind, payload))
+        else:
+            message_type = "audio" if kind == FrameKind.AUDIO else "image"
+            await ws.send(json.dumps({"type": message_type, "data": base64.b64encode(payload).decode("ascii")}))
+        self.stats.messages_sent += 1
+
+    def _on_response(self) -> None:
+        if not self._responded and self._turn_started_at is not None:
+            self._responded = True
+            self.stats.time_to_first_audio_ms.append((time.perf_counter() - self._turn_started_at) * 1000)
+
+    async def _receive(self, ws) -> None:
+        async for message in ws:
+            self.stats.messages_received += 1
+            if isinstance(message, bytes):
+                kind, _, _ = decode_frame(message)
+                if kind == FrameKind.AUDIO:
+                    self._on_response()
+            else:
+                data = json.loads(message)
+                match data.get("type"):
+                    case "config_ack":
+                        self._acked.set()
+                    case "audio":
+                        self._on_response()
+                    case "text" if self.modality == "text":
+                        self._on_response()
+                    case "turn_complete":
+                        self._turn_complete = True
+                    case "error":
+                        self.stats.errors.append(str(data.get("data")))
+            if self._turn_complete and self._responded:
+                self._turn_done.set()
+
+    async def run_session(self, turns: int, chunks_per_turn: int, chunk_ms: float, image_every: int, pcm: bytes, jpeg: bytes) -> None:
+        self.stats.sessions_started += 1
+        async with websockets.connect(self.url, max_size=None) as ws:
+            config = json.loads(await ws.recv())
+            self.stats.messages_received += 1
+            binary = self.binary and FRAMING_BINARY in config.get("framing", [])
+            await ws.send(json.dumps({"type": "config", "data": {"framing": FRAMING_BINARY if binary else FRAMING_JSON}}))
+            self.stats.messages_sent += 1
+
+            receiver = asyncio.create_task(self._receive(ws))
+            try:
+                await asyncio.wait_for(self._acked.wait(), timeout=self.turn_timeout)
+                for _ in range(turns):
+                    self._turn_done.clear()
+                    self._responded = self._turn_complete = False
+                    self._turn_started_at = None
+                    for index in range(chunks_per_turn):
+                        await self._send_media(ws, FrameKind.AUDIO, pcm, binary)
+                        if index == chunks_per_turn - 1:
+                            # The fake server answers once the last chunk of the turn is in
+                            self._turn_started_at = time.perf_counter()
+                        if image_every and index % image_every == 0:
+                            await self._send_media(ws, FrameKind.IMAGE, jpeg, binary)
+                        await asyncio.sleep(chunk_ms / 1000)
+                    await asyncio.wait_for(self._turn_done.wait(), timeout=self.turn_timeout)
+                    self.stats.turns_completed += 1
+            finally:
+                receiver.cancel()
+                await asyncio.gather(receiver, return_exceptions=True)
+        self.stats.sessions_completed += 1
+
+
+async def drive_load(
+        url: str,
+        stats: LoadStats,
+        clients: int,
+        sessions: int,
+        turns: int,
+        chunks_per_turn: int,
+        chunk_ms: float,
+        image_every: int,
+        modality: str,
+        binary: bool,
+        turn_timeout: float
+) -> None:
+    pcm, jpeg = make_test_media(int(chunk_ms) or 20)
+    remaining = iter(range(sessions))
+
+    async def client_loop() -> None:
+        for _ in remaining:
+            client = SimulatedClient(url, stats, modality, binary, turn_timeout)
+            try:
+                await client.run_session(turns, chunks_per_turn, chunk_ms, image_every, pcm, jpeg)
+            except Exception as e:
+                stats.sessions_failed += 1
+                stats.errors.append(f"{type(e).__name__}: {e}")
+
+    await asyncio.gather(*(client_loop() for _ in range(clients)))
+
+
+def main(
+    clients: Annotated[int, typer.Option("--clients", help="Concurrent simulated browsers")] = 10,
+    sessions: Annotated[int, typer.Option("--sessions", help="Total sessions to run")] = 50,
+    turns: Annotated[int, typer.Option("--turns", help="User turns per session")] = 3,
+    chunk_ms: Annotated[float, typer.Option("--chunk-ms", help="Audio per inbound chunk, also the send interval")] = 20.0,
+    chunks_per_turn: Annotated[int, typer.Option("--chunks-per-turn", help="Inbound audio chunks per user turn")] = 25,
+    image_every: Annotated[int, typer.Option("--image-every", help="Send a JPEG frame every N audio chunks (0 disables)")] = 25,
+    modality: Annotated[str, typer.Option("--modality", help="Response modality: audio or text")] = "audio",
+    stream_audio: Annotated[bool, typer.Option("--stream-audio", help="Run the server with --stream-audio")] = False,
+    binary: Annotated[bool, typer.Option("--binary/--json", help="Negotiate binary media frames")] = True,
+    align_ms: Annotated[float, typer.Option("--align-ms", help="Simulated lip-sync alignment time")] = 150.0,
+    real_lipsync: Annotated[bool, typer.Option("--real-lipsync", help="Use the real lip-sync executor (needs whisperx)")] = False,
+    connect_ms: Annotated[float, typer.Option("--connect-ms", help="Simulated Live connect latency")] = 150.0,
+    first_chunk_ms: Annotated[float, typer.Option("--first-chunk-ms", help="Simulated model latency")] = 300.0,
+    response_chunks: Annotated[int, typer.Option("--response-chunks", help="Chunks per scripted reply")] = 25,
+    response_interval_ms: Annotated[float, typer.Option("--response-interval-ms", help="Delay between scripted reply chunks")] = 20.0,
+    tool_call_every: Annotated[int, typer.Option("--tool-call-every", help="Start every Nth reply with a tool call (0 disables)")] = 0,
+    live_pool_size: Annotated[int, typer.Option("--live-pool-size", help="Pre-warmed Live sessions on the server")] = 0,
+    input_vad: Annotated[bool, typer.Option("--input-vad", help="Run the server with the inbound VAD gate")] = False,
+    input_audio_frame_ms: Annotated[int, typer.Option("--input-audio-frame-ms", help="Server-side regrouping of inbound audio (0 disables)")] = 0,
+    video_transcode: Annotated[bool, typer.Option("--video-transcode", help="Run the server with the camera frame transcode stage")] = False,
+    turn_timeout: Annotated[float, typer.Option("--turn-timeout", help="Seconds to wait for a reply")] = 30.0,
+    port: Annotated[int, typer.Option("--port", help="Port for the in-process server")] = 8765,
+    output: Annotated[Optional[Path], typer.Option("--output", help="Write the JSON report to this file")] = None,
+    verbose: Annotated[bool, typer.Option("--verbose", help="Keep the server's info logging")] = False,
+) -> None:
+    """
+    Run the load test and print a JSON report.
+    """
+    if not verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+        logging.getLogger("rich").setLevel(logging.WARNING)
+
+    runtime_config = RuntimeConfig(
+        response_modality=modality,
+        stream_audio=stream_audio,
+        binary_frames=binary,
+        live_pool_size=live_pool_size,
+        input_vad=input_vad,
+        input_audio_frame_ms=input_audio_frame_ms,
+        video_transcode=video_transcode,
+        lipsync_use_transcript=True,
+    )
+    config_dir = tempfile.mkdtemp(prefix="gemini-live-avatar-bench-")
+    config_path = Path(config_dir, "runtime_config.json")
+    config_path.write_text(runtime_config.model_dump_json(indent=4))
+
+    script = FakeLiveScript(
+        modality=modality,
+        connect_ms=connect_ms,
+        first_chunk_ms=first_chunk_ms,
+        chunk_interval_ms=response_interval_ms,
+        response_chunks=response_chunks,
+        trigger_audio_ms=int(chunks_per_turn * chunk_ms),
+        tool_call_every=tool_call_every,
+    )
+    api_module.live_connect = fake_connect(script)
+    api_module.runtime_config_store = RuntimeConfigStore(config_path)
+    if not real_lipsync:
+        api_module.lipsync_executor = FakeAligner(align_ms)
+
+    server = ServerThread(port)
+    server.start()
+    server.wait_started()
+
+    stats = LoadStats()
+    server.lag_samples.clear()  # ignore startup
+    started_at = time.perf_counter()
+    try:
+        asyncio.run(drive_load(
+            url=f"ws://127.0.0.1:{port}/api/ws/live",
+            stats=stats,
+            clients=clients,
+            sessions=sessions,
+            turns=turns,
+            chunks_per_turn=chunks_per_turn,
+            chunk_ms=chunk_ms,
+            image_every=image_every,
+            modality=modality,
+            binary=binary,
+            turn_timeout=turn_timeout
+        ))
+    finally:
+        duration = time.perf_counter() - started_at
+        server.stop()
+
+    try:
+        version = metadata.version("gemini-live-avatar")
+    except metadata.PackageNotFoundError:
+        version = None
+
+    report = {
+        "version": version,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "parameters": {
+            "clients": clients,
+            "sessions": sessions,
+            "turns": turns,
+            "chunk_ms": chunk_ms,
+            "chunks_per_turn": chunks_per_turn,
+            "image_every": image_every,
+            "binary": binary,
+            "real_lipsync": real_lipsync,
+            "align_ms": None if real_lipsync else align_ms,
+            "runtime_config": runtime_config.model_dump(),
+            "script": asdict(script),
+        },
+        "duration_s": round(duration, 3),
+        "sessions": {
+            "started": stats.sessions_started,
+            "completed": stats.sessions_completed,
+            "failed": stats.sessions_failed,
+            "per_second": round(stats.sessions_completed / duration, 3),
+        },
+        "turns_completed": stats.turns_completed,
+        "messages": {
+            "sent": stats.messages_sent,
+            "received": stats.messages_received,
+            "per_second": round((stats.messages_sent + stats.messages_received) / duration, 1),
+        },
+        "time_to_first_audio_ms": percentiles(stats.time_to_first_audio_ms),
+        "event_loop_lag_ms": percentiles(server.lag_samples),
+        "errors": stats.errors[:20],
+    }
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if output:
+        output.write_text(text + "\n")
+
+
+if __name__ == "__main__":
+    typer.run(main)
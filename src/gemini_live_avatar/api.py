@@ -1,39 +1,60 @@
 # ... [imports remain unchanged] ...
 import asyncio
 import base64
-import io
+import functools
 import json
 import logging
 import os
-import tempfile
+import time
 import traceback
 import uuid
-import wave
-from asyncio import to_thread
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Tuple, Union, List
+from typing import Any, Optional, Tuple, Union, List
 
 from dotenv import load_dotenv, find_dotenv
-from fastapi import FastAPI, WebSocket
+from fastapi import FastAPI, Response, WebSocket, status
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.params import Depends
 from google import genai
 from google.genai import types
 from google.genai.types import (
     LiveConnectConfig, Modality, LiveServerContent, RealtimeInputConfig, AutomaticActivityDetection, StartSensitivity,
-    EndSensitivity, AudioTranscriptionConfig, LiveServerMessage, SpeechConfig, VoiceConfig, PrebuiltVoiceConfig
+    EndSensitivity, AudioTranscriptionConfig, LiveServerMessage, SpeechConfig, VoiceConfig, PrebuiltVoiceConfig,
+    SessionResumptionConfig, ContextWindowCompressionConfig, SlidingWindow
 )
-from starlette.websockets import WebSocketDisconnect
-
-from gemini_live_avatar.config import RuntimeConfig
-from gemini_live_avatar.mcp_server import MCPClient
-from gemini_live_avatar.session import SessionState, create_session, remove_session
-from gemini_live_avatar.word_generator import WordGenerator
+from starlette.websockets import WebSocketDisconnect, WebSocketState
+
+from gemini_live_avatar.config import RuntimeConfig, RuntimeConfigStore
+from gemini_live_avatar.framing import FRAMING_BINARY, FRAMING_JSON, FrameError, FrameKind, decode_frame, encode_frame
+from gemini_live_avatar.ingest import STREAM_END, AudioIngest, FrameTranscoder, VideoIngest, VoiceActivityGate
+from gemini_live_avatar.inference import InferenceExecutor, LipSyncBusyError, LipSyncTimeoutError, ModelState
+from gemini_live_avatar.live_pool import LiveSessionPool
+from gemini_live_avatar.lipsync import (
+    AdaptiveLipSyncPolicy, LipSyncCache, LipSyncTier, PauseSegmenter, StreamingAligner, signal_word_timings
+)
+from gemini_live_avatar.metrics import (
+    ALIGNMENT_SECONDS, LIPSYNC_TIER_TOTAL, REGISTRY, SEND_LATENCY, TIME_TO_FIRST_AUDIO, TurnTimeline
+)
+from gemini_live_avatar.mcp_server import MCPClient, MCPClientPool, MCPUnavailableError, PooledMCPClient
+from gemini_live_avatar.model_server import RemoteInferenceExecutor
+from gemini_live_avatar.outbound import TextCoalescer
+from gemini_live_avatar.session import SessionState, active_sessions, create_session, remove_session
+from gemini_live_avatar.tool_executor import ToolExecutor, ToolResultCache
+from gemini_live_avatar.visemes import VisemeAnalyzer
 
 # Load environment variables
 load_dotenv(find_dotenv())
 client = genai.Client(api_key=os.environ.get("GEMINI_API_KEY"), vertexai=False)
-word_generator = WordGenerator(model_size="small", compute_type="float32")
+live_connect = client.aio.live.connect
+live_session_pool: Optional[LiveSessionPool] = None
+lipsync_executor: Optional[Union[InferenceExecutor, RemoteInferenceExecutor]] = None
+lipsync_cache: Optional[LipSyncCache] = None
+lipsync_policy: Optional[AdaptiveLipSyncPolicy] = None
+mcp_pools: dict[str, MCPClientPool] = {}
+tool_caches: dict[str, Optional[ToolResultCache]] = {}
+media_executor: Optional[ThreadPoolExecutor] = None
 
 
 task_registry: set[asyncio.Task] = set()
@@ -42,14 +63,14 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("rich")
 
 
+runtime_config_store = RuntimeConfigStore()
+
+
 def get_runtime_config() -> RuntimeConfig:
     """
-    Get the runtime configuration for the application.
-    This function can be extended to load configurations from a file or environment variables.
+    Get the current runtime configuration snapshot, without touching disk.
     """
-    with open("runtime_config.json", "r") as f:
-        data = json.load(f)
-    return RuntimeConfig(**data)
+    return runtime_config_store.current
 
 
 async def lifespan(app: FastAPI):
@@ -57,16 +78,69 @@ async def lifespan(app: FastAPI):
     Application lifespan handler
     """
     logger.info("Starting Gemini Live Avatar API")
+    runtime_config_store.start_watching()
+    runtime_config = get_runtime_config()
+    if needs_lipsync(runtime_config) and runtime_config.lipsync_warmup:
+        # Load the models in the background; /ready reports when they are warm
+        executor = get_lipsync_executor(runtime_config)
+        task_registry.add(asyncio.create_task(executor.warmup([runtime_config.lipsync_language])))
     yield
     logger.info("Shutting down Gemini Live Avatar API")
+    await runtime_config_store.stop_watching()
+    if lipsync_executor:
+        await lipsync_executor.close()
+    for pool in mcp_pools.values():
+        await pool.close()
+    mcp_pools.clear()
+    if live_session_pool:
+        await live_session_pool.close()
+    if media_executor:
+        media_executor.shutdown(wait=False, cancel_futures=True)
     for task in task_registry:
         task.cancel()
         try:
             await task
         except asyncio.CancelledError:
             logger.info("Cancelled task successfully.")
+        except Exception as e:
+            logger.error(f"Task ended with an error: {e}")
 
 
+REGISTRY.gauge(
+    "gemini_avatar_active_sessions", "Open avatar WebSocket sessions.",
+    lambda: len(active_sessions)
+)
+REGISTRY.gauge(
+    "gemini_avatar_lipsync_queue_depth", "Lip-sync jobs waiting in the executor queue.",
+    lambda: getattr(lipsync_executor, "queue_depth", 0)
+)
+REGISTRY.gauge(
+    "gemini_avatar_lipsync_running", "Lip-sync jobs currently running.",
+    lambda: getattr(lipsync_executor, "running", 0)
+)
+REGISTRY.gauge(
+    "gemini_avatar_lipsync_tier_level", "Current adaptive lip-sync tier, 0 is full quality.",
+    lambda: lipsync_policy.level if lipsync_policy else 0
+)
+REGISTRY.gauge(
+    "gemini_avatar_tool_calls_running", "Function calls currently executing across sessions.",
+    lambda: sum(s.tool_executor.running for s in active_sessions.values() if s.tool_executor)
+)
+REGISTRY.gauge(
+    "gemini_avatar_mcp_pool_connections", "Open MCP connections per pool.",
+    lambda: {(path,): pool.snapshot()["size"] for path, pool in mcp_pools.items()},
+    label_names=("config",)
+)
+REGISTRY.gauge(
+    "gemini_avatar_mcp_pool_inflight", "MCP calls in flight per pool.",
+    lambda: {(path,): pool.snapshot()["inflight"] for path, pool in mcp_pools.items()},
+    label_names=("config",)
+)
+REGISTRY.gauge(
+    "gemini_avatar_live_pool_idle", "Pre-warmed Gemini Live sessions waiting to be handed out.",
+    lambda: sum(live_session_pool.snapshot()["idle"].values()) if live_session_pool else 0
+)
+
 api = FastAPI(root_path="/api", lifespan=lifespan)
 api.add_middleware(
     CORSMiddleware,
@@ -95,6 +169,71 @@ def get_system_instruction():
 async def read_root():
     return {"message": "Welcome to the Gemini Live Avatar API!"}
 
+
+@api.get("/ready")
+async def readiness(response: Response, runtime_config: RuntimeConfig = Depends(get_runtime_config)):
+    """
+    Readiness probe. When lip-sync warmup is enabled, the worker only reports ready
+    once its models are loaded, so a load balancer can hold traffic until then.
+    """
+    lipsync = needs_lipsync(runtime_config)
+    state = lipsync_executor.model_state if lipsync_executor else ModelState.UNLOADED
+    ready = not (lipsync and runtime_config.lipsync_warmup) or state == ModelState.READY
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {
+        "ready": ready,
+        "lipsync": {
+            "required": lipsync,
+            "model_state": state,
+            "error": lipsync_executor.model_error if lipsync_executor else None,
+        }
+    }
+
+
+@api.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Latency histograms and load gauges in the Prometheus text format.
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+@api.get("/lipsync/stats")
+async def lipsync_stats():
+    """
+    Queue depth, wait times and job counters of the lip-sync executor, plus cache hit rates.
+    """
+    return {
+        "executor": lipsync_executor.snapshot() if lipsync_executor else {},
+        "cache": lipsync_cache.snapshot() if lipsync_cache else {},
+        "adaptive": lipsync_policy.snapshot() if lipsync_policy else {},
+    }
+
+
+@api.get("/mcp/stats")
+async def mcp_stats():
+    """
+    Size, health and in-flight calls of the shared MCP connection pools.
+    """
+    return {path: pool.snapshot() for path, pool in mcp_pools.items()}
+
+
+@api.get("/live/stats")
+async def live_stats():
+    """
+    Idle sessions and hit rate of the pre-warmed Live session pool.
+    """
+    return live_session_pool.snapshot() if live_session_pool else {}
+
+
+@api.get("/tools/stats")
+async def tool_stats():
+    """
+    Per-tool hit rates of the tool result caches.
+    """
+    return {path: cache.snapshot() for path, cache in tool_caches.items() if cache}
+
 async def send_error_message(ws: WebSocket, error_data: dict):
     try:
         await ws.send_json({"type": "error", "data": error_data})
@@ -113,34 +252,55 @@ async def send_debug_message(ws: WebSocket, debug_data: dict):
     except Exception as e:
         logger.error(f"Failed to send debug message: {e}")
 
-async def create_gemini_live_session(tools, runtime_config):
+def get_live_session_pool(runtime_config: RuntimeConfig) -> LiveSessionPool:
+    """
+    Get the process-wide pool of pre-connected Live sessions, creating it on first use.
+    """
+    global live_session_pool
+    if live_session_pool is None:
+        live_session_pool = LiveSessionPool(
+            # Looked up at call time so tests and benchmarks can swap in a fake endpoint
+            connect=lambda **kwargs: live_connect(**kwargs),
+            size=runtime_config.live_pool_size,
+            max_age=runtime_config.live_pool_max_age
+        )
+    return live_session_pool
+
+
+async def create_gemini_live_session(tools, runtime_config, resumption_handle: Optional[str] = None):
 
     logger.info(f"Creating session with Gemini Live using configurations: {runtime_config}")
     response_modalities = [Modality.AUDIO]  if runtime_config.response_modality == "audio"  else [Modality.TEXT]
 
-    return client.aio.live.connect(
-        model=runtime_config.model_name,
-        config=LiveConnectConfig(
-            tools=tools,
-            system_instruction=get_system_instruction(),
-            response_modalities=response_modalities,
-            output_audio_transcription=AudioTranscriptionConfig(),
-            speech_config=SpeechConfig(
-                voice_config=VoiceConfig(
-                    prebuilt_voice_config=PrebuiltVoiceConfig(
-                        voice_name="Kore"
-                    )
-                )
-            ),
-            realtime_input_config=RealtimeInputConfig(
-                automatic_activity_detection=AutomaticActivityDetection(
-                    disabled=False,
-                    start_of_speech_sensitivity=StartSensitivity.START_SENSITIVITY_LOW,
-                    end_of_speech_sensitivity=EndSensitivity.END_SENSITIVITY_LOW,
+    config = LiveConnectConfig(
+        tools=tools,
+        system_instruction=get_system_instruction(),
+        response_modalities=response_modalities,
+        output_audio_transcription=AudioTranscriptionConfig(),
+        speech_config=SpeechConfig(
+            voice_config=VoiceConfig(
+                prebuilt_voice_config=PrebuiltVoiceConfig(
+                    voice_name="Kore"
                 )
             )
-        )
+        ),
+        realtime_input_config=RealtimeInputConfig(
+            automatic_activity_detection=AutomaticActivityDetection(
+                disabled=False,
+                start_of_speech_sensitivity=StartSensitivity.START_SENSITIVITY_LOW,
+                end_of_speech_sensitivity=EndSensitivity.END_SENSITIVITY_LOW,
+            )
+        ),
+        session_resumption=SessionResumptionConfig(handle=resumption_handle) if runtime_config.live_session_resumption else None,
+        context_window_compression=ContextWindowCompressionConfig(
+            trigger_tokens=runtime_config.live_compression_trigger_tokens,
+            sliding_window=SlidingWindow(target_tokens=runtime_config.live_compression_target_tokens)
+        ) if runtime_config.live_context_compression else None
     )
+    # Resumed sessions carry their own handle, so they can't come from the pool
+    if runtime_config.live_pool_size > 0 and not resumption_handle:
+        return get_live_session_pool(runtime_config).acquire(model=runtime_config.model_name, config=config)
+    return live_connect(model=runtime_config.model_name, config=config)
 
 def get_default_tools() -> list[types.Tool]:
     """
@@ -183,14 +343,32 @@ def get_default_tools() -> list[types.Tool]:
 
     return default_tools
 
-async def get_mcp_tools(mcp_server_config_path: Union[Path, str]) -> Tuple[MCPClient, list[types.Tool]]:
+def get_mcp_pool(runtime_config: RuntimeConfig) -> MCPClientPool:
     """
-    Placeholder for fetching MCP tools if needed.
+    Get the process-wide MCP connection pool for the configured server, creating it on first use.
+    """
+    config_path = runtime_config.mcp_server_config
+    if config_path not in mcp_pools:
+        mcp_pools[config_path] = MCPClientPool.from_json_config(
+            config_path,
+            max_size=runtime_config.mcp_pool_size,
+            health_check_interval=runtime_config.mcp_health_check_interval,
+            tools_ttl=runtime_config.mcp_tools_ttl
+        )
+    return mcp_pools[config_path]
+
+
+async def get_mcp_tools(runtime_config: RuntimeConfig) -> Tuple[Union[MCPClient, PooledMCPClient], list[types.Tool]]:
+    """
+    Connect to the MCP server, through the shared pool unless pooling is disabled, and list its tools.
     """
     tools = []
     try:
-        mcp_server = MCPClient.from_json_config(mcp_server_config_path)
-        await mcp_server.connect_to_server()
+        if runtime_config.mcp_pool_size > 0:
+            mcp_server = PooledMCPClient(get_mcp_pool(runtime_config))
+        else:
+            mcp_server = MCPClient.from_json_config(runtime_config.mcp_server_config, tools_ttl=runtime_config.mcp_tools_ttl)
+            await mcp_server.connect_to_server()
         mcp_tools = await mcp_server.get_tools_for_gemini()
         if mcp_tools:
             logger.info(f"Using MCP tools: {[tool.function_declarations[0].name for tool in mcp_tools]}")
@@ -201,7 +379,7 @@ async def get_mcp_tools(mcp_server_config_path: Union[Path, str]) -> Tuple[MCPCl
         raise
 
 
-async def get_avatar_tools(runtime_config, ws) -> Tuple[MCPClient, List[types.Tool]]:
+async def get_avatar_tools(runtime_config, ws) -> Tuple[Union[MCPClient, PooledMCPClient, None], List[types.Tool]]:
     """
     Initialize and return the list of tools for the avatar session.
 
@@ -209,7 +387,7 @@ async def get_avatar_tools(runtime_config, ws) -> Tuple[MCPClient, List[types.To
         Tuple containing the initialized MCPClient (if any) and the list of tools.
     """
     tools= []
-    mcp_client: MCPClient | None = None
+    mcp_client: MCPClient | PooledMCPClient | None = None
 
     # Load default tools
     tools.extend(get_default_tools())
@@ -218,7 +396,7 @@ async def get_avatar_tools(runtime_config, ws) -> Tuple[MCPClient, List[types.To
     if runtime_config.mcp_server_config:
         logger.info("MCP Server configuration found. Initializing MCP client.")
         try:
-            mcp_client, mcp_tools = await get_mcp_tools(runtime_config.mcp_server_config)
+            mcp_client, mcp_tools = await get_mcp_tools(runtime_config)
             tools.extend(mcp_tools)
 
             await send_debug_message(ws, {
@@ -228,6 +406,13 @@ async def get_avatar_tools(runtime_config, ws) -> Tuple[MCPClient, List[types.To
                 ),
                 "action": "You can now use the available tools."
             })
+        except MCPUnavailableError as e:
+            logger.warning(f"⚠️ Starting the session without MCP tools: {e}")
+            await send_error_message(ws, {
+                "message": f"❌ MCP server is unavailable, continuing without its tools: {e}",
+                "action": "The server keeps reconnecting; tools return on the next session.",
+                "error_type": "mcp_connection"
+            })
         except Exception as e:
             logger.exception("Failed to load MCP server tools.")
             await send_error_message(ws, {
@@ -256,16 +441,15 @@ async def websocket_receiver(ws: WebSocket, runtime_config: RuntimeConfig = Depe
             "ttsApikey": os.environ.get("TTS_API_KEY"),
             "ttsLang": runtime_config.tts_lang,
             "ttsVoice": runtime_config.tts_voice,
-            "avatarPath": runtime_config.avatar_path
+            "avatarPath": runtime_config.avatar_path,
+            "framing": [FRAMING_JSON, FRAMING_BINARY] if runtime_config.binary_frames else [FRAMING_JSON]
         })
         logger.info(f"🌐 WebSocket connection accepted for session {session_id}")
 
         mcp_server_client, avatar_tools = await get_avatar_tools(runtime_config, ws)
         session.mcp_server_client = mcp_server_client
 
-        async with await create_gemini_live_session(tools=avatar_tools, runtime_config=runtime_config) as live_session:
-            session.live_session = live_session
-            await handle_messages(ws, session, runtime_config)
+        await handle_messages(ws, session, runtime_config, avatar_tools)
     except asyncio.TimeoutError:
         await send_error_message(ws, {
             "message": "Session timed out.",
@@ -293,12 +477,110 @@ async def websocket_receiver(ws: WebSocket, runtime_config: RuntimeConfig = Depe
 
 
 
-async def handle_messages(ws: WebSocket, session: SessionState, runtime_config: RuntimeConfig):
+async def run_live_session(ws: WebSocket, session: SessionState, runtime_config: RuntimeConfig, avatar_tools: list):
+    """
+    Keep a Gemini Live session open for the lifetime of the WebSocket.
+
+    When the stream drops or Gemini announces a GoAway, the session is reopened
+    with the latest resumption handle so the conversation context survives.
+    Realtime input arriving in the meantime is buffered and replayed.
+    """
+    attempts = 0
+    connected_once = False
+    while True:
+        try:
+            async with await create_gemini_live_session(
+                    tools=avatar_tools,
+                    runtime_config=runtime_config,
+                    resumption_handle=session.resumption_handle
+            ) as live_session:
+                session.live_session = live_session
+                # Input arriving during the replay is buffered behind it, then the session goes live
+                await flush_pending_input(session)
+                session.live_connected.set()
+                connected_once = True
+                if attempts:
+                    logger.info(f"🔁 Live session resumed after {attempts} attempt(s)")
+                    await send_debug_message(ws, {"message": "🔁 Gemini Live session resumed."})
+                attempts = 0
+                await handle_gemini_responses(ws, session, runtime_config)
+        except Exception as e:
+            browser_gone = isinstance(e, WebSocketDisconnect) or ws.client_state != WebSocketState.CONNECTED
+            if (
+                browser_gone
+                or not connected_once
+                or not runtime_config.live_session_resumption
+                or attempts >= runtime_config.live_max_reconnects
+            ):
+                raise
+            logger.warning(f"Gemini Live stream dropped: {e}")
+        finally:
+            session.live_connected.clear()
+            session.live_session = None
+
+        if not runtime_config.live_session_resumption:
+            return
+        attempts += 1
+        if not session.resumption_handle:
+            logger.warning("No resumption handle yet, reconnecting with a fresh Live context")
+        await asyncio.sleep(min(2 ** (attempts - 1) * 0.5, 5.0))
+
+
+async def send_realtime_input(session: SessionState, **kwargs):
+    """
+    Send realtime input to Gemini, or buffer it while the Live session is reconnecting.
+    """
+    if session.live_connected.is_set():
+        try:
+            await session.live_session.send_realtime_input(**kwargs)
+            return
+        except Exception as e:
+            logger.warning(f"Buffering input, Live session unavailable: {e}")
+    session.pending_input.append(kwargs)
+
+
+async def send_tool_response(session: SessionState, function_responses: list):
+    """
+    Send function responses to Gemini, or hold them until the Live session is back.
+    """
+    if session.live_connected.is_set():
+        try:
+            await session.live_session.send_tool_response(function_responses=function_responses)
+            return
+        except Exception as e:
+            logger.warning(f"Holding tool responses, Live session unavailable: {e}")
+    session.pending_tool_responses.extend(function_responses)
+
+
+async def flush_pending_input(session: SessionState):
+    """
+    Replay what was held while the Live session was unavailable, including anything added meanwhile.
+    """
+    if session.pending_input:
+        logger.info(f"📤 Replaying {len(session.pending_input)} buffered input message(s)")
+    while session.pending_tool_responses or session.pending_input:
+        if session.pending_tool_responses:
+            function_responses, session.pending_tool_responses = session.pending_tool_responses, []
+            logger.info(f"📤 Sending {len(function_responses)} tool response(s) held during the reconnect")
+            await session.live_session.send_tool_response(function_responses=function_responses)
+        else:
+            await session.live_session.send_realtime_input(**session.pending_input.popleft())
+
+
+async def handle_messages(ws: WebSocket, session: SessionState, runtime_config: RuntimeConfig, avatar_tools: list):
+    if runtime_config.response_modality == "text" and runtime_config.text_flush_ms > 0:
+        session.text_coalescer = TextCoalescer(
+            ws.send_json,
+            flush_interval=runtime_config.text_flush_ms / 1000,
+            max_chars=runtime_config.text_flush_chars
+        )
+    # One executor for the WebSocket, so calls still running survive a Live reconnect
+    session.tool_executor = create_tool_executor(session, runtime_config)
     try:
         async with asyncio.TaskGroup() as tg:
             task = tg.create_task(handle_user_messages(ws, session, runtime_config))
             task_registry.add(task)
-            task = tg.create_task(handle_gemini_responses(ws, session, runtime_config))
+            task = tg.create_task(run_live_session(ws, session, runtime_config, avatar_tools))
             task_registry.add(task)
 
     except ExceptionGroup as eg:
@@ -314,40 +596,229 @@ async def handle_messages(ws: WebSocket, session: SessionState, runtime_config:
                 return
         raise
 
+BINARY_MESSAGE_TYPES = {
+    FrameKind.AUDIO: "audio",
+    FrameKind.IMAGE: "image",
+}
+
+
+async def receive_client_message(ws: WebSocket, session: SessionState) -> Tuple[str, Any]:
+    """
+    Receive the next client message, either a JSON text frame or a binary media frame.
+    """
+    message = await ws.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+
+    if message.get("bytes") is not None:
+        if not session.binary_frames:
+            raise ValueError("Binary frame received before binary framing was negotiated")
+        kind, _, payload = decode_frame(message["bytes"])
+        return BINARY_MESSAGE_TYPES[kind], payload
+
+    data = json.loads(message["text"])
+    if not isinstance(data, dict):
+        raise ValueError("Client message must be a JSON object")
+    return data.get("type"), data.get("data", None)
+
+
+def decode_media(data: Union[bytes, str]) -> bytes:
+    """
+    Return raw media bytes from a binary frame payload or a base64 JSON field.
+    """
+    return data if isinstance(data, bytes) else base64.b64decode(data)
+
+
+async def send_audio(
+        ws: WebSocket,
+        session: SessionState,
+        audio: bytes,
+        words: Optional[dict] = None,
+        timeline: Optional[TurnTimeline] = None,
+        visemes: Optional[dict] = None
+):
+    """
+    Send PCM audio to the client, as a binary frame when negotiated or base64 JSON otherwise.
+    Word timings and visemes, when given, travel with the audio.
+    """
+    lipsync = {key: value for key, value in (("words", words), ("visemes", visemes)) if value is not None}
+    with SEND_LATENCY.time("audio"):
+        if session.binary_frames:
+            await ws.send_bytes(encode_frame(FrameKind.AUDIO, audio, lipsync or None))
+        else:
+            audio_base64 = base64.b64encode(audio).decode("utf-8")
+            await ws.send_json({"type": "audio", "data": {"audio": audio_base64, **lipsync}})
+
+    timeline = timeline or session.timeline
+    if timeline.mark("audio_sent"):
+        time_to_first_audio = timeline.elapsed("input_end", "audio_sent")
+        if time_to_first_audio is not None:
+            TIME_TO_FIRST_AUDIO.observe(time_to_first_audio)
+
+
+def log_turn_timeline(timeline: TurnTimeline):
+    labels = "".join(f", {key}={value}" for key, value in timeline.labels.items())
+    logger.info(f"⏱️ Turn timeline (ms): {timeline.summary()}{labels}")
+
+
+async def handle_client_config(ws: WebSocket, session: SessionState, runtime_config: RuntimeConfig, data: Optional[dict]):
+    """
+    Complete the config handshake by agreeing on the framing requested by the client.
+    """
+    requested = (data or {}).get("framing", FRAMING_JSON)
+    session.binary_frames = requested == FRAMING_BINARY and runtime_config.binary_frames
+    framing = FRAMING_BINARY if session.binary_frames else FRAMING_JSON
+    logger.info(f"Client framing negotiated: {framing}")
+    await ws.send_json({"type": "config_ack", "data": {"framing": framing}})
+
+
+def create_audio_ingest(runtime_config: RuntimeConfig) -> Optional[AudioIngest]:
+    """
+    Build the microphone audio stage, or None when audio is forwarded untouched.
+    """
+    if not runtime_config.input_vad and runtime_config.input_audio_frame_ms <= 0:
+        return None
+    gate = VoiceActivityGate(
+        threshold=runtime_config.input_vad_threshold,
+        hangover_ms=runtime_config.input_vad_hangover_ms,
+        preroll_ms=runtime_config.input_vad_preroll_ms
+    ) if runtime_config.input_vad else None
+    return AudioIngest(gate, frame_ms=runtime_config.input_audio_frame_ms)
+
+
+def mark_input_end(session: SessionState):
+    """
+    Note where user input ended; a pause before the user carries on moves the mark.
+    """
+    if "audio_sent" not in session.timeline.marks:
+        session.timeline.mark_latest("input_end")
+
+
+async def send_input_audio(session: SessionState, frames: List[Optional[bytes]]):
+    for frame in frames:
+        if frame is STREAM_END:
+            # Lets Gemini close the user turn without us streaming silence
+            mark_input_end(session)
+            await send_realtime_input(session, audio_stream_end=True)
+        else:
+            await send_realtime_input(session, media=types.Blob(mime_type='audio/pcm;rate=16000', data=frame))
+
+
+async def flush_input_audio(session: SessionState):
+    session.input_flush_handle = None
+    if session.audio_ingest:
+        async with session.input_audio_lock:
+            await send_input_audio(session, session.audio_ingest.flush())
+
+
+async def forward_input_audio(session: SessionState, audio_data: bytes):
+    """
+    Send microphone audio upstream through the session's ingest stage, if any.
+    """
+    ingest = session.audio_ingest
+    if ingest is None:
+        await send_input_audio(session, [audio_data])
+        return
+
+    if session.input_flush_handle:
+        session.input_flush_handle.cancel()
+        session.input_flush_handle = None
+    # Frames are taken from the ingest under the lock, so a timer flush can't overtake them
+    async with session.input_audio_lock:
+        await send_input_audio(session, ingest.feed(audio_data))
+    if ingest.pending:
+        # Don't hold a partial frame back if the browser pauses
+        session.input_flush_handle = asyncio.get_running_loop().call_later(
+            ingest.frame_ms / 1000,
+            lambda: session.create_background_task(flush_input_audio(session))
+        )
+
+
+def get_media_executor(runtime_config: RuntimeConfig) -> ThreadPoolExecutor:
+    """
+    Return the process-wide thread pool for image work, creating it on first use.
+    """
+    global media_executor
+    if media_executor is None:
+        media_executor = ThreadPoolExecutor(max_workers=max(1, runtime_config.media_workers), thread_name_prefix="media")
+    return media_executor
+
+
+def create_video_ingest(runtime_config: RuntimeConfig) -> Optional[VideoIngest]:
+    """
+    Build the camera frame stage, or None when frames are forwarded untouched.
+    """
+    if runtime_config.video_max_fps <= 0 and runtime_config.video_dedup_distance < 0:
+        return None
+    return VideoIngest(
+        executor=get_media_executor(runtime_config),
+        max_fps=runtime_config.video_max_fps,
+        dedup_distance=runtime_config.video_dedup_distance
+    )
+
+
+async def send_image(session: SessionState, image_data: bytes, mime_type: str = "image/jpeg"):
+    await send_realtime_input(
+        session,
+        media=types.Blob(
+            mime_type=mime_type,
+            data=image_data
+        )
+    )
+
+
+def create_frame_transcoder(session: SessionState, runtime_config: RuntimeConfig) -> Optional[FrameTranscoder]:
+    """
+    Build the camera frame transcode stage when it is enabled.
+    """
+    if not runtime_config.video_transcode:
+        return None
+    return FrameTranscoder(
+        functools.partial(send_image, session),
+        executor=get_media_executor(runtime_config),
+        max_dimension=runtime_config.video_max_dimension,
+        quality=runtime_config.video_quality,
+        image_format=runtime_config.video_format
+    )
+
+
 async def handle_user_messages(ws: WebSocket, session: SessionState, runtime_config: RuntimeConfig = None):
+    session.audio_ingest = create_audio_ingest(runtime_config)
+    session.video_ingest = create_video_ingest(runtime_config)
+    session.frame_transcoder = create_frame_transcoder(session, runtime_config)
     try:
         while True:
             try:
-                data = await ws.receive_json()
+                msg_type, ms_data = await receive_client_message(ws, session)
             except WebSocketDisconnect:
                 logger.info("Client disconnected")
                 return
-            msg_type = data.get("type")
-            ms_data = data.get("data", None)
-            logger.info(f"Received message: {msg_type}")
+            except (FrameError, json.JSONDecodeError, ValueError) as e:
+                # A malformed frame is dropped; the session keeps running
+                logger.warning(f"⚠️ Dropping malformed client message: {e}")
+                await send_error_message(ws, {"message": f"Malformed message: {e}"})
+                continue
+            logger.debug(f"Received message: {msg_type}")
 
             if msg_type == "audio":
-                audio_data = base64.b64decode(ms_data)
-                await session.live_session.send_realtime_input(
-                    media=types.Blob(
-                        mime_type='audio/pcm;rate=16000',
-                        data=audio_data
-                    )
-                )
+                session.timeline.mark("input_audio")
+                await forward_input_audio(session, decode_media(ms_data))
             elif msg_type == "image":
-                image_data = base64.b64decode(ms_data)
-                await session.live_session.send_realtime_input(
-                    media=types.Blob(
-                        mime_type="image/jpeg",
-                        data=image_data
-                    )
-                )
+                image_data = decode_media(ms_data)
+                if session.video_ingest and not await session.video_ingest.accept(image_data):
+                    continue
+                if session.frame_transcoder:
+                    session.frame_transcoder.submit(image_data)
+                else:
+                    await send_image(session, image_data)
             elif msg_type == "text":
-                await session.live_session.send_realtime_input(
-                    text=ms_data
-                )
+                await send_realtime_input(session, text=ms_data)
+            elif msg_type == "config":
+                await handle_client_config(ws, session, runtime_config, ms_data)
             elif msg_type == "end":
                 logger.info("End of turn received")
+                mark_input_end(session)
+                await flush_input_audio(session)
 
             else:
                 logger.warning(f"Unknown message type: {msg_type}")
@@ -368,13 +839,30 @@ async def handle_gemini_responses(ws: WebSocket, session: SessionState, runtime_
             try:
                 async for chunk in session.live_session.receive():
 
+                    if chunk.server_content:
+                        session.timeline.mark("model_chunk")
                     if chunk.tool_call:
                         await tool_queue.put(chunk.tool_call)
                         continue  # Continue processing other responses while tool executes
+                    if chunk.session_resumption_update:
+                        update = chunk.session_resumption_update
+                        if update.resumable and update.new_handle:
+                            session.resumption_handle = update.new_handle
+                        continue
+                    if chunk.go_away and runtime_config.live_session_resumption:
+                        logger.info(f"👋 Gemini Live connection closing in {chunk.go_away.time_left}, resuming early")
+                        return
+                    if chunk.tool_call_cancellation:
+                        cancelled = session.tool_executor.cancel(chunk.tool_call_cancellation.ids or [])
+                        logger.info(f"🚫 Gemini cancelled {cancelled} running tool call(s)")
+                        continue
+                    if chunk.server_content and chunk.server_content.interrupted and session.tool_executor.running:
+                        # The user talked over the model; results of in-flight tools are no longer wanted
+                        session.tool_executor.cancel()
                     if runtime_config.response_modality == "text":
                         await process_server_content_text_mode(ws, session, chunk.server_content)
                     elif runtime_config.response_modality == "audio":
-                        await process_server_content_audio_mode(ws, session, chunk)
+                        await process_server_content_audio_mode(ws, session, chunk, runtime_config)
 
             except Exception as e:
                 logger.error(f"Error from Gemini stream: {e}")
@@ -406,6 +894,17 @@ async def cleanup_session(session: SessionState, session_id: str):
             except asyncio.CancelledError:
                 pass
 
+        if session.input_flush_handle:
+            session.input_flush_handle.cancel()
+
+        if session.frame_transcoder:
+            session.frame_transcoder.close()
+
+        await session.cancel_background_tasks()
+
+        if session.text_coalescer:
+            session.text_coalescer.close()
+
         if session.live_session:
             try:
                 await session.live_session.close()
@@ -425,60 +924,98 @@ async def cleanup_session(session: SessionState, session_id: str):
 
 
 
+def get_tool_cache(runtime_config: RuntimeConfig) -> Optional[ToolResultCache]:
+    """
+    Get the process-wide tool result cache configured in the MCP server config, if it has one.
+    """
+    config_path = runtime_config.mcp_server_config
+    if not config_path:
+        return None
+    if config_path not in tool_caches:
+        try:
+            tool_caches[config_path] = ToolResultCache.from_json_config(config_path)
+        except Exception as e:
+            logger.error(f"Invalid tool_cache configuration in {config_path}: {e}")
+            tool_caches[config_path] = None
+    return tool_caches[config_path]
+
+
+async def dispatch_tool(session: SessionState, function_call: types.FunctionCall) -> Any:
+    """
+    Run one function call on the MCP server if it provides the tool, otherwise as a built-in.
+    """
+    mcp_server_client = session.mcp_server_client
+    if mcp_server_client and await mcp_server_client.has_tool(function_call.name):
+        logger.info(f"Executing MCP tool: {function_call.name} with args: {function_call.args}")
+        return await mcp_server_client.execute_tool(
+            tool_name=function_call.name,
+            tool_args=function_call.args
+        )
+    if mcp_server_client:
+        logger.info(f"Tool {function_call.name} not found in MCP tools, handling as built-in function")
+    return await handle_builtin_function(function_call)
+
+
+async def run_tool(
+        session: SessionState,
+        tool_cache: Optional[ToolResultCache],
+        function_call: types.FunctionCall
+) -> Any:
+    """
+    Run one function call, answering cacheable tools from the result cache when possible.
+    """
+    if tool_cache and tool_cache.is_cacheable(function_call.name):
+        return await tool_cache.get_or_run(
+            function_call.name,
+            function_call.args,
+            functools.partial(dispatch_tool, session, function_call)
+        )
+    return await dispatch_tool(session, function_call)
+
+
+def create_tool_executor(session: SessionState, runtime_config: RuntimeConfig) -> ToolExecutor:
+    return ToolExecutor(
+        run_tool=functools.partial(run_tool, session, get_tool_cache(runtime_config)),
+        max_concurrency=runtime_config.tool_max_concurrency,
+        default_timeout=runtime_config.tool_timeout,
+        tool_timeouts=runtime_config.tool_timeouts
+    )
+
+
+async def execute_tool_call(websocket: WebSocket, session: SessionState, tool_call: types.LiveServerToolCall):
+    """
+    Run the function calls of one tool call concurrently and send Gemini their responses.
+    Each result is forwarded to the browser as soon as its call finishes.
+    """
+    async def report_result(function_call: types.FunctionCall, tool_result: Any):
+        await send_session_message(websocket, session, {
+            "type": "function_call",
+            "data": {
+                "id": function_call.id,
+                "name": function_call.name,
+                "args": function_call.args,
+                "result": tool_result
+            }
+        })
+
+    try:
+        function_responses = await session.tool_executor.execute(tool_call.function_calls, on_result=report_result)
+        if function_responses:
+            logger.info(f"📤 Sending function responses: {function_responses}")
+            await send_tool_response(session, function_responses)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.exception(f"❌ Exception in execute_tool_call: {e}")
+
+
 async def process_function_calls(queue: asyncio.Queue, websocket: WebSocket, session: "SessionState"):
-    """Continuously process function/tool calls from the queue."""
+    """Continuously process function/tool calls from the queue, without waiting for earlier ones to finish."""
     while True:
         tool_call = await queue.get()
         logger.info(f"📥 Received tool call: {tool_call}")
-
         try:
-            function_responses = []
-            for function_call in tool_call.function_calls:
-                session.current_tool_execution = asyncio.current_task()
-
-                mcp_server_client = session.mcp_server_client
-                try:
-                    if mcp_server_client:
-                        tool_names = await mcp_server_client.get_tools_names()
-                        if function_call.name in tool_names:
-                            logger.info(f"Executing MCP tool: {function_call.name} with args: {function_call.args}")
-                            tool_result = await mcp_server_client.execute_tool(
-                                tool_name=function_call.name,
-                                tool_args=function_call.args
-                            )
-                        else:
-                            logger.info(f"Tool {function_call.name} not found in MCP tools, handling as built-in function")
-                            tool_result = await handle_builtin_function(function_call)
-                    else:
-                        tool_result = await handle_builtin_function(function_call)
-
-                except Exception as tool_err:
-                    logger.exception(f"❌ Error during tool execution: {tool_err}")
-                    tool_result = f"Error executing function `{function_call.name}`: {tool_err}"
-
-                await websocket.send_json({
-                    "type": "function_call",
-                    "data": {
-                        "name": function_call.name,
-                        "args": function_call.args,
-                        "result": tool_result
-                    }
-                })
-                function_responses.append(
-                    types.FunctionResponse(
-                        name=function_call.name,
-                        id=function_call.id,
-                        response={"output": tool_result}
-                    )
-                )
-                session.current_tool_execution = None
-            if function_responses:
-                logger.info(f"📤 Sending function responses: {function_responses}")
-                await session.live_session.send_tool_response(function_responses=function_responses)
-
-        except Exception as e:
-            logger.exception(f"❌ Exception in process_function_calls: {e}")
-
+            session.create_background_task(execute_tool_call(websocket, session, tool_call))
         finally:
             queue.task_done()
 
@@ -493,7 +1030,30 @@ async def handle_builtin_function(function_call):
         case "turn_off_the_lights":
             return "Lights turned off! 🌙"
         case _:
-            return f"Unknown function: {function_call.name}"
+            raise ValueError(f"Unknown function: {function_call.name}")
+
+
+async def send_session_message(ws: WebSocket, session: SessionState, message: dict):
+    """
+    Send a message to the browser after any text the session is still holding back.
+    """
+    if session.text_coalescer:
+        await session.text_coalescer.send(message)
+    else:
+        await ws.send_json(message)
+
+
+async def send_text(ws: WebSocket, session: SessionState, text: str):
+    """
+    Send a text delta, merged with its neighbours when coalescing is on.
+    """
+    if session.text_coalescer:
+        await session.text_coalescer.add(text)
+    else:
+        await ws.send_json({
+            "type": "text",
+            "data": text
+        })
 
 
 async def process_server_content_text_mode(ws: WebSocket, session: SessionState, server_content: LiveServerContent):
@@ -511,7 +1071,7 @@ async def process_server_content_text_mode(ws: WebSocket, session: SessionState,
     """Process server content and send to WebSocket."""
     if server_content.interrupted:
         logger.info("Interruption detected from Gemini")
-        await ws.send_json({
+        await send_session_message(ws, session, {
             "type": "interrupted",
             "data": {
                 "message": "Response interrupted by user input"
@@ -523,36 +1083,261 @@ async def process_server_content_text_mode(ws: WebSocket, session: SessionState,
     if server_content.output_transcription:
         transcription = server_content.output_transcription.text
         logger.info(f"Transcription received: {transcription}")
-        await ws.send_json({
-            "type": "text",
-            "data": transcription
-        })
+        await send_text(ws, session, transcription)
 
     if server_content.model_turn:
         session.received_model_response = True
         session.is_receiving_response = True
         for part in server_content.model_turn.parts:
             if part.inline_data:
-                audio_base64 = base64.b64encode(part.inline_data.data).decode('utf-8')
-                await ws.send_json({
-                    "type": "audio",
-                    "data": audio_base64
-                })
+                if session.text_coalescer:
+                    await session.text_coalescer.flush()
+                await send_audio(ws, session, part.inline_data.data)
             elif part.text:
-                await ws.send_json({
-                    "type": "text",
-                    "data": part.text
-                })
+                await send_text(ws, session, part.text)
 
     if server_content.turn_complete:
-        await ws.send_json({
+        await send_session_message(ws, session, {
             "type": "turn_complete"
         })
         session.received_model_response = False;
         session.is_receiving_response = False
+        log_turn_timeline(session.next_turn_timeline())
+
+
+def needs_lipsync(runtime_config: RuntimeConfig) -> bool:
+    """
+    Lip-sync models are only used when Gemini answers with audio and visemes are not computed from the signal.
+    """
+    return runtime_config.response_modality == "audio" and runtime_config.lipsync_backend != "visemes"
+
+
+def get_viseme_analyzer(session: SessionState, runtime_config: RuntimeConfig) -> VisemeAnalyzer:
+    if session.viseme_analyzer is None:
+        session.viseme_analyzer = VisemeAnalyzer(silence_threshold=runtime_config.lipsync_silence_threshold)
+    return session.viseme_analyzer
+
+
+def get_lipsync_executor(runtime_config: RuntimeConfig) -> Union[InferenceExecutor, RemoteInferenceExecutor]:
+    """
+    Return the process-wide lip-sync executor, creating it from the runtime configuration on first use.
+    With a shared model server configured, jobs are forwarded to it instead of loading models here.
+    """
+    global lipsync_executor
+    if lipsync_executor is None and runtime_config.lipsync_server_socket:
+        lipsync_executor = RemoteInferenceExecutor(
+            socket_path=runtime_config.lipsync_server_socket,
+            timeout=runtime_config.lipsync_timeout
+        )
+    elif lipsync_executor is None:
+        lipsync_executor = InferenceExecutor(
+            workers=runtime_config.lipsync_workers,
+            queue_size=runtime_config.lipsync_queue_size,
+            timeout=runtime_config.lipsync_timeout,
+            torch_threads=runtime_config.lipsync_torch_threads,
+            model_size=runtime_config.lipsync_model_size,
+            compute_type=runtime_config.lipsync_compute_type,
+            batch_window=runtime_config.lipsync_batch_window_ms / 1000,
+            max_batch_size=runtime_config.lipsync_max_batch_size,
+            fast_model_size=runtime_config.lipsync_fast_model_size if runtime_config.lipsync_adaptive else None,
+            fast_compute_type=runtime_config.lipsync_fast_compute_type
+        )
+    return lipsync_executor
+
+
+def get_lipsync_cache(runtime_config: RuntimeConfig) -> Optional[LipSyncCache]:
+    """
+    Return the process-wide lip-sync cache, or None when caching is disabled.
+    """
+    global lipsync_cache
+    if lipsync_cache is None and runtime_config.lipsync_cache_bytes > 0:
+        lipsync_cache = LipSyncCache(
+            max_bytes=runtime_config.lipsync_cache_bytes,
+            disk_dir=runtime_config.lipsync_cache_dir,
+            max_disk_bytes=runtime_config.lipsync_cache_disk_bytes
+        )
+    return lipsync_cache
+
+
+def get_lipsync_policy(runtime_config: RuntimeConfig) -> Optional[AdaptiveLipSyncPolicy]:
+    """
+    Return the process-wide adaptive lip-sync policy, or None when lip-sync quality is fixed.
+    """
+    global lipsync_policy
+    if lipsync_policy is None and runtime_config.lipsync_adaptive:
+        lipsync_policy = AdaptiveLipSyncPolicy(
+            degrade_queue_depth=runtime_config.lipsync_degrade_queue_depth,
+            degrade_latency=runtime_config.lipsync_degrade_latency,
+            recover_after=runtime_config.lipsync_recover_after
+        )
+    return lipsync_policy
+
+
+def record_lipsync_tier(tier: str, timeline: Optional[TurnTimeline]):
+    LIPSYNC_TIER_TOTAL.inc(tier)
+    if lipsync_policy:
+        lipsync_policy.record(tier)
+    if timeline:
+        # A turn aligned in segments reports its lowest tier
+        timeline.labels["lipsync_tier"] = LipSyncTier.worst(timeline.labels.get("lipsync_tier"), tier)
+
+
+async def generate_word_timings(
+        audio_bytes: bytes,
+        runtime_config: RuntimeConfig,
+        transcript: Optional[str] = None,
+        language: Optional[str] = None,
+        timeline: Optional[TurnTimeline] = None
+) -> dict:
+    """
+    Run lip-sync alignment over 24 kHz PCM audio on the lip-sync executor.
+    A known transcript skips Whisper transcription and only runs forced alignment.
+    With adaptive lip-sync the tier follows the executor load, and an overloaded
+    executor falls back to signal-based timings instead of failing the turn.
+    """
+    audio_bytes = bytes(audio_bytes)
+    cache = get_lipsync_cache(runtime_config)
+    cache_key = None
+    if cache:
+        cache_key = cache.key_for(audio_bytes, transcript, language)
+        words_data = await cache.get(cache_key)
+        if words_data is not None:
+            return words_data
+
+    executor = get_lipsync_executor(runtime_config)
+    policy = get_lipsync_policy(runtime_config)
+    tier = policy.select(executor.queue_depth) if policy else LipSyncTier.FULL
+    if tier == LipSyncTier.ALIGN_ONLY and not (transcript and language):
+        # Without a transcript only ASR could place the words
+        tier = LipSyncTier.SIGNAL
+
+    if tier != LipSyncTier.SIGNAL:
+        queued_at = time.perf_counter()
+        if timeline:
+            timeline.mark("alignment_queued")
+        try:
+            words_data = await executor.submit(
+                audio_bytes,
+                transcript=transcript,
+                language=language,
+                on_start=functools.partial(timeline.mark, "alignment_started") if timeline else None,
+                fast=tier == LipSyncTier.FAST
+            )
+        except (LipSyncBusyError, LipSyncTimeoutError) as e:
+            if not policy:
+                raise
+            logger.warning(f"Lip-sync executor overloaded, using the signal tier for this turn: {e}")
+            policy.record_overload()
+            tier = LipSyncTier.SIGNAL
+        else:
+            elapsed = time.perf_counter() - queued_at
+            ALIGNMENT_SECONDS.observe(elapsed)
+            if policy:
+                policy.observe_latency(elapsed)
+            if timeline:
+                timeline.mark("alignment_finished")
+            # Only model-quality alignments are worth serving from the cache later
+            if cache and tier in (LipSyncTier.FULL, LipSyncTier.ALIGN_ONLY):
+                await cache.put(cache_key, words_data)
+
+    if tier == LipSyncTier.SIGNAL:
+        words_data = signal_word_timings(
+            audio_bytes, transcript, silence_threshold=runtime_config.lipsync_silence_threshold
+        )
+    record_lipsync_tier(tier, timeline)
+    return words_data
+
+
+def get_turn_transcript(session: SessionState, runtime_config: RuntimeConfig) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Return the transcript and language to align against, or (None, None) to fall back to Whisper ASR.
+    """
+    transcript = "".join(session.turn_transcript).strip()
+    session.turn_transcript.clear()
+    if not runtime_config.lipsync_use_transcript or not transcript:
+        return None, None
+    return transcript, runtime_config.lipsync_language
+
+
+async def send_word_timings(
+        ws: WebSocket,
+        runtime_config: RuntimeConfig,
+        audio_bytes: bytes,
+        transcript: Optional[str] = None,
+        language: Optional[str] = None,
+        timeline: Optional[TurnTimeline] = None
+):
+    """
+    Align an already streamed turn and send its word timings as a separate message.
+    """
+    try:
+        words_data = await generate_word_timings(audio_bytes, runtime_config, transcript, language, timeline)
+        with SEND_LATENCY.time("audio_words"):
+            await ws.send_json({
+                "type": "audio_words",
+                "data": words_data
+            })
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.exception("Error generating viseme data from audio")
+        await send_error_message(ws, {"message": f"Failed to process audio: {str(e)}"})
+    if timeline:
+        log_turn_timeline(timeline)
+
+
+def create_streaming_aligner(ws: WebSocket, runtime_config: RuntimeConfig, timeline: TurnTimeline) -> StreamingAligner:
+    """
+    Build a per-turn aligner that cuts the incoming audio at pauses and aligns each segment.
+    """
+    async def send_segment_timings(words_data: dict):
+        with SEND_LATENCY.time("audio_words"):
+            await ws.send_json({
+                "type": "audio_words",
+                "data": words_data
+            })
+
+    return StreamingAligner(
+        align=functools.partial(generate_word_timings, runtime_config=runtime_config, timeline=timeline),
+        on_segment=send_segment_timings if runtime_config.stream_audio else None,
+        segmenter=PauseSegmenter(
+            silence_threshold=runtime_config.lipsync_silence_threshold,
+            min_silence_ms=runtime_config.lipsync_min_silence_ms,
+            min_segment_ms=runtime_config.lipsync_min_segment_ms,
+        )
+    )
+
+
+async def finish_streaming_aligner(ws: WebSocket, aligner: StreamingAligner, timeline: Optional[TurnTimeline] = None):
+    """
+    Wait for the remaining segments of a streamed turn; each one reports its own timings.
+    """
+    try:
+        await aligner.finish()
+    except asyncio.CancelledError:
+        aligner.cancel()
+        raise
+    except Exception as e:
+        logger.exception("Error generating viseme data from audio")
+        await send_error_message(ws, {"message": f"Failed to process audio: {str(e)}"})
+    if timeline:
+        log_turn_timeline(timeline)
 
 
-async def process_server_content_audio_mode(ws: WebSocket, session: SessionState, response: LiveServerMessage):
+def reset_audio_stream(session: SessionState) -> bytearray:
+    """
+    Hand over the turn's PCM buffer and start a fresh one.
+    """
+    audio_bytes, session.audio_buffer = session.audio_buffer, bytearray()
+    return audio_bytes
+
+
+async def process_server_content_audio_mode(
+        ws: WebSocket,
+        session: SessionState,
+        response: LiveServerMessage,
+        runtime_config: RuntimeConfig
+):
     if not response:
         logger.warning("Received empty server content")
         return
@@ -560,23 +1345,41 @@ async def process_server_content_audio_mode(ws: WebSocket, session: SessionState
     server_content = response.server_content
     data = response.data
     session.is_receiving_response = True
+    use_visemes = runtime_config.lipsync_backend == "visemes"
 
-    # Initialize audio stream for this session if needed
-    if not getattr(session, "audio_stream", None):
-        session.audio_stream = io.BytesIO()
-        session.audio_file = wave.open(session.audio_stream, "wb")
-        session.audio_file.setnchannels(1)
-        session.audio_file.setsampwidth(2)       # 16-bit audio
-        session.audio_file.setframerate(24000)   # 24kHz
-        logger.info("Initialized in-memory audio stream")
+    if runtime_config.lipsync_segmented and not use_visemes and not session.aligner:
+        session.aligner = create_streaming_aligner(ws, runtime_config, session.timeline)
 
-    # Write current chunk to memory
+    # Write current chunk to memory, forwarding it right away when streaming
     if (server_content and server_content.model_turn) and data:
-        session.audio_file.writeframes(data)
+        session.audio_buffer.extend(data)
+        if session.aligner:
+            session.aligner.feed(data)
+        if runtime_config.stream_audio:
+            visemes = get_viseme_analyzer(session, runtime_config).analyze(data) if use_visemes else None
+            await send_audio(ws, session, data, visemes=visemes)
 
     if server_content and server_content.output_transcription:
         transcription = server_content.output_transcription.text
         logger.info(f"Transcription received: {transcription}")
+        if transcription:
+            session.turn_transcript.append(transcription)
+
+    if server_content and server_content.interrupted and runtime_config.stream_audio:
+        logger.info("Interruption detected from Gemini")
+        reset_audio_stream(session)
+        session.turn_transcript.clear()
+        if session.aligner:
+            session.aligner.cancel()
+            session.aligner = None
+        session.is_receiving_response = False
+        await ws.send_json({
+            "type": "interrupted",
+            "data": {
+                "message": "Response interrupted by user input"
+            }
+        })
+        return
 
     # Finalize and send when turn is complete
     if server_content and server_content.turn_complete:
@@ -584,48 +1387,51 @@ async def process_server_content_audio_mode(ws: WebSocket, session: SessionState
         await ws.send_json({
             "type": "turn_complete"
         })
+        timeline = session.next_turn_timeline()
+        audio_bytes = reset_audio_stream(session)
+        aligner, session.aligner = session.aligner, None
+        transcript, language = get_turn_transcript(session, runtime_config)
+        session.is_receiving_response = False
+        if not audio_bytes:
+            if aligner:
+                aligner.cancel()
+            log_turn_timeline(timeline)
+            return
+
+        if use_visemes:
+            # Streamed chunks already carried their visemes
+            if not runtime_config.stream_audio:
+                visemes = get_viseme_analyzer(session, runtime_config).analyze(bytes(audio_bytes))
+                await send_audio(ws, session, audio_bytes, timeline=timeline, visemes=visemes)
+            log_turn_timeline(timeline)
+            return
+
+        if aligner and runtime_config.stream_audio:
+            # Most segments are already aligned; wait for the tail in the background
+            session.create_background_task(finish_streaming_aligner(ws, aligner, timeline))
+            return
+
+        if runtime_config.stream_audio:
+            # Audio is already playing on the client, word timings follow when ready
+            session.create_background_task(
+                send_word_timings(ws, runtime_config, audio_bytes, transcript, language, timeline)
+            )
+            return
+
         try:
-            # Finalize audio stream
-            session.audio_file.close()
-            audio_bytes = session.audio_stream.getvalue()
-
-            # Write to temp WAV file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp_file:
-                tmp_path = Path(tmp_file.name)
-                with wave.open(str(tmp_path), "wb") as wf:
-                    wf.setnchannels(1)
-                    wf.setsampwidth(2)
-                    wf.setframerate(24000)
-                    wf.writeframes(audio_bytes)
-
-            # Run generate in a thread (since it's blocking and needs a file path)
-            words_data = await to_thread(word_generator.generate, str(tmp_path))
-
-            # Encode audio for transport
-            audio_base64 = base64.b64encode(audio_bytes).decode("utf-8")
-            await ws.send_json({
-                "type": "audio",
-                "data": {
-                    "audio": audio_base64,
-                    "words": words_data
-                }
-            })
+            if aligner:
+                words_data = await aligner.finish()
+            else:
+                words_data = await generate_word_timings(audio_bytes, runtime_config, transcript, language, timeline)
+            await send_audio(ws, session, audio_bytes, words_data, timeline)
+        except (LipSyncBusyError, LipSyncTimeoutError) as e:
+            # Under backpressure the turn still plays, just without lip-sync timings
+            logger.warning(f"Lip-sync skipped for this turn: {e}")
+            await send_audio(ws, session, audio_bytes, {"words": [], "wtimes": [], "wdurations": []}, timeline)
         except Exception as e:
             logger.exception("Error generating viseme data from audio")
             await ws.send_json({
                 "type": "error",
                 "data": {"message": f"Failed to process audio: {str(e)}"}
             })
-        finally:
-            # Cleanup
-            session.audio_stream.close()
-            session.audio_stream = None
-            session.audio_file = None
-            session.is_receiving_response = False
-
-            if tmp_path and tmp_path.exists():
-                tmp_path.unlink()
-
-
-
-
+        log_turn_timeline(timeline)
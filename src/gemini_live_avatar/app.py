@@ -27,7 +27,9 @@ async def lifespan(app: FastAPI):
     """
     logger.info("app is starting")
     mount_apps(app)
-    yield
+    # Mounted apps don't get lifespan events of their own, run the API's explicitly
+    async with api.router.lifespan_context(api):
+        yield
     logger.info("app is shutting down")
 
 
@@ -1,13 +1,14 @@
 import json
 import logging
 import os
-from typing import Optional
+from typing import List, Optional
 
 import typer
 from typing_extensions import Annotated
 from dotenv import load_dotenv, find_dotenv
 
-from .config import RuntimeConfig  # <-- import the global config instance
+from .config import RUNTIME_CONFIG_PATH, RuntimeConfig
+from .model_server import DEFAULT_SOCKET_PATH, ModelServerSupervisor, model_server_command
 
 # Load environment variables from a .env file
 load_dotenv(find_dotenv())
@@ -53,23 +54,136 @@ def start(
     avatar_path: Annotated[str, typer.Option("--avatar-path", help="Path to avatar model")] = "https://models.readyplayer.me/64bfa15f0e72c63d7c3934a6.glb",
     google_search_grounding: Annotated[bool, typer.Option("--google-search-grounding", help="Enable Google Search grounding")] = False,
     mcp_server_config: Annotated[Optional[str], typer.Option("--mcp-server-config", help="MCP server configuration file path")] = None,
+    mcp_pool_size: Annotated[int, typer.Option("--mcp-pool-size", help="MCP connections shared across sessions (0 connects per session)")] = 2,
+    mcp_health_check_interval: Annotated[float, typer.Option("--mcp-health-check-interval", help="Seconds between MCP connection health checks")] = 30.0,
+    mcp_tools_ttl: Annotated[float, typer.Option("--mcp-tools-ttl", help="Seconds the MCP tool list is cached")] = 300.0,
+    tool_max_concurrency: Annotated[int, typer.Option("--tool-max-concurrency", help="Function calls per session that may run concurrently")] = 4,
+    tool_timeout: Annotated[float, typer.Option("--tool-timeout", help="Default seconds a function call may run")] = 30.0,
+    tool_timeout_for: Annotated[Optional[List[str]], typer.Option("--tool-timeout-for", help="Per-tool timeout as NAME=SECONDS, can be repeated")] = None,
+    live_pool_size: Annotated[int, typer.Option("--live-pool-size", help="Pre-connected Gemini Live sessions to keep ready (0 disables)")] = 0,
+    live_pool_max_age: Annotated[float, typer.Option("--live-pool-max-age", help="Seconds an idle pooled Live session is kept")] = 480.0,
+    live_session_resumption: Annotated[bool, typer.Option("--live-session-resumption/--no-live-session-resumption", help="Transparently resume dropped Gemini Live sessions")] = True,
+    live_max_reconnects: Annotated[int, typer.Option("--live-max-reconnects", help="Consecutive Live reconnect attempts")] = 3,
+    live_context_compression: Annotated[bool, typer.Option("--live-context-compression", help="Enable sliding-window context compression")] = False,
+    live_compression_trigger_tokens: Annotated[Optional[int], typer.Option("--live-compression-trigger-tokens", help="Context tokens that trigger compression")] = None,
+    live_compression_target_tokens: Annotated[Optional[int], typer.Option("--live-compression-target-tokens", help="Context tokens kept after compression")] = None,
+    input_vad: Annotated[bool, typer.Option("--input-vad", help="Drop silent microphone audio before it goes to Gemini")] = False,
+    input_vad_threshold: Annotated[float, typer.Option("--input-vad-threshold", help="int16 RMS level that counts as speech")] = 300.0,
+    input_vad_hangover_ms: Annotated[int, typer.Option("--input-vad-hangover-ms", help="Audio kept after speech stops")] = 600,
+    input_vad_preroll_ms: Annotated[int, typer.Option("--input-vad-preroll-ms", help="Audio kept before speech starts")] = 200,
+    input_audio_frame_ms: Annotated[int, typer.Option("--input-audio-frame-ms", help="Regroup microphone audio into frames of this length (0 disables)")] = 0,
+    video_max_fps: Annotated[float, typer.Option("--video-max-fps", help="Camera frames forwarded per second (0 disables the limit)")] = 0.0,
+    video_dedup_distance: Annotated[int, typer.Option("--video-dedup-distance", help="Perceptual-hash distance under which frames are duplicates (negative disables)")] = -1,
+    video_transcode: Annotated[bool, typer.Option("--video-transcode", help="Downscale and re-encode camera frames before they go to Gemini")] = False,
+    video_max_dimension: Annotated[int, typer.Option("--video-max-dimension", help="Longest side of transcoded frames in pixels (0 keeps the size)")] = 768,
+    video_quality: Annotated[int, typer.Option("--video-quality", help="Encoder quality of transcoded frames (1-100)")] = 75,
+    video_format: Annotated[str, typer.Option("--video-format", help="Format of transcoded frames (jpeg, webp)")] = "jpeg",
+    media_workers: Annotated[int, typer.Option("--media-workers", help="Threads for image processing")] = 2,
+    text_flush_ms: Annotated[int, typer.Option("--text-flush-ms", help="Merge streamed text deltas for this long (0 disables)")] = 0,
+    text_flush_chars: Annotated[int, typer.Option("--text-flush-chars", help="Send merged text once it reaches this many characters")] = 1024,
     response_modality : Annotated[str, typer.Option("--response-modality", help="Response modality (text, audio)")] = "text",
+    binary_frames: Annotated[bool, typer.Option("--binary-frames/--no-binary-frames", help="Offer binary WebSocket frames for audio and video")] = True,
+    stream_audio: Annotated[bool, typer.Option("--stream-audio", help="Stream audio chunks as they arrive and send lip-sync timings afterwards")] = False,
+    lipsync_backend: Annotated[str, typer.Option("--lipsync-backend", help="Lip-sync backend (whisperx, visemes)")] = "whisperx",
+    lipsync_segmented: Annotated[bool, typer.Option("--lipsync-segmented", help="Align audio at natural pauses while the turn is still arriving")] = False,
+    lipsync_use_transcript: Annotated[bool, typer.Option("--lipsync-use-transcript/--lipsync-asr", help="Align against Gemini's transcription instead of running Whisper ASR")] = True,
+    lipsync_language: Annotated[str, typer.Option("--lipsync-language", help="Language of the lip-sync alignment model")] = "en",
+    lipsync_workers: Annotated[int, typer.Option("--lipsync-workers", help="Lip-sync worker processes (0 runs one in-process thread)")] = 0,
+    lipsync_queue_size: Annotated[int, typer.Option("--lipsync-queue-size", help="Maximum pending lip-sync jobs")] = 32,
+    lipsync_timeout: Annotated[float, typer.Option("--lipsync-timeout", help="Seconds a lip-sync job may wait and run")] = 30.0,
+    lipsync_torch_threads: Annotated[int, typer.Option("--lipsync-torch-threads", help="torch threads per lip-sync worker (0 keeps the default)")] = 0,
+    lipsync_batch_window_ms: Annotated[int, typer.Option("--lipsync-batch-window-ms", help="Micro-batching window for lip-sync jobs (0 disables)")] = 0,
+    lipsync_max_batch_size: Annotated[int, typer.Option("--lipsync-max-batch-size", help="Maximum lip-sync jobs per batch")] = 8,
+    lipsync_adaptive: Annotated[bool, typer.Option("--lipsync-adaptive", help="Degrade lip-sync quality under load instead of delaying audio")] = False,
+    lipsync_fast_model_size: Annotated[str, typer.Option("--lipsync-fast-model-size", help="Whisper model of the fast lip-sync tier")] = "tiny",
+    lipsync_fast_compute_type: Annotated[str, typer.Option("--lipsync-fast-compute-type", help="Compute type of the fast lip-sync tier")] = "int8",
+    lipsync_degrade_queue_depth: Annotated[int, typer.Option("--lipsync-degrade-queue-depth", help="Queued lip-sync jobs that step quality down")] = 4,
+    lipsync_degrade_latency: Annotated[float, typer.Option("--lipsync-degrade-latency", help="Lip-sync latency in seconds that steps quality down")] = 3.0,
+    lipsync_recover_after: Annotated[float, typer.Option("--lipsync-recover-after", help="Seconds of low load before lip-sync quality steps back up")] = 10.0,
+    lipsync_cache_bytes: Annotated[int, typer.Option("--lipsync-cache-bytes", help="In-memory lip-sync cache size in bytes (0 disables)")] = 16 * 1024 * 1024,
+    lipsync_cache_dir: Annotated[Optional[str], typer.Option("--lipsync-cache-dir", help="Directory for the persistent lip-sync cache")] = None,
+    lipsync_warmup: Annotated[bool, typer.Option("--lipsync-warmup", help="Load lip-sync models at startup and report readiness on /api/ready")] = False,
+    lipsync_server: Annotated[bool, typer.Option("--lipsync-server", help="Launch a shared lip-sync model server for all API workers")] = False,
+    lipsync_server_socket: Annotated[Optional[str], typer.Option("--lipsync-server-socket", help="Unix socket of the shared lip-sync model server")] = None,
 ) -> None:
     """
     Start the FastAPI-based Gemini Avatar app with runtime configurations.
     """
 
-    # Set config values from CLI args into the global config instance
-    runtime_config = RuntimeConfig()
-    runtime_config.google_search_grounding = google_search_grounding
-    runtime_config.tts_lang = tts_lang
-    runtime_config.tts_voice = tts_voice
-    runtime_config.avatar_path = avatar_path
-    runtime_config.mcp_server_config = mcp_server_config
-    runtime_config.response_modality = response_modality
+    if lipsync_server and not lipsync_server_socket:
+        lipsync_server_socket = DEFAULT_SOCKET_PATH
+
+    tool_timeouts = {}
+    for item in tool_timeout_for or []:
+        name, _, seconds = item.partition("=")
+        if not name or not seconds:
+            raise typer.BadParameter(f"Expected NAME=SECONDS, got {item!r}", param_hint="--tool-timeout-for")
+        tool_timeouts[name] = float(seconds)
+
+    if video_format not in ("jpeg", "webp"):
+        raise typer.BadParameter(f"Expected jpeg or webp, got {video_format!r}", param_hint="--video-format")
+
+    # Build the runtime config from CLI args; config snapshots are immutable
+    runtime_config = RuntimeConfig(
+        google_search_grounding=google_search_grounding,
+        tts_lang=tts_lang,
+        tts_voice=tts_voice,
+        avatar_path=avatar_path,
+        mcp_server_config=mcp_server_config,
+        mcp_pool_size=mcp_pool_size,
+        mcp_health_check_interval=mcp_health_check_interval,
+        mcp_tools_ttl=mcp_tools_ttl,
+        tool_max_concurrency=tool_max_concurrency,
+        tool_timeout=tool_timeout,
+        tool_timeouts=tool_timeouts,
+        live_pool_size=live_pool_size,
+        live_pool_max_age=live_pool_max_age,
+        live_session_resumption=live_session_resumption,
+        live_max_reconnects=live_max_reconnects,
+        live_context_compression=live_context_compression,
+        live_compression_trigger_tokens=live_compression_trigger_tokens,
+        live_compression_target_tokens=live_compression_target_tokens,
+        input_vad=input_vad,
+        input_vad_threshold=input_vad_threshold,
+        input_vad_hangover_ms=input_vad_hangover_ms,
+        input_vad_preroll_ms=input_vad_preroll_ms,
+        input_audio_frame_ms=input_audio_frame_ms,
+        video_max_fps=video_max_fps,
+        video_dedup_distance=video_dedup_distance,
+        video_transcode=video_transcode,
+        video_max_dimension=video_max_dimension,
+        video_quality=video_quality,
+        video_format=video_format,
+        media_workers=media_workers,
+        text_flush_ms=text_flush_ms,
+        text_flush_chars=text_flush_chars,
+        response_modality=response_modality,
+        binary_frames=binary_frames,
+        stream_audio=stream_audio,
+        lipsync_backend=lipsync_backend,
+        lipsync_segmented=lipsync_segmented,
+        lipsync_use_transcript=lipsync_use_transcript,
+        lipsync_language=lipsync_language,
+        lipsync_workers=lipsync_workers,
+        lipsync_queue_size=lipsync_queue_size,
+        lipsync_timeout=lipsync_timeout,
+        lipsync_torch_threads=lipsync_torch_threads,
+        lipsync_batch_window_ms=lipsync_batch_window_ms,
+        lipsync_max_batch_size=lipsync_max_batch_size,
+        lipsync_adaptive=lipsync_adaptive,
+        lipsync_fast_model_size=lipsync_fast_model_size,
+        lipsync_fast_compute_type=lipsync_fast_compute_type,
+        lipsync_degrade_queue_depth=lipsync_degrade_queue_depth,
+        lipsync_degrade_latency=lipsync_degrade_latency,
+        lipsync_recover_after=lipsync_recover_after,
+        lipsync_cache_bytes=lipsync_cache_bytes,
+        lipsync_cache_dir=lipsync_cache_dir,
+        lipsync_warmup=lipsync_warmup,
+        lipsync_server_socket=lipsync_server_socket
+    )
 
     # saving config to  a file
-    config_file_path = "runtime_config.json"
+    config_file_path = RUNTIME_CONFIG_PATH
     with open(config_file_path, "w") as config_file:
         json_config = runtime_config.model_dump_json(indent=4)
         config_file.write(json_config)
@@ -86,8 +200,31 @@ def start(
         os.environ["TTS_API_KEY"] = tts_api_key
         logging.info("Set TTS_API_KEY from input")
 
+    # The model server owns the lip-sync models so API workers don't each load them
+    supervisor = None
+    if lipsync_server:
+        supervisor = ModelServerSupervisor(model_server_command(
+            socket_path=lipsync_server_socket,
+            workers=max(1, runtime_config.lipsync_workers),
+            queue_size=runtime_config.lipsync_queue_size,
+            timeout=runtime_config.lipsync_timeout,
+            torch_threads=runtime_config.lipsync_torch_threads,
+            model_size=runtime_config.lipsync_model_size,
+            compute_type=runtime_config.lipsync_compute_type,
+            batch_window_ms=runtime_config.lipsync_batch_window_ms,
+            max_batch_size=runtime_config.lipsync_max_batch_size,
+            warmup_language=runtime_config.lipsync_language if lipsync_warmup else None,
+            fast_model_size=runtime_config.lipsync_fast_model_size if lipsync_adaptive else None,
+            fast_compute_type=runtime_config.lipsync_fast_compute_type
+        ))
+        supervisor.start()
+
     # export runtime config to a file
-    dispatch_fastapi_app("gemini_live_avatar.app:app", host, port, workers, reload)
+    try:
+        dispatch_fastapi_app("gemini_live_avatar.app:app", host, port, workers, reload)
+    finally:
+        if supervisor:
+            supervisor.stop()
 
 
 def main():
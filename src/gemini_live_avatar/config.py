@@ -1,11 +1,164 @@
+import asyncio
+import json
+import logging
+import os
+import signal
 import typing
-from pydantic import BaseModel
+from pathlib import Path
+
+from pydantic import BaseModel, ConfigDict, ValidationError
+
+logger = logging.getLogger(__name__)
+
+RUNTIME_CONFIG_PATH = "runtime_config.json"
+
 
 class RuntimeConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     google_search_grounding: bool = False
     tts_lang: str = "en-US"
     tts_voice: str = "en-GB-Standard-A"
     avatar_path: str = "https://models.readyplayer.me/64bfa15f0e72c63d7c3934a6.glb"
     model_name: str = "gemini-live-2.5-flash-preview"#"gemini-2.0-flash-live-001"
     mcp_server_config: typing.Optional[str] = None
+    mcp_pool_size: int = 2  # MCP connections shared by all sessions of a worker, 0 connects once per session
+    mcp_health_check_interval: float = 30.0  # Seconds between pings on pooled MCP connections
+    mcp_tools_ttl: float = 300.0  # Seconds before the cached MCP tool list is fetched again
+    tool_max_concurrency: int = 4  # Function calls of a session that may run at the same time
+    tool_timeout: float = 30.0  # Default seconds a function call may run
+    tool_timeouts: dict[str, float] = {}  # Per-tool overrides of tool_timeout
+    live_pool_size: int = 0  # Pre-connected Live sessions kept per session config, 0 disables the pool
+    live_pool_max_age: float = 480.0  # Seconds before an idle pooled session is closed, below the Live connection lifetime
+    live_session_resumption: bool = True  # Resume the Live session with its handle when the stream drops
+    live_max_reconnects: int = 3  # Consecutive reconnect attempts before the session is torn down
+    live_context_compression: bool = False  # Let Gemini slide the context window instead of growing it
+    live_compression_trigger_tokens: typing.Optional[int] = None  # Context size that triggers compression, None uses the server default
+    live_compression_target_tokens: typing.Optional[int] = None  # Context size kept after compression
+    input_vad: bool = False  # Drop silent microphone audio instead of streaming it to Gemini
+    input_vad_threshold: float = 300.0  # int16 RMS a 20 ms frame needs to count as speech
+    input_vad_hangover_ms: int = 600  # Audio still forwarded after speech stops, so word endings aren't clipped
+    input_vad_preroll_ms: int = 200  # Audio before a speech onset forwarded along with it
+    input_audio_frame_ms: int = 0  # Regroup microphone audio into frames of this length, 0 forwards chunks as received
+    video_max_fps: float = 0.0  # Camera frames forwarded per second at most, 0 disables the limit
+    video_dedup_distance: int = -1  # Drop frames within this many of 64 perceptual-hash bits of the last sent frame, negative disables
+    video_transcode: bool = False  # Downscale and re-encode camera frames before sending them to Gemini
+    video_max_dimension: int = 768  # Longest side of transcoded frames in pixels, 0 keeps the size
+    video_quality: int = 75  # Encoder quality of transcoded frames (1-100)
+    video_format: str = "jpeg"  # "jpeg" or "webp" for transcoded frames
+    media_workers: int = 2  # Threads for image decoding, hashing and transcoding shared by all sessions
+    text_flush_ms: int = 0  # Merge streamed text deltas for this long before sending, 0 (default) sends each delta
+    text_flush_chars: int = 1024  # Send merged text early once it reaches this many characters
     response_modality: str = "audio"  # "text", "audio", or "both"
+    binary_frames: bool = True  # Offer binary media frames during the /ws/live config handshake
+    stream_audio: bool = False  # Forward audio chunks as they arrive, word timings follow separately
+    lipsync_backend: str = "whisperx"  # "whisperx" word alignment, or "visemes" computed from the PCM without a model
+    lipsync_segmented: bool = False  # Align audio segment by segment while the turn is still arriving
+    lipsync_silence_threshold: float = 500.0  # int16 RMS below which a 20 ms frame counts as silence
+    lipsync_min_silence_ms: int = 300  # Pause length that closes a segment
+    lipsync_min_segment_ms: int = 2000  # Shortest segment worth aligning on its own
+    lipsync_use_transcript: bool = True  # Align against Gemini's output transcription instead of running Whisper ASR
+    lipsync_language: str = "en"  # Alignment model language used with the output transcription
+    lipsync_model_size: str = "small"
+    lipsync_compute_type: str = "float32"
+    lipsync_workers: int = 0  # Lip-sync worker processes, 0 runs a single in-process worker thread
+    lipsync_queue_size: int = 32  # Pending alignment jobs before new ones are rejected
+    lipsync_timeout: float = 30.0  # Seconds a job may spend queued and running
+    lipsync_torch_threads: int = 0  # torch threads per worker, 0 keeps the torch default
+    lipsync_batch_window_ms: int = 0  # Collect concurrent lip-sync jobs for this long into one batch, 0 disables
+    lipsync_max_batch_size: int = 8
+    lipsync_adaptive: bool = False  # Step lip-sync quality down under load and back up when it drops
+    lipsync_fast_model_size: str = "tiny"  # Whisper model of the fast tier
+    lipsync_fast_compute_type: str = "int8"
+    lipsync_degrade_queue_depth: int = 4  # Queued alignment jobs that step quality down
+    lipsync_degrade_latency: float = 3.0  # Smoothed alignment seconds that step quality down
+    lipsync_recover_after: float = 10.0  # Seconds of low load before quality steps back up
+    lipsync_cache_bytes: int = 16 * 1024 * 1024  # In-memory lip-sync cache budget, 0 disables caching
+    lipsync_cache_dir: typing.Optional[str] = None  # Directory for the persistent lip-sync cache tier
+    lipsync_cache_disk_bytes: int = 256 * 1024 * 1024
+    lipsync_warmup: bool = False  # Load lip-sync models at startup and gate /ready on them
+    lipsync_server_socket: typing.Optional[str] = None  # Unix socket of a shared lip-sync model server
+
+
+class RuntimeConfigStore:
+    """
+    Holds the current RuntimeConfig snapshot for this process.
+
+    The file is read once; afterwards ``current`` never touches disk. A watcher
+    task polls the file's mtime (and SIGHUP forces a check), validates the new
+    contents and swaps the snapshot in one assignment, so sessions always see a
+    complete config. Invalid files are logged and ignored. Settings that shape
+    process-wide resources (lip-sync workers, model server) only apply to
+    resources created after the reload.
+    """
+
+    def __init__(self, path: typing.Union[str, Path] = RUNTIME_CONFIG_PATH, poll_interval: float = 2.0):
+        self.path = Path(path)
+        self.poll_interval = poll_interval
+        self._config: typing.Optional[RuntimeConfig] = None
+        self._mtime: typing.Optional[float] = None
+        self._watcher: typing.Optional[asyncio.Task] = None
+
+    @property
+    def current(self) -> RuntimeConfig:
+        if self._config is None:
+            self.reload()
+        return self._config
+
+    def reload(self) -> bool:
+        """
+        Load and validate the config file, swapping it in on success.
+        """
+        try:
+            mtime = self.path.stat().st_mtime
+            config = RuntimeConfig(**json.loads(self.path.read_text()))
+        except FileNotFoundError:
+            if self._config is None:
+                logger.warning(f"{self.path} not found, using the default runtime configuration")
+                self._config = RuntimeConfig()
+            return False
+        except (OSError, json.JSONDecodeError, ValidationError) as e:
+            logger.error(f"Ignoring invalid runtime configuration in {self.path}: {e}")
+            if self._config is None:
+                raise
+            return False
+
+        changed = self._config is not None and config != self._config
+        self._config = config
+        self._mtime = mtime
+        if changed:
+            logger.info(f"🔄 Runtime configuration reloaded: {config}")
+        return changed
+
+    def _file_changed(self) -> bool:
+        try:
+            return os.stat(self.path).st_mtime != self._mtime
+        except FileNotFoundError:
+            return False
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if self._file_changed():
+                await asyncio.to_thread(self.reload)
+
+    def start_watching(self) -> None:
+        """
+        Start the file watcher and the SIGHUP handler on the running loop.
+        """
+        if self._config is None:
+            self.reload()
+        if self._watcher is None:
+            self._watcher = asyncio.create_task(self._watch())
+        try:
+            loop = asyncio.get_running_loop()
+            loop.add_signal_handler(signal.SIGHUP, lambda: loop.create_task(asyncio.to_thread(self.reload)))
+        except (NotImplementedError, AttributeError, RuntimeError):
+            # No SIGHUP on Windows, and signal handlers only work in the main thread
+            pass
+
+    async def stop_watching(self) -> None:
+        if self._watcher:
+            self._watcher.cancel()
+            await asyncio.gather(self._watcher, return_exceptions=True)
+            self._watcher = None
@@ -0,0 +1,60 @@
+"""
+Binary WebSocket framing for /ws/live.
+
+A binary frame is a fixed header followed by an optional JSON metadata block
+and the raw payload (PCM or JPEG bytes)::
+
+    +---------+-----------------+-------------------+-----------+
+    | kind u8 | meta length u32 | metadata (JSON)   | payload   |
+    +---------+-----------------+-------------------+-----------+
+
+Control messages (config, text, turn_complete, errors...) stay JSON text frames.
+"""
+
+import json
+import struct
+from enum import IntEnum
+from typing import Optional, Tuple
+
+FRAME_HEADER = struct.Struct("!BI")
+
+FRAMING_JSON = "json"
+FRAMING_BINARY = "binary"
+
+
+class FrameKind(IntEnum):
+    AUDIO = 1  # PCM16 mono, 16 kHz from the client, 24 kHz from the server
+    IMAGE = 2  # JPEG frame from the client
+
+
+class FrameError(ValueError):
+    """Raised when a binary frame cannot be decoded"""
+
+
+def encode_frame(kind: FrameKind, payload: bytes, metadata: Optional[dict] = None) -> bytes:
+    """
+    Build a binary frame from a kind, raw payload and optional JSON metadata.
+    """
+    meta = json.dumps(metadata, separators=(",", ":")).encode("utf-8") if metadata else b""
+    return b"".join((FRAME_HEADER.pack(int(kind), len(meta)), meta, payload))
+
+
+def decode_frame(frame: bytes) -> Tuple[FrameKind, Optional[dict], bytes]:
+    """
+    Split a binary frame into its kind, metadata and raw payload.
+    """
+    if len(frame) < FRAME_HEADER.size:
+        raise FrameError(f"Frame too short: {len(frame)} bytes")
+
+    kind, meta_length = FRAME_HEADER.unpack_from(frame)
+    try:
+        kind = FrameKind(kind)
+    except ValueError as e:
+        raise FrameError(f"Unknown frame kind: {kind}") from e
+
+    start = FRAME_HEADER.size + meta_length
+    if start > len(frame):
+        raise FrameError("Frame metadata length exceeds frame size")
+
+    metadata = json.loads(frame[FRAME_HEADER.size:start]) if meta_length else None
+    return kind, metadata, frame[start:]
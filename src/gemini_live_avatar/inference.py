@@ -0,0 +1,414 @@
+"""
+Lip-sync inference executor.
+
+Alignment jobs go through a bounded queue and are dispatched to a fixed set of
+workers. With ``workers=0`` a single in-process thread runs the jobs; otherwise
+each worker is a separate process holding its own model, pinned to a torch
+thread count. Jobs carry a deadline, can be cancelled while queued, and the
+executor keeps queue-depth and wait-time statistics.
+
+Under load, jobs arriving within a short window are micro-batched: the
+worker runs one transcribe/align pass per language for the whole batch.
+An isolated job is dispatched immediately, so batching costs no latency
+when the executor is idle.
+
+Jobs marked ``fast`` transcribe with a smaller fallback Whisper model (when
+one is configured), which the adaptive lip-sync policy uses under load.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+from gemini_live_avatar.metrics import ALIGNMENT_QUEUE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+_worker_generator = None
+_warmup_barrier = None  # shared by the worker processes, so each one runs exactly one warmup task
+
+WARMUP_BARRIER_TIMEOUT = 600.0
+
+
+def _init_worker(
+        model_size: str,
+        compute_type: str,
+        torch_threads: int,
+        fast_model_size: Optional[str] = None,
+        fast_compute_type: str = "int8",
+        warmup_barrier: Optional[Any] = None
+) -> None:
+    """
+    Load the lip-sync model once per worker.
+    """
+    global _worker_generator, _warmup_barrier
+    _warmup_barrier = warmup_barrier
+    if torch_threads > 0:
+        import torch
+        torch.set_num_threads(torch_threads)
+
+    from gemini_live_avatar.word_generator import WordGenerator
+    _worker_generator = WordGenerator(
+        model_size=model_size,
+        compute_type=compute_type,
+        fast_model_size=fast_model_size,
+        fast_compute_type=fast_compute_type
+    )
+
+
+def _warmup_worker(languages: List[str]) -> None:
+    """
+    Load the alignment models for ``languages`` and run one dummy alignment each.
+
+    In a process pool the worker then waits at the warmup barrier, so it cannot
+    pick up a second warmup task while another worker is still cold.
+    """
+    import numpy as np
+    from gemini_live_avatar.word_generator import WHISPER_SAMPLE_RATE
+
+    silence = np.zeros(WHISPER_SAMPLE_RATE, dtype=np.float32)
+    _worker_generator.transcription_model(fast=True)
+    for language in languages:
+        _worker_generator.align_transcript(silence, "hello", language)
+    if _warmup_barrier is not None:
+        _warmup_barrier.wait(WARMUP_BARRIER_TIMEOUT)
+
+
+def _run_batch(items: List[Tuple[bytes, Optional[str], Optional[str]]], fast: bool = False) -> List[Union[dict, Exception]]:
+    return _worker_generator.generate_batch(items, fast=fast)
+
+
+class ModelState:
+    UNLOADED = "unloaded"
+    LOADING = "loading"
+    READY = "ready"
+    FAILED = "failed"
+
+
+class LipSyncBusyError(RuntimeError):
+    """Raised when the lip-sync queue is full"""
+
+
+class LipSyncTimeoutError(TimeoutError):
+    """Raised when a lip-sync job misses its deadline"""
+
+
+@dataclass
+class AlignmentJob:
+    pcm: bytes
+    transcript: Optional[str]
+    language: Optional[str]
+    deadline: float
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+    on_start: Optional[Callable[[], Any]] = None
+    fast: bool = False
+
+
+@dataclass
+class InferenceStats:
+    """Counters and timings for the lip-sync executor"""
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    rejected: int = 0
+    expired: int = 0
+    cancelled: int = 0
+    batches: int = 0
+    batched_jobs: int = 0
+    wait_time_total: float = 0.0
+    wait_time_max: float = 0.0
+    run_time_total: float = 0.0
+
+    def record_wait(self, wait_time: float) -> None:
+        self.wait_time_total += wait_time
+        self.wait_time_max = max(self.wait_time_max, wait_time)
+
+
+class InferenceExecutor:
+    def __init__(
+            self,
+            workers: int = 0,
+            queue_size: int = 32,
+            timeout: float = 30.0,
+            torch_threads: int = 0,
+            model_size: str = "small",
+            compute_type: str = "float32",
+            batch_window: float = 0.0,
+            max_batch_size: int = 8,
+            fast_model_size: Optional[str] = None,
+            fast_compute_type: str = "int8"
+    ):
+        self.workers = workers
+        self.batch_window = batch_window
+        self.max_batch_size = max(1, max_batch_size)
+        self.timeout = timeout
+        self.torch_threads = torch_threads
+        self.model_size = model_size
+        self.compute_type = compute_type
+        self.fast_model_size = fast_model_size
+        self.fast_compute_type = fast_compute_type
+        self.queue_size = queue_size
+        self.stats = InferenceStats()
+        self._queue: Optional[asyncio.Queue] = None
+        self._pool: Optional[Executor] = None
+        self._warmup_barrier = None
+        self._dispatchers: list[asyncio.Task] = []
+        self._running = 0
+        self._last_enqueued_at = 0.0
+        self._arrival_gap = float("inf")  # seconds between the last two submissions
+        self.model_state = ModelState.UNLOADED
+        self.model_error: Optional[str] = None
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    def start(self) -> None:
+        """
+        Create the worker pool and dispatchers. Called lazily on the first job.
+        """
+        if self._pool:
+            return
+
+        initargs = (self.model_size, self.compute_type, self.torch_threads, self.fast_model_size, self.fast_compute_type)
+        if self.workers > 0:
+            logger.info(f"🧵 Starting {self.workers} lip-sync worker processes")
+            context = multiprocessing.get_context("spawn")
+            self._warmup_barrier = context.Barrier(self.workers)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=initargs + (self._warmup_barrier,)
+            )
+        else:
+            logger.info("🧵 Starting in-process lip-sync worker")
+            self._pool = ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix="lipsync",
+                initializer=_init_worker,
+                initargs=initargs
+            )
+
+        self.model_state = ModelState.LOADING
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._dispatchers = [
+            asyncio.create_task(self._dispatch()) for _ in range(max(1, self.workers))
+        ]
+
+    @property
+    def is_ready(self) -> bool:
+        return self.model_state == ModelState.READY
+
+    async def warmup(self, languages: List[str]) -> None:
+        """
+        Load the models on every worker and run a dummy alignment per language,
+        so the first real turn does not pay for model loading.
+        """
+        self.start()
+        loop = asyncio.get_running_loop()
+        logger.info(f"🔥 Warming up lip-sync models for languages: {languages}")
+        if self._warmup_barrier is not None:
+            # A failed warmup leaves the barrier broken
+            self._warmup_barrier.reset()
+        try:
+            await asyncio.gather(*[
+                loop.run_in_executor(self._pool, _warmup_worker, languages)
+                for _ in range(max(1, self.workers))
+            ])
+        except Exception as e:
+            logger.exception("Lip-sync warmup failed")
+            self.model_state = ModelState.FAILED
+            self.model_error = str(e)
+            return
+        self.model_state = ModelState.READY
+        logger.info("✅ Lip-sync models are warm")
+
+    async def submit(
+            self,
+            pcm: bytes,
+            transcript: Optional[str] = None,
+            language: Optional[str] = None,
+            timeout: Optional[float] = None,
+            on_start: Optional[Callable[[], Any]] = None,
+            fast: bool = False
+    ) -> dict:
+        """
+        Queue an alignment job and wait for its word timings.
+
+        Raises LipSyncBusyError when the queue is full and LipSyncTimeoutError when
+        the job is not finished before its deadline. Cancelling the caller drops the
+        job if it has not started yet. ``on_start`` is called when a worker picks it up,
+        and ``fast`` transcribes with the fallback model.
+        """
+        self.start()
+        loop = asyncio.get_running_loop()
+        job = AlignmentJob(
+            pcm=pcm,
+            transcript=transcript,
+            language=language,
+            deadline=time.monotonic() + (timeout or self.timeout),
+            future=loop.create_future(),
+            on_start=on_start,
+            fast=fast
+        )
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.stats.rejected += 1
+            raise LipSyncBusyError(f"Lip-sync queue is full ({self.queue_size} jobs)")
+
+        self.stats.submitted += 1
+        self._arrival_gap = job.enqueued_at - self._last_enqueued_at
+        self._last_enqueued_at = job.enqueued_at
+        try:
+            return await job.future
+        except asyncio.CancelledError:
+            job.future.cancel()
+            raise
+
+    async def _collect_batch(self) -> List[AlignmentJob]:
+        """
+        Wait for one job, then gather more for up to ``batch_window`` seconds.
+
+        The window is only used while jobs keep arriving close together; an
+        isolated job goes out on its own right away.
+        """
+        first: AlignmentJob = await self._queue.get()
+        batch = [first]
+        if self.max_batch_size == 1 or self.batch_window <= 0:
+            return batch
+
+        loaded = self._queue.qsize() > 0 or self._running > 0 or self._arrival_gap < self.batch_window
+        deadline = time.monotonic() + (self.batch_window if loaded else 0.0)
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                break
+        return batch
+
+    def _ready_jobs(self, batch: List[AlignmentJob], now: float) -> List[AlignmentJob]:
+        """
+        Drop cancelled and expired jobs from a batch before it runs.
+        """
+        ready = []
+        for job in batch:
+            if job.future.done():
+                self.stats.cancelled += 1
+                continue
+            self.stats.record_wait(now - job.enqueued_at)
+            ALIGNMENT_QUEUE_SECONDS.observe(now - job.enqueued_at)
+            if job.deadline <= now:
+                self.stats.expired += 1
+                job.future.set_exception(LipSyncTimeoutError("Lip-sync job expired while queued"))
+                continue
+            if job.on_start:
+                job.on_start()
+            ready.append(job)
+        return ready
+
+    async def _dispatch(self) -> None:
+        while True:
+            batch = await self._collect_batch()
+            try:
+                jobs = self._ready_jobs(batch, time.monotonic())
+                # Fast and regular jobs use different Whisper models, so they run as separate batches
+                for fast in (False, True):
+                    group = [job for job in jobs if job.fast == fast]
+                    if group:
+                        await self._run_jobs(group, fast)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _run_jobs(self, jobs: List[AlignmentJob], fast: bool) -> None:
+        loop = asyncio.get_running_loop()
+        started_at = time.monotonic()
+        self.stats.batches += 1
+        self.stats.batched_jobs += len(jobs)
+        self._running += len(jobs)
+        items = [(job.pcm, job.transcript, job.language) for job in jobs]
+        try:
+            run = loop.run_in_executor(self._pool, _run_batch, items, fast)
+            done, _ = await asyncio.wait({run}, timeout=max(0.0, min(job.deadline for job in jobs) - started_at))
+            if not done:
+                # The pool can't cancel a running batch: fail the callers now, but keep
+                # the slot until the worker is free so batches don't pile up in the pool
+                self._settle(jobs, [LipSyncTimeoutError("Lip-sync job exceeded its deadline")] * len(jobs))
+                await asyncio.wait({run})
+            try:
+                results = run.result()
+            except Exception as e:
+                results = [e] * len(jobs)
+        finally:
+            self._running -= len(jobs)
+            self.stats.run_time_total += (time.monotonic() - started_at) * len(jobs)
+        self._settle(jobs, results)
+
+    def _settle(self, jobs: List[AlignmentJob], results: list) -> None:
+        """
+        Resolve the futures of jobs that are still waiting and count the outcomes.
+        """
+        for job, result in zip(jobs, results):
+            if job.future.done():
+                continue
+            if isinstance(result, LipSyncTimeoutError):
+                self.stats.expired += 1
+            elif isinstance(result, Exception):
+                self.stats.failed += 1
+            else:
+                self.stats.completed += 1
+                self.model_state = ModelState.READY
+            if isinstance(result, Exception):
+                job.future.set_exception(result)
+            else:
+                job.future.set_result(result)
+
+    def snapshot(self) -> dict:
+        """
+        Current queue depth and counters, for logging or a stats endpoint.
+        """
+        started = self.stats.completed + self.stats.failed + self.stats.expired
+        return {
+            "model_state": self.model_state,
+            "workers": self.workers,
+            "fast_model": self.fast_model_size,
+            "queue_depth": self.queue_depth,
+            "queue_size": self.queue_size,
+            "running": self.running,
+            "submitted": self.stats.submitted,
+            "completed": self.stats.completed,
+            "failed": self.stats.failed,
+            "rejected": self.stats.rejected,
+            "expired": self.stats.expired,
+            "cancelled": self.stats.cancelled,
+            "batches": self.stats.batches,
+            "batch_size_avg": self.stats.batched_jobs / self.stats.batches if self.stats.batches else 0.0,
+            "wait_time_avg": self.stats.wait_time_total / started if started else 0.0,
+            "wait_time_max": self.stats.wait_time_max,
+            "run_time_avg": self.stats.run_time_total / started if started else 0.0,
+        }
+
+    async def close(self) -> None:
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._dispatchers = []
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self._queue = None
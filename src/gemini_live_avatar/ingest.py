@@ -0,0 +1,331 @@
+"""
+Inbound media stages between the browser and the Live session.
+
+Microphone audio can pass through ``VoiceActivityGate``, which drops silent
+20 ms frames using their RMS energy against a fixed threshold and an adaptive
+noise floor. Speech onsets keep a short pre-roll and speech is followed by a
+hangover, so word boundaries are not clipped; when the gate closes the Live
+API is told the audio stream ended, letting its own turn detection finish
+without a stream of silence. ``JitterBuffer`` regroups the browser's small
+chunks into fixed-size frames before they go upstream.
+
+Camera frames pass through ``VideoIngest``, which enforces a maximum frame
+rate and drops frames whose perceptual hash is within a small Hamming
+distance of the last frame sent. Hashing decodes a downscaled copy in a
+thread pool, so the event loop never decodes images. Frames that pass can then
+go through ``FrameTranscoder``, which shrinks them to a maximum dimension and
+re-encodes them as JPEG or WebP on the same pool. Each session has one frame
+in flight and one waiting slot; a newer frame replaces the waiting one, so a
+slow pool drops stale frames instead of queueing them.
+"""
+
+import asyncio
+import io
+import logging
+import time
+from collections import deque
+from concurrent.futures import Executor
+from typing import Awaitable, Callable, Deque, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from gemini_live_avatar.metrics import INPUT_AUDIO_FRAMES, INPUT_VIDEO_FRAMES
+
+logger = logging.getLogger(__name__)
+
+INPUT_SAMPLE_RATE = 16000
+
+IMAGE_FORMATS = {"jpeg": ("JPEG", "image/jpeg"), "webp": ("WEBP", "image/webp")}
+
+# Marks the point in AudioIngest output where the gate closed and the audio stream ends
+STREAM_END = None
+
+
+class VoiceActivityGate:
+    def __init__(
+            self,
+            sample_rate: int = INPUT_SAMPLE_RATE,
+            frame_ms: int = 20,
+            threshold: float = 300.0,
+            hangover_ms: int = 600,
+            preroll_ms: int = 200,
+            noise_ratio: float = 3.0,
+            noise_smoothing: float = 0.05
+    ):
+        self.frame_samples = sample_rate * frame_ms // 1000
+        self.frame_bytes = self.frame_samples * 2
+        self.threshold = threshold
+        self.hangover_frames = max(1, hangover_ms // frame_ms)
+        self.noise_ratio = noise_ratio
+        self.noise_smoothing = noise_smoothing
+        self.is_open = False
+        self.noise_floor: Optional[float] = None  # smoothed RMS of non-speech frames
+        self._preroll: Deque[bytes] = deque(maxlen=max(0, preroll_ms // frame_ms))
+        self._pending = b""  # bytes not yet covering a whole frame
+        self._hangover = 0   # frames still forwarded after the last speech frame
+
+    def feed(self, pcm: bytes) -> List[Optional[bytes]]:
+        """
+        Return the audio to forward, with STREAM_END where the gate closed.
+        """
+        data = self._pending + pcm
+        n_frames = len(data) // self.frame_bytes
+        self._pending = data[n_frames * self.frame_bytes:]
+        if not n_frames:
+            return []
+
+        frames = np.frombuffer(data, dtype=np.int16, count=n_frames * self.frame_samples)
+        frames = frames.reshape(n_frames, self.frame_samples).astype(np.float32)
+        levels = np.sqrt(np.mean(frames * frames, axis=1)).tolist()
+
+        output: List[Optional[bytes]] = []
+        forwarded = bytearray()
+        forwarded_frames = 0
+        for index, level in enumerate(levels):
+            frame = data[index * self.frame_bytes:(index + 1) * self.frame_bytes]
+            threshold = max(self.threshold, (self.noise_floor or 0.0) * self.noise_ratio)
+            if level >= threshold:
+                if not self.is_open:
+                    self.is_open = True
+                    forwarded_frames += len(self._preroll)
+                    forwarded.extend(b"".join(self._preroll))
+                    self._preroll.clear()
+                self._hangover = self.hangover_frames
+                forwarded.extend(frame)
+                forwarded_frames += 1
+                continue
+
+            if self.noise_floor is None:
+                self.noise_floor = level
+            else:
+                self.noise_floor += self.noise_smoothing * (level - self.noise_floor)
+            if self.is_open:
+                forwarded.extend(frame)
+                forwarded_frames += 1
+                self._hangover -= 1
+                if self._hangover <= 0:
+                    self.is_open = False
+                    output.extend((bytes(forwarded), STREAM_END))
+                    forwarded.clear()
+            else:
+                self._preroll.append(frame)
+
+        if forwarded:
+            output.append(bytes(forwarded))
+        INPUT_AUDIO_FRAMES.inc("forwarded", amount=forwarded_frames)
+        INPUT_AUDIO_FRAMES.inc("dropped", amount=max(0, n_frames - forwarded_frames))
+        return output
+
+
+class JitterBuffer:
+    """
+    Regroups a byte stream into frames of ``frame_bytes``.
+    """
+
+    def __init__(self, frame_bytes: int):
+        self.frame_bytes = frame_bytes
+        self._buffer = bytearray()
+
+    def push(self, data: bytes) -> List[bytes]:
+        self._buffer.extend(data)
+        n_frames = len(self._buffer) // self.frame_bytes
+        frames = [bytes(self._buffer[i * self.frame_bytes:(i + 1) * self.frame_bytes]) for i in range(n_frames)]
+        del self._buffer[:n_frames * self.frame_bytes]
+        return frames
+
+    def flush(self) -> Optional[bytes]:
+        if not self._buffer:
+            return None
+        tail = bytes(self._buffer)
+        self._buffer.clear()
+        return tail
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+
+class AudioIngest:
+    """
+    Microphone audio stage of one session: optional VAD gate, then optional regrouping.
+    """
+
+    def __init__(self, gate: Optional[VoiceActivityGate] = None, frame_ms: int = 0, sample_rate: int = INPUT_SAMPLE_RATE):
+        self.gate = gate
+        self.frame_ms = frame_ms
+        self.jitter = JitterBuffer(sample_rate * frame_ms // 1000 * 2) if frame_ms > 0 else None
+
+    def feed(self, pcm: bytes) -> List[Optional[bytes]]:
+        """
+        Return the frames to send upstream, with STREAM_END where the audio stream ends.
+        """
+        output: List[Optional[bytes]] = []
+        for segment in self.gate.feed(pcm) if self.gate else [pcm]:
+            if segment is STREAM_END:
+                output.extend(self.flush())
+                output.append(STREAM_END)
+            elif self.jitter:
+                output.extend(self.jitter.push(segment))
+            else:
+                output.append(segment)
+        return output
+
+    def flush(self) -> List[bytes]:
+        """
+        Release a partly filled frame, e.g. when the browser stops sending.
+        """
+        tail = self.jitter.flush() if self.jitter else None
+        return [tail] if tail else []
+
+    @property
+    def pending(self) -> bool:
+        return bool(self.jitter and self.jitter.pending)
+
+
+def perceptual_hash(image_bytes: bytes, hash_size: int = 8) -> int:
+    """
+    Difference hash of an encoded image: compares neighbouring pixels of a
+    (hash_size + 1) x hash_size grayscale thumbnail, one bit per comparison.
+    """
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        # JPEGs decode straight to a reduced scale, which is most of the saving
+        image.draft("L", (hash_size * 8, hash_size * 8))
+        thumbnail = image.convert("L").resize((hash_size + 1, hash_size), Image.Resampling.BILINEAR)
+    pixels = np.asarray(thumbnail, dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+class VideoIngest:
+    """
+    Camera frame stage of one session: frame-rate limit, then near-duplicate suppression.
+    """
+
+    def __init__(self, executor: Optional[Executor] = None, max_fps: float = 2.0, dedup_distance: int = 3):
+        self.executor = executor
+        self.max_fps = max_fps
+        self.dedup_distance = dedup_distance
+        self._last_sent_at = float("-inf")
+        self._last_hash: Optional[int] = None
+
+    async def accept(self, image_bytes: bytes) -> bool:
+        """
+        Whether this frame should go upstream; accepted frames become the new reference.
+        """
+        now = time.monotonic()
+        if self.max_fps > 0 and now - self._last_sent_at < 1 / self.max_fps:
+            INPUT_VIDEO_FRAMES.inc("rate_limited")
+            return False
+
+        if self.dedup_distance >= 0:
+            try:
+                frame_hash = await asyncio.get_running_loop().run_in_executor(self.executor, perceptual_hash, image_bytes)
+            except Exception:
+                # Forward frames we can't decode; Gemini decides what to do with them
+                frame_hash = None
+            if (
+                frame_hash is not None
+                and self._last_hash is not None
+                and (frame_hash ^ self._last_hash).bit_count() <= self.dedup_distance
+            ):
+                INPUT_VIDEO_FRAMES.inc("duplicate")
+                return False
+            self._last_hash = frame_hash
+
+        self._last_sent_at = now
+        INPUT_VIDEO_FRAMES.inc("forwarded")
+        return True
+
+
+def transcode_image(
+        image_bytes: bytes,
+        max_dimension: int = 768,
+        quality: int = 75,
+        image_format: str = "jpeg"
+) -> Tuple[bytes, str]:
+    """
+    Shrink an encoded image to fit ``max_dimension`` and re-encode it, returning
+    the new bytes and their mime type. The input is returned unchanged when it
+    is already a JPEG no larger than the re-encoded result.
+    """
+    pil_format, mime_type = IMAGE_FORMATS[image_format]
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        source_format = image.format
+        if max_dimension > 0:
+            # Lets JPEGs decode at the smallest power-of-two scale still above the target
+            image.draft("RGB", (max_dimension, max_dimension))
+        image = image.convert("RGB")
+    if max_dimension > 0 and max(image.size) > max_dimension:
+        image.thumbnail((max_dimension, max_dimension), Image.Resampling.BILINEAR)
+
+    output = io.BytesIO()
+    if pil_format == "WEBP":
+        image.save(output, pil_format, quality=quality, method=2)
+    else:
+        image.save(output, pil_format, quality=quality, optimize=False)
+    encoded = output.getvalue()
+    if source_format == pil_format and len(encoded) >= len(image_bytes):
+        return image_bytes, mime_type
+    return encoded, mime_type
+
+
+class FrameTranscoder:
+    """
+    Per-session transcode stage with a latest-frame slot: frames that arrive
+    while one is being transcoded replace each other, and only the newest is sent.
+    """
+
+    def __init__(
+            self,
+            send: Callable[[bytes, str], Awaitable[None]],
+            executor: Optional[Executor] = None,
+            max_dimension: int = 768,
+            quality: int = 75,
+            image_format: str = "jpeg"
+    ):
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Unsupported image format: {image_format}")
+        self._send = send
+        self.executor = executor
+        self.max_dimension = max_dimension
+        self.quality = quality
+        self.image_format = image_format
+        self._latest: Optional[bytes] = None  # newest frame waiting for the worker
+        self._task: Optional[asyncio.Task] = None
+
+    def submit(self, image_bytes: bytes) -> None:
+        """
+        Queue a frame for transcoding, dropping the one still waiting, if any.
+        """
+        if self._latest is not None:
+            INPUT_VIDEO_FRAMES.inc("stale")
+        self._latest = image_bytes
+        if self._task is None:
+            self._task = asyncio.create_task(self._drain())
+
+    def close(self) -> None:
+        self._latest = None
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _drain(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while self._latest is not None:
+                frame, self._latest = self._latest, None
+                try:
+                    data, mime_type = await loop.run_in_executor(
+                        self.executor, transcode_image, frame, self.max_dimension, self.quality, self.image_format
+                    )
+                except Exception as e:
+                    logger.warning(f"Could not transcode camera frame, sending it as is: {e}")
+                    data, mime_type = frame, "image/jpeg"
+                try:
+                    await self._send(data, mime_type)
+                except Exception as e:
+                    logger.warning(f"Could not send camera frame: {e}")
+        finally:
+            if self._task is asyncio.current_task():
+                self._task = None
@@ -0,0 +1,463 @@
+"""
+Streaming lip-sync alignment and caching.
+
+Gemini audio is cut at natural pauses while the turn is still arriving, and
+each closed segment is aligned in the background. Word timings are rebased
+from segment time to turn time before they are reported.
+
+Aligned timings are cached by a hash of the PCM (plus transcript and language
+when alignment used them) in an in-memory LRU with an optional disk tier.
+
+Under load ``AdaptiveLipSyncPolicy`` trades lip-sync quality for latency,
+stepping down from the configured model to a fast model, to forced alignment
+only, and finally to ``signal_word_timings``, which needs no model at all.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+AlignFn = Callable[[bytes], Awaitable[dict]]
+SegmentCallback = Callable[[dict], Awaitable[None]]
+
+
+def empty_word_timings() -> dict:
+    return {"words": [], "wtimes": [], "wdurations": []}
+
+
+def rebase_word_timings(words_data: dict, offset_ms: int) -> dict:
+    """
+    Shift word start times by ``offset_ms``.
+    """
+    return {
+        "words": list(words_data.get("words", [])),
+        "wtimes": [t + offset_ms for t in words_data.get("wtimes", [])],
+        "wdurations": list(words_data.get("wdurations", [])),
+    }
+
+
+def merge_word_timings(parts: List[dict]) -> dict:
+    """
+    Concatenate word timings that are already expressed in turn time.
+    """
+    merged = empty_word_timings()
+    for part in parts:
+        for key in merged:
+            merged[key].extend(part.get(key, []))
+    return merged
+
+
+def signal_word_timings(
+        pcm: bytes,
+        transcript: Optional[str],
+        sample_rate: int = 24000,
+        frame_ms: int = 20,
+        silence_threshold: float = 500.0
+) -> dict:
+    """
+    Spread the transcript's words over the voiced frames of the audio, in proportion
+    to their length. Cheap enough to run on the event loop; without a transcript
+    there is nothing to place and the timings are empty.
+    """
+    words = transcript.split() if transcript else []
+    frame_samples = sample_rate * frame_ms // 1000
+    n_frames = len(pcm) // (frame_samples * 2)
+    if not words or not n_frames:
+        return empty_word_timings()
+
+    frames = np.frombuffer(pcm, dtype=np.int16, count=n_frames * frame_samples)
+    frames = frames.reshape(n_frames, frame_samples).astype(np.float32)
+    voiced = np.sqrt(np.mean(frames * frames, axis=1)) >= silence_threshold
+    if not voiced.any():
+        voiced[:] = True
+
+    # voiced_frames[i] is the index of the i-th voiced frame; words are laid out in voiced time
+    voiced_frames = np.flatnonzero(voiced)
+    weights = np.array([len(word) + 1 for word in words], dtype=np.float64)
+    bounds = np.concatenate(([0.0], np.cumsum(weights))) / weights.sum() * voiced_frames.size
+    starts = voiced_frames[np.minimum(bounds[:-1].astype(int), voiced_frames.size - 1)]
+    ends = voiced_frames[np.maximum(np.ceil(bounds[1:]).astype(int) - 1, 0)] + 1
+    ends = np.maximum(ends, starts + 1)
+
+    return {
+        "words": words,
+        "wtimes": (starts * frame_ms).tolist(),
+        "wdurations": ((ends - starts) * frame_ms).tolist(),
+    }
+
+
+class LipSyncTier:
+    FULL = "full"              # configured Whisper model, or forced alignment with a transcript
+    FAST = "fast"              # smaller Whisper model when there is no transcript
+    ALIGN_ONLY = "align_only"  # forced alignment against the transcript, never ASR
+    SIGNAL = "signal"          # words spread over the audio envelope, no model
+
+    ORDER = (FULL, FAST, ALIGN_ONLY, SIGNAL)
+
+    @classmethod
+    def worst(cls, first: Optional[str], second: str) -> str:
+        if first not in cls.ORDER:
+            return second
+        return max(first, second, key=cls.ORDER.index)
+
+
+class AdaptiveLipSyncPolicy:
+    """
+    Picks a lip-sync tier from the executor queue depth and recent alignment latency.
+
+    Overload steps down one tier at a time, at most every ``step_down_interval``
+    seconds. Quality steps back up one tier once the queue has stayed short and
+    latency low for ``recover_after`` seconds. Latency is smoothed, forgotten on
+    every tier change and ignored once it is older than ``latency_window``.
+    """
+
+    def __init__(
+            self,
+            degrade_queue_depth: int = 4,
+            degrade_latency: float = 3.0,
+            recover_after: float = 10.0,
+            step_down_interval: float = 1.0,
+            latency_window: float = 15.0,
+            smoothing: float = 0.3
+    ):
+        self.degrade_queue_depth = max(1, degrade_queue_depth)
+        self.degrade_latency = degrade_latency
+        self.recover_after = recover_after
+        self.step_down_interval = step_down_interval
+        self.latency_window = latency_window
+        self.smoothing = smoothing
+        self.level = 0
+        self.latency: Optional[float] = None
+        self.turns: Dict[str, int] = {tier: 0 for tier in LipSyncTier.ORDER}
+        self._latency_at = 0.0
+        self._changed_at = 0.0
+        self._calm_since: Optional[float] = None
+
+    @property
+    def tier(self) -> str:
+        return LipSyncTier.ORDER[self.level]
+
+    def observe_latency(self, seconds: float) -> None:
+        self.latency = seconds if self.latency is None else self.smoothing * seconds + (1 - self.smoothing) * self.latency
+        self._latency_at = time.monotonic()
+
+    def record(self, tier: str) -> None:
+        self.turns[tier] += 1
+
+    def record_overload(self) -> None:
+        """
+        The executor rejected or dropped a job; step down right away if allowed.
+        """
+        self._calm_since = None
+        self._step(1, time.monotonic(), "lip-sync queue rejected or expired a job")
+
+    def select(self, queue_depth: int) -> str:
+        now = time.monotonic()
+        latency = self.latency if now - self._latency_at < self.latency_window else None
+
+        if queue_depth >= self.degrade_queue_depth or (latency is not None and latency >= self.degrade_latency):
+            self._calm_since = None
+            latency_text = f"{latency:.2f}s" if latency is not None else "n/a"
+            self._step(1, now, f"queue depth {queue_depth}, latency {latency_text}")
+        elif queue_depth <= self.degrade_queue_depth // 4 and (latency is None or latency < self.degrade_latency / 2):
+            if self._calm_since is None:
+                self._calm_since = now
+            elif now - self._calm_since >= self.recover_after:
+                self._step(-1, now, f"load stayed low for {self.recover_after:.0f}s")
+                self._calm_since = now
+        else:
+            self._calm_since = None
+        return self.tier
+
+    def _step(self, direction: int, now: float, reason: str) -> None:
+        level = min(max(self.level + direction, 0), len(LipSyncTier.ORDER) - 1)
+        if level == self.level or (direction > 0 and now - self._changed_at < self.step_down_interval):
+            return
+        self.level = level
+        self._changed_at = now
+        self.latency = None
+        if direction > 0:
+            logger.warning(f"📉 Lip-sync quality stepped down to {self.tier} ({reason})")
+        else:
+            logger.info(f"📈 Lip-sync quality stepped up to {self.tier} ({reason})")
+
+    def snapshot(self) -> dict:
+        return {
+            "tier": self.tier,
+            "latency": self.latency,
+            "turns": dict(self.turns),
+        }
+
+
+class PauseSegmenter:
+    """
+    Finds pauses in int16 PCM using frame RMS energy.
+
+    Audio is consumed incrementally; ``feed`` returns the byte positions (relative
+    to everything fed so far) where a segment should be closed.
+    """
+
+    def __init__(
+            self,
+            sample_rate: int = 24000,
+            frame_ms: int = 20,
+            silence_threshold: float = 500.0,
+            min_silence_ms: int = 300,
+            min_segment_ms: int = 2000
+    ):
+        self.frame_samples = sample_rate * frame_ms // 1000
+        self.silence_threshold = silence_threshold
+        self.min_silence_frames = max(1, min_silence_ms // frame_ms)
+        self.min_segment_samples = sample_rate * min_segment_ms // 1000
+        self._pending = b""       # bytes not yet covering a whole frame
+        self._position = 0        # samples scanned so far
+        self._segment_start = 0   # sample where the open segment began
+        self._silent_run = 0      # consecutive silent frames
+
+    def feed(self, pcm: bytes) -> List[int]:
+        data = self._pending + pcm
+        frame_bytes = self.frame_samples * 2
+        n_frames = len(data) // frame_bytes
+        self._pending = data[n_frames * frame_bytes:]
+        if not n_frames:
+            return []
+
+        frames = np.frombuffer(data, dtype=np.int16, count=n_frames * self.frame_samples)
+        frames = frames.reshape(n_frames, self.frame_samples).astype(np.float32)
+        silent = np.sqrt(np.mean(frames * frames, axis=1)) < self.silence_threshold
+
+        cuts = []
+        for index, is_silent in enumerate(silent):
+            self._silent_run = self._silent_run + 1 if is_silent else 0
+            if self._silent_run < self.min_silence_frames:
+                continue
+            # Cut in the middle of the pause so word endings stay in the closed segment
+            frame_end = self._position + (index + 1) * self.frame_samples
+            cut = frame_end - (self._silent_run * self.frame_samples) // 2
+            if cut - self._segment_start >= self.min_segment_samples:
+                cuts.append(cut * 2)
+                self._segment_start = cut
+                self._silent_run = 0
+        self._position += n_frames * self.frame_samples
+        return cuts
+
+
+class StreamingAligner:
+    """
+    Aligns one turn of 24 kHz PCM segment by segment while it is streaming in.
+    """
+
+    def __init__(
+            self,
+            align: AlignFn,
+            on_segment: Optional[SegmentCallback] = None,
+            sample_rate: int = 24000,
+            segmenter: Optional[PauseSegmenter] = None
+    ):
+        self.align = align
+        self.on_segment = on_segment
+        self.sample_rate = sample_rate
+        self.segmenter = segmenter or PauseSegmenter(sample_rate=sample_rate)
+        self._buffer = bytearray()     # audio of the open segment
+        self._buffer_offset = 0        # turn byte offset of the open segment
+        self._tasks: List[asyncio.Task] = []
+
+    def feed(self, pcm: bytes) -> None:
+        """
+        Add a chunk of PCM and schedule alignment for every segment it closes.
+        """
+        self._buffer.extend(pcm)
+        for cut in self.segmenter.feed(pcm):
+            self._close_segment(cut - self._buffer_offset)
+
+    async def finish(self) -> dict:
+        """
+        Close the trailing segment, wait for every alignment and return the turn's timings.
+        """
+        if self._buffer:
+            self._close_segment(len(self._buffer))
+        parts = await asyncio.gather(*self._tasks)
+        self._tasks.clear()
+        return merge_word_timings(parts)
+
+    def cancel(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+        self._buffer.clear()
+
+    def _close_segment(self, length: int) -> None:
+        segment = bytes(self._buffer[:length])
+        del self._buffer[:length]
+        offset_ms = self._buffer_offset * 1000 // (self.sample_rate * 2)
+        self._buffer_offset += length
+        index = len(self._tasks)
+        logger.info(f"✂️ Closing lip-sync segment {index} at {offset_ms} ms ({len(segment)} bytes)")
+        self._tasks.append(asyncio.create_task(self._align_segment(index, segment, offset_ms)))
+
+    async def _align_segment(self, index: int, segment: bytes, offset_ms: int) -> dict:
+        try:
+            words_data = rebase_word_timings(await self.align(segment), offset_ms)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Pauses, breaths and noise often produce no transcription; skip them
+            logger.warning(f"Lip-sync segment {index} could not be aligned: {e}")
+            words_data = empty_word_timings()
+
+        if self.on_segment and words_data["words"]:
+            await self.on_segment({**words_data, "segment": index, "offset": offset_ms})
+        return words_data
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class LipSyncCache:
+    """
+    Content-addressed cache of word timings.
+
+    The memory tier is an LRU bounded by the JSON size of its entries. The optional
+    disk tier stores one JSON file per key, survives restarts, and evicts the least
+    recently written files once it grows past its own byte budget.
+    """
+
+    def __init__(
+            self,
+            max_bytes: int = 16 * 1024 * 1024,
+            disk_dir: Optional[Union[str, Path]] = None,
+            max_disk_bytes: int = 256 * 1024 * 1024
+    ):
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[str, tuple[dict, int]]" = OrderedDict()
+        self._bytes = 0
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self._disk_bytes = 0
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            self._disk_bytes = sum(f.stat().st_size for f in self.disk_dir.glob("*.json"))
+
+    @staticmethod
+    def key_for(pcm: bytes, transcript: Optional[str] = None, language: Optional[str] = None) -> str:
+        digest = hashlib.blake2b(pcm, digest_size=20)
+        if transcript:
+            digest.update(b"\0" + transcript.encode("utf-8"))
+        if language:
+            digest.update(b"\0" + language.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get_memory(self, key: str) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        self.stats.memory_hits += 1
+        return entry[0]
+
+    async def get(self, key: str) -> Optional[dict]:
+        value = self.get_memory(key)
+        if value is not None:
+            return value
+
+        if self.disk_dir:
+            value = await asyncio.to_thread(self._read_disk, key)
+            if value is not None:
+                self.stats.disk_hits += 1
+                self._put_memory(key, value, json.dumps(value))
+                return value
+
+        self.stats.misses += 1
+        return None
+
+    async def put(self, key: str, value: dict) -> None:
+        payload = json.dumps(value)
+        self._put_memory(key, value, payload)
+        if self.disk_dir:
+            try:
+                await asyncio.to_thread(self._write_disk, key, payload)
+            except OSError as e:
+                # The memory tier already has the entry; a failed disk write only loses persistence
+                logger.warning(f"Could not write lip-sync cache entry {key}: {e}")
+
+    def _put_memory(self, key: str, value: dict, payload: str) -> None:
+        size = len(payload)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[1]
+        self._entries[key] = (value, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.stats.evictions += 1
+
+    def _read_disk(self, key: str) -> Optional[dict]:
+        try:
+            return json.loads((self.disk_dir / f"{key}.json").read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write_disk(self, key: str, payload: str) -> None:
+        path = self.disk_dir / f"{key}.json"
+        if path.exists():
+            return
+        # A unique temp file per writer, so concurrent puts of the same key don't collide
+        with tempfile.NamedTemporaryFile("w", dir=self.disk_dir, prefix=f"{key}.", suffix=".tmp", delete=False) as tmp:
+            tmp.write(payload)
+        try:
+            os.replace(tmp.name, path)
+        except OSError:
+            Path(tmp.name).unlink(missing_ok=True)
+            raise
+        self._disk_bytes += len(payload)
+        if self._disk_bytes > self.max_disk_bytes:
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        files = []
+        for file in self.disk_dir.glob("*.json"):
+            try:
+                stat = file.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, file))
+        for _, size, file in sorted(files, key=lambda item: item[0]):
+            if self._disk_bytes <= self.max_disk_bytes * 0.9:
+                break
+            self._disk_bytes -= size
+            file.unlink(missing_ok=True)
+            self.stats.evictions += 1
+
+    def snapshot(self) -> dict:
+        lookups = self.stats.memory_hits + self.stats.disk_hits + self.stats.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "disk_bytes": self._disk_bytes,
+            "memory_hits": self.stats.memory_hits,
+            "disk_hits": self.stats.disk_hits,
+            "misses": self.stats.misses,
+            "evictions": self.stats.evictions,
+            "hit_rate": (self.stats.memory_hits + self.stats.disk_hits) / lookups if lookups else 0.0,
+        }
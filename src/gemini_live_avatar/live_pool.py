@@ -0,0 +1,169 @@
+"""
+Pool of pre-connected Gemini Live sessions.
+
+Opening a Live session costs a TLS handshake plus the Live setup exchange, which
+the user would otherwise wait for on every page load. The pool keeps a few
+sessions connected per (model, LiveConnectConfig) fingerprint and hands one to
+each incoming WebSocket; a background task per fingerprint tops the pool back
+up. Idle sessions count against the Live connection lifetime, so they are
+closed once they reach ``max_age`` and never handed out.
+
+The connect function is injectable, so the pool can be exercised against a
+local fake Live endpoint.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncContextManager, Callable, Deque, Dict, Optional, Tuple
+
+from google.genai.types import LiveConnectConfig
+
+logger = logging.getLogger(__name__)
+
+ConnectFn = Callable[..., AsyncContextManager[Any]]  # called as connect(model=..., config=...)
+
+
+def config_fingerprint(model: str, config: LiveConnectConfig) -> str:
+    payload = model + "\0" + config.model_dump_json(exclude_none=True)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass
+class PooledLiveSession:
+    session: Any
+    context: AsyncContextManager[Any]
+    created_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created_at
+
+    async def close(self) -> None:
+        try:
+            await self.context.__aexit__(None, None, None)
+        except Exception as e:
+            logger.warning(f"Error closing pooled Live session: {e}")
+
+
+@dataclass
+class LivePoolStats:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    connect_failures: int = 0
+
+
+class LiveSessionPool:
+    def __init__(
+            self,
+            connect: ConnectFn,
+            size: int = 2,
+            max_age: float = 480.0,
+            retry_delay: float = 5.0
+    ):
+        self.connect = connect
+        self.size = size
+        self.max_age = max_age
+        self.retry_delay = retry_delay
+        self.stats = LivePoolStats()
+        self._idle: Dict[str, Deque[PooledLiveSession]] = {}
+        self._configs: Dict[str, Tuple[str, LiveConnectConfig]] = {}
+        self._refill_tasks: Dict[str, asyncio.Task] = {}
+        self._wakeups: Dict[str, asyncio.Event] = {}
+        self._closing: set[asyncio.Task] = set()
+
+    async def _open(self, model: str, config: LiveConnectConfig) -> PooledLiveSession:
+        context = self.connect(model=model, config=config)
+        session = await context.__aenter__()
+        return PooledLiveSession(session=session, context=context)
+
+    def _take(self, key: str) -> Optional[PooledLiveSession]:
+        idle = self._idle.get(key)
+        while idle:
+            pooled = idle.popleft()
+            if pooled.age < self.max_age:
+                return pooled
+            self.stats.expired += 1
+            task = asyncio.create_task(pooled.close())
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        return None
+
+    @asynccontextmanager
+    async def acquire(self, model: str, config: LiveConnectConfig):
+        """
+        Yield a connected Live session for this model and config, pre-warmed when one is available.
+        The session is closed on exit; the pool refills itself in the background.
+        """
+        key = config_fingerprint(model, config)
+        if key not in self._configs:
+            self._configs[key] = (model, config)
+            self._idle[key] = deque()
+            self._wakeups[key] = asyncio.Event()
+            self._refill_tasks[key] = asyncio.create_task(self._refill(key))
+
+        pooled = self._take(key)
+        if pooled:
+            self.stats.hits += 1
+            logger.info(f"♻️ Using a pre-warmed Live session ({pooled.age:.1f}s old)")
+        else:
+            self.stats.misses += 1
+            pooled = await self._open(model, config)
+        self._wakeups[key].set()
+
+        try:
+            yield pooled.session
+        finally:
+            await pooled.close()
+
+    async def _refill(self, key: str) -> None:
+        model, config = self._configs[key]
+        idle = self._idle[key]
+        wakeup = self._wakeups[key]
+        while True:
+            # Close sessions that are too old to hand out
+            while idle and idle[0].age >= self.max_age:
+                self.stats.expired += 1
+                await idle.popleft().close()
+
+            if len(idle) < self.size:
+                try:
+                    idle.append(await self._open(model, config))
+                    continue
+                except Exception as e:
+                    self.stats.connect_failures += 1
+                    logger.warning(f"Could not pre-warm a Live session: {e}")
+                    delay = self.retry_delay
+            else:
+                delay = self.max_age - idle[0].age
+
+            wakeup.clear()
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=max(delay, 0.0))
+            except asyncio.TimeoutError:
+                pass
+
+    def snapshot(self) -> dict:
+        return {
+            "size": self.size,
+            "max_age": self.max_age,
+            "idle": {key: len(idle) for key, idle in self._idle.items()},
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "expired": self.stats.expired,
+            "connect_failures": self.stats.connect_failures,
+        }
+
+    async def close(self) -> None:
+        for task in self._refill_tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._refill_tasks.values(), return_exceptions=True)
+        self._refill_tasks.clear()
+        for idle in self._idle.values():
+            while idle:
+                await idle.popleft().close()
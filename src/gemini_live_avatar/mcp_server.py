@@ -1,11 +1,14 @@
 import asyncio
 import logging
 import json
+import time
+from dataclasses import dataclass
 from typing import Optional, Tuple, List, Dict
-from contextlib import AsyncExitStack
+from contextlib import AsyncExitStack, asynccontextmanager
 from pathlib import Path
 
 from mcp import ClientSession, StdioServerParameters
+from mcp import types as mcp_types
 from mcp.client.stdio import stdio_client
 from google.genai import types
 
@@ -13,17 +16,66 @@ logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 
+class MCPUnavailableError(RuntimeError):
+    """
+    Raised when the MCP pool has no healthy connection to lease.
+    """
+
+
+class MCPToolError(RuntimeError):
+    """
+    Raised when an MCP tool reports that its call failed.
+    """
+
+
+def load_server_params(config_path: str) -> StdioServerParameters:
+    """
+    Read the stdio server parameters from a JSON config file.
+    """
+    config = json.loads(Path(config_path).read_text())
+
+    command: str = config.get("command", "mcp-proxy")
+    args: List[str] = config.get("args", [])
+    env: Optional[Dict[str, str]] = config.get("env")
+
+    return StdioServerParameters(command=command, args=args, env=env)
+
+
+@dataclass
+class ToolEntry:
+    """A tool advertised by the MCP server, with its Gemini declaration"""
+    name: str
+    schema: Dict
+    declaration: types.FunctionDeclaration
+
+
+def to_function_declaration(tool: mcp_types.Tool) -> types.FunctionDeclaration:
+    return types.FunctionDeclaration(
+        name=tool.name,
+        description=tool.description,
+        parameters={
+            k: v
+            for k, v in (tool.inputSchema or {}).items()
+            if k not in ["additionalProperties", "$schema"]
+        },
+    )
+
+
 class MCPClient:
-    def __init__(self, server_params: Optional[StdioServerParameters] = None):
+    def __init__(self, server_params: Optional[StdioServerParameters] = None, tools_ttl: float = 300.0):
         self.server_params = server_params
+        self.tools_ttl = tools_ttl
         self._exit_stack: Optional[AsyncExitStack] = None
         self.session: Optional[ClientSession] = None
         self.stdio: Optional[asyncio.StreamReader] = None
         self.writer: Optional[asyncio.StreamWriter] = None
         self._connected: bool = False
+        self._tools: Optional[Dict[str, ToolEntry]] = None
+        self._tools_loaded_at: float = 0.0
+        self._tools_lock = asyncio.Lock()
 
     @classmethod
-    def from_json_config(cls, config_path: str) -> "MCPClient":
+    def from_json_config(cls, config_path: str, **kwargs) -> "MCPClient":
         """
         Create an MCPClient instance from a JSON config file.
 
@@ -33,14 +85,7 @@ class MCPClient:
         Returns:
             MCPClient: An initialized MCPClient with server_params.
         """
-        config = json.loads(Path(config_path).read_text())
-
-        command: str = config.get("command", "mcp-proxy")
-        args: List[str] = config.get("args", [])
-        env: Optional[Dict[str, str]] = config.get("env")
-
-        server_params = StdioServerParameters(command=command, args=args, env=env)
-        return cls(server_params=server_params)
+        return cls(server_params=load_server_params(config_path), **kwargs)
 
     async def connect_to_server(self):
         if self._connected:
@@ -57,13 +102,12 @@ class MCPClient:
             self.stdio, self.writer = stdio_transport
 
             self.session = await self._exit_stack.enter_async_context(
-                ClientSession(self.stdio, self.writer)
+                ClientSession(self.stdio, self.writer, message_handler=self._handle_message)
             )
             await self.session.initialize()
 
-            response = await self.session.list_tools()
-            tool_names = [tool.name for tool in response.tools]
-            logger.info("✅ Connected to server. Available tools: %s", tool_names)
+            tools = await self.refresh_tools()
+            logger.info("✅ Connected to server. Available tools: %s", list(tools))
 
             self._connected = True
         except Exception as e:
@@ -71,16 +115,54 @@ class MCPClient:
             await self.close()
             raise
 
-    async def get_tools_names(self) -> List[str]:
+    async def _handle_message(self, message) -> None:
+        notification = getattr(message, "root", message)
+        if isinstance(notification, mcp_types.ToolListChangedNotification):
+            logger.info("🔄 MCP server tool list changed, refreshing on next use.")
+            self.invalidate_tools()
+
+    def invalidate_tools(self) -> None:
+        self._tools = None
+
+    async def refresh_tools(self) -> Dict[str, ToolEntry]:
         """
-        Returns a list of tool names available in the MCP server.
+        Fetch the tool list from the server and rebuild the registry.
         """
         if not self.session:
             raise RuntimeError("Session is not initialized. Call connect_to_server() first.")
 
         response = await self.session.list_tools()
-        tool_names = [tool.name for tool in response.tools]
-        return tool_names
+        self._tools = {
+            tool.name: ToolEntry(
+                name=tool.name,
+                schema=tool.inputSchema or {},
+                declaration=to_function_declaration(tool)
+            )
+            for tool in response.tools
+        }
+        self._tools_loaded_at = time.monotonic()
+        return self._tools
+
+    async def get_tool_registry(self) -> Dict[str, ToolEntry]:
+        """
+        Returns the cached tool registry, refreshing it once it was invalidated or its TTL expired.
+        """
+        if self._tools is not None and time.monotonic() - self._tools_loaded_at < self.tools_ttl:
+            return self._tools
+        async with self._tools_lock:
+            # Another caller may have refreshed it while we waited
+            if self._tools is None or time.monotonic() - self._tools_loaded_at >= self.tools_ttl:
+                await self.refresh_tools()
+            return self._tools
+
+    async def has_tool(self, tool_name: str) -> bool:
+        return tool_name in await self.get_tool_registry()
+
+    async def get_tools_names(self) -> List[str]:
+        """
+        Returns a list of tool names available in the MCP server.
+        """
+        return list(await self.get_tool_registry())
 
     async def execute_tool(self, tool_name: str, tool_args: Dict) -> str:
         """
@@ -98,7 +180,11 @@ class MCPClient:
 
         try:
             response = await self.session.call_tool(tool_name, arguments=tool_args)
-            response_text =  response.content[0].text
+            response_text = response.content[0].text if response.content else ""
+            # ``isError`` in mcp 1.x, ``is_error`` from 2.0
+            if getattr(response, "isError", None) or getattr(response, "is_error", False):
+                # Raise so the failure reaches Gemini as an error and is never cached
+                raise MCPToolError(response_text or f"Tool '{tool_name}' failed")
             logger.info("✅ Successfully executed tool '%s'. Response: %s", tool_name, response_text)
             return response_text
         except Exception as e:
@@ -109,26 +195,10 @@ class MCPClient:
         """
         Returns tools in a format compatible with Gemini function calling.
         """
-        if not self.session:
-            raise RuntimeError("Session is not initialized. Call connect_to_server() first.")
-
-        mcp_tools = await self.session.list_tools()
-
+        registry = await self.get_tool_registry()
         gemini_tools = [
-            types.Tool(
-                function_declarations=[
-                    types.FunctionDeclaration(
-                        name=tool.name,
-                        description=tool.description,
-                        parameters={
-                            k: v
-                            for k, v in (tool.inputSchema or {}).items()
-                            if k not in ["additionalProperties", "$schema"]
-                        },
-                    )
-                ]
-            )
-            for tool in mcp_tools.tools
+            types.Tool(function_declarations=[entry.declaration])
+            for entry in registry.values()
         ]
 
         return gemini_tools
@@ -139,3 +209,201 @@ class MCPClient:
             self._exit_stack = None
             self._connected = False
             logger.info("🔌 Disconnected from server and cleaned up resources.")
+
+
+class _PooledConnection:
+    """
+    One MCP connection owned by its own task.
+
+    The stdio transport uses anyio cancel scopes, so it has to be opened and
+    closed by the same task; the runner task connects, health-checks with pings
+    and reconnects with exponential backoff until the pool stops it.
+    """
+
+    def __init__(self, pool: "MCPClientPool", index: int):
+        self.pool = pool
+        self.index = index
+        self.client: Optional[MCPClient] = None
+        self.inflight = 0
+        self.ready = asyncio.Event()
+        self.settled = asyncio.Event()  # set once the first connect attempt has finished, either way
+        self._stop = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    @property
+    def healthy(self) -> bool:
+        return self.ready.is_set()
+
+    async def _run(self):
+        backoff = self.pool.min_backoff
+        while not self._stop.is_set():
+            client = MCPClient(self.pool.server_params, tools_ttl=self.pool.tools_ttl)
+            try:
+                await client.connect_to_server()
+                self.client = client
+                self.ready.set()
+                self.settled.set()
+                backoff = self.pool.min_backoff
+                logger.info("🔗 MCP pool connection %d ready", self.index)
+                await self._monitor(client)
+            except Exception as e:
+                logger.error("❌ MCP pool connection %d failed: %s", self.index, e)
+            finally:
+                self.ready.clear()
+                self.settled.set()
+                try:
+                    await client.close()
+                except Exception as e:
+                    logger.warning("MCP pool connection %d did not close cleanly: %s", self.index, e)
+
+            if self._stop.is_set():
+                break
+            logger.info("🔁 Reconnecting MCP pool connection %d in %.1fs", self.index, backoff)
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=backoff)
+            except asyncio.TimeoutError:
+                pass
+            backoff = min(backoff * 2, self.pool.max_backoff)
+
+    async def _monitor(self, client: MCPClient):
+        while True:
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=self.pool.health_check_interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            await asyncio.wait_for(client.session.send_ping(), timeout=self.pool.ping_timeout)
+
+    async def stop(self):
+        self._stop.set()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+
+class MCPClientPool:
+    """
+    Process-wide pool of MCP connections shared by all avatar sessions.
+
+    Calls from many sessions are multiplexed onto at most ``max_size`` MCP
+    sessions; a new connection is only opened when every existing one is busy.
+    """
+
+    def __init__(
+            self,
+            server_params: StdioServerParameters,
+            max_size: int = 2,
+            health_check_interval: float = 30.0,
+            ping_timeout: float = 5.0,
+            connect_timeout: float = 30.0,
+            min_backoff: float = 1.0,
+            max_backoff: float = 30.0,
+            tools_ttl: float = 300.0
+    ):
+        self.server_params = server_params
+        self.tools_ttl = tools_ttl
+        self.max_size = max(1, max_size)
+        self.health_check_interval = health_check_interval
+        self.ping_timeout = ping_timeout
+        self.connect_timeout = connect_timeout
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self._connections: List[_PooledConnection] = []
+
+    @classmethod
+    def from_json_config(cls, config_path: str, **kwargs) -> "MCPClientPool":
+        return cls(server_params=load_server_params(config_path), **kwargs)
+
+    async def _pick(self) -> _PooledConnection:
+        healthy = [c for c in self._connections if c.healthy]
+        connecting = len(self._connections) - len(healthy)
+        least_busy = min(healthy, key=lambda c: c.inflight, default=None)
+
+        # Grow only when every live connection is busy and none is already on its way up
+        if (
+            (least_busy is None or least_busy.inflight > 0)
+            and not connecting
+            and len(self._connections) < self.max_size
+        ):
+            self._connections.append(_PooledConnection(self, len(self._connections)))
+        if least_busy is not None:
+            return least_busy
+
+        # Only wait for connections still on their first attempt; once the server is known
+        # to be down, fail fast and leave the reconnecting to the background runners
+        first_attempts = [c for c in self._connections if not c.settled.is_set()]
+        if first_attempts:
+            waiters = [asyncio.create_task(c.settled.wait()) for c in first_attempts]
+            try:
+                await asyncio.wait(waiters, timeout=self.connect_timeout, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for waiter in waiters:
+                    waiter.cancel()
+        connection = min((c for c in self._connections if c.healthy), key=lambda c: c.inflight, default=None)
+        if connection is None:
+            raise MCPUnavailableError("No MCP connection is available; the pool keeps reconnecting in the background.")
+        return connection
+
+    @asynccontextmanager
+    async def lease(self):
+        """
+        Borrow a connected MCPClient for the duration of one or more calls.
+        """
+        connection = await self._pick()
+        connection.inflight += 1
+        try:
+            yield connection.client
+        finally:
+            connection.inflight -= 1
+
+    async def get_tools_names(self) -> List[str]:
+        async with self.lease() as client:
+            return await client.get_tools_names()
+
+    async def has_tool(self, tool_name: str) -> bool:
+        async with self.lease() as client:
+            return await client.has_tool(tool_name)
+
+    async def execute_tool(self, tool_name: str, tool_args: Dict) -> str:
+        async with self.lease() as client:
+            return await client.execute_tool(tool_name, tool_args)
+
+    async def get_tools_for_gemini(self) -> List[types.Tool]:
+        async with self.lease() as client:
+            return await client.get_tools_for_gemini()
+
+    def snapshot(self) -> dict:
+        return {
+            "size": len(self._connections),
+            "max_size": self.max_size,
+            "healthy": sum(1 for c in self._connections if c.healthy),
+            "inflight": sum(c.inflight for c in self._connections),
+        }
+
+    async def close(self):
+        await asyncio.gather(*(c.stop() for c in self._connections))
+        self._connections.clear()
+        logger.info("🔌 Closed MCP connection pool.")
+
+
+class PooledMCPClient:
+    """
+    Per-session view of a shared MCPClientPool with the MCPClient call interface.
+    Closing it releases nothing, the pool's connections outlive the session.
+    """
+
+    def __init__(self, pool: MCPClientPool):
+        self.pool = pool
+
+    async def get_tools_names(self) -> List[str]:
+        return await self.pool.get_tools_names()
+
+    async def has_tool(self, tool_name: str) -> bool:
+        return await self.pool.has_tool(tool_name)
+
+    async def execute_tool(self, tool_name: str, tool_args: Dict) -> str:
+        return await self.pool.execute_tool(tool_name, tool_args)
+
+    async def get_tools_for_gemini(self) -> List[types.Tool]:
+        return await self.pool.get_tools_for_gemini()
+
+    async def close(self):
+        pass
@@ -0,0 +1,222 @@
+"""
+Lightweight metrics in the Prometheus text exposition format.
+
+Histograms and counters are updated in place, and gauges are
+callbacks evaluated only when /api/metrics is scraped, so collection costs a
+bisect and a few integer increments per observation and is safe to leave on.
+
+``TurnTimeline`` timestamps the stages of a single turn for the turn log line
+and the per-turn histograms.
+"""
+
+import logging
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+GaugeValue = Union[float, Dict[LabelValues, float]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, label_names: Tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = tuple(buckets)
+        self._series: Dict[LabelValues, List] = {}  # labels -> [bucket counts, sum, count]
+
+    def observe(self, value: float, *label_values: str) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[0][index] += 1
+        series[1] += value
+        series[2] += 1
+
+    @contextmanager
+    def time(self, *label_values: str) -> Iterator[None]:
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started_at, *label_values)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for label_values, (counts, total, count) in self._series.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.label_names, label_values, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, label_values, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for label_values, value in self._values.items():
+            lines.append(f"{self.name}{_format_labels(self.label_names, label_values)} {value}")
+        return lines
+
+
+class Gauge:
+    """
+    A gauge read from a callback at scrape time. The callback returns a number,
+    or a mapping of label values to numbers.
+    """
+
+    def __init__(self, name: str, documentation: str, collect: Callable[[], GaugeValue], label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.collect = collect
+        self.label_names = label_names
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        try:
+            value = self.collect()
+        except Exception as e:
+            logger.warning(f"Could not collect gauge {self.name}: {e}")
+            return lines
+        if isinstance(value, dict):
+            for label_values, sample in value.items():
+                lines.append(f"{self.name}{_format_labels(self.label_names, label_values)} {sample}")
+        else:
+            lines.append(f"{self.name} {value}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, Union[Histogram, Counter, Gauge]] = {}
+
+    def register(self, metric: Union[Histogram, Counter, Gauge]):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def histogram(self, name: str, documentation: str, label_names: Tuple[str, ...] = (), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, label_names, buckets))
+
+    def counter(self, name: str, documentation: str, label_names: Tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, collect: Callable[[], GaugeValue], label_names: Tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, collect, label_names))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+TIME_TO_FIRST_AUDIO = REGISTRY.histogram(
+    "gemini_avatar_time_to_first_audio_seconds",
+    "Seconds from the end of user input (the VAD gate closing or the client's end message) "
+    "to the first response audio sent to the browser; not observed without either signal.",
+)
+ALIGNMENT_SECONDS = REGISTRY.histogram(
+    "gemini_avatar_alignment_seconds",
+    "Seconds from queueing a lip-sync alignment to its word timings, cache hits excluded.",
+)
+ALIGNMENT_QUEUE_SECONDS = REGISTRY.histogram(
+    "gemini_avatar_alignment_queue_seconds",
+    "Seconds a lip-sync alignment job waited in the executor queue.",
+)
+TOOL_LATENCY = REGISTRY.histogram(
+    "gemini_avatar_tool_latency_seconds",
+    "Seconds spent executing a function call, by tool.",
+    label_names=("tool",),
+)
+LIPSYNC_TIER_TOTAL = REGISTRY.counter(
+    "gemini_avatar_lipsync_tier_total",
+    "Lip-sync alignments by the quality tier that produced them.",
+    label_names=("tier",),
+)
+INPUT_AUDIO_FRAMES = REGISTRY.counter(
+    "gemini_avatar_input_audio_frames_total",
+    "20 ms microphone frames seen by the VAD gate, by whether they were forwarded or dropped.",
+    label_names=("outcome",),
+)
+INPUT_VIDEO_FRAMES = REGISTRY.counter(
+    "gemini_avatar_input_video_frames_total",
+    "Camera frames from the browser, by whether they were forwarded, rate limited, near duplicates or replaced while waiting to be transcoded.",
+    label_names=("outcome",),
+)
+SEND_LATENCY = REGISTRY.histogram(
+    "gemini_avatar_websocket_send_seconds",
+    "Seconds to hand a message to the browser WebSocket, by message type.",
+    label_names=("type",),
+)
+
+
+class TurnTimeline:
+    """
+    Monotonic timestamps of the stages of one turn. Each stage keeps its first mark.
+    ``labels`` holds per-turn facts for the log line, such as the lip-sync tier.
+    """
+
+    __slots__ = ("marks", "labels")
+
+    def __init__(self):
+        self.marks: Dict[str, float] = {}
+        self.labels: Dict[str, str] = {}
+
+    def mark(self, stage: str) -> bool:
+        """Record ``stage`` unless it was already recorded; returns True on the first mark"""
+        if stage in self.marks:
+            return False
+        self.marks[stage] = time.monotonic()
+        return True
+
+    def mark_latest(self, stage: str) -> None:
+        """Record ``stage`` now, replacing an earlier mark"""
+        self.marks[stage] = time.monotonic()
+
+    def elapsed(self, start: str, end: str) -> Optional[float]:
+        if start in self.marks and end in self.marks:
+            return self.marks[end] - self.marks[start]
+        return None
+
+    def summary(self) -> Dict[str, int]:
+        """Milliseconds of each stage relative to the earliest one"""
+        if not self.marks:
+            return {}
+        origin = min(self.marks.values())
+        return {stage: round((at - origin) * 1000) for stage, at in sorted(self.marks.items(), key=lambda item: item[1])}
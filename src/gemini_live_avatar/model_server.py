@@ -0,0 +1,408 @@
+"""
+Shared lip-sync model server.
+
+One local process owns the lip-sync models and its own InferenceExecutor; every
+uvicorn worker talks to it over a Unix socket through RemoteInferenceExecutor,
+which mirrors the InferenceExecutor interface. Memory then grows with the
+number of inference workers instead of the number of HTTP workers.
+
+Messages on the socket are framed as::
+
+    +-----------------+----------------+-------------+----------+
+    | json length u32 | data length u32| JSON header | raw data |
+    +-----------------+----------------+-------------+----------+
+
+Requests carry an ``id`` so many of them can be in flight on one connection.
+A ``cancel`` message with the ``target`` id of an earlier request drops that
+job on the server; it gets no response.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import struct
+import subprocess
+import sys
+import threading
+import time
+from itertools import count
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import typer
+from typing_extensions import Annotated
+
+from gemini_live_avatar.inference import (
+    InferenceExecutor, LipSyncBusyError, LipSyncTimeoutError, ModelState
+)
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_HEADER = struct.Struct("!II")
+DEFAULT_SOCKET_PATH = "/tmp/gemini-live-avatar-lipsync.sock"
+
+
+async def read_message(reader: asyncio.StreamReader) -> Tuple[dict, bytes]:
+    json_length, data_length = MESSAGE_HEADER.unpack(await reader.readexactly(MESSAGE_HEADER.size))
+    header = json.loads(await reader.readexactly(json_length))
+    data = await reader.readexactly(data_length) if data_length else b""
+    return header, data
+
+
+def encode_message(header: dict, data: bytes = b"") -> bytes:
+    body = json.dumps(header).encode("utf-8")
+    return b"".join((MESSAGE_HEADER.pack(len(body), len(data)), body, data))
+
+
+class ModelServer:
+    """
+    Serves alignment requests from API workers on a Unix socket.
+    """
+
+    def __init__(self, executor: InferenceExecutor, socket_path: str = DEFAULT_SOCKET_PATH):
+        self.executor = executor
+        self.socket_path = socket_path
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def serve(self, warmup_languages: Optional[List[str]] = None) -> None:
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = await asyncio.start_unix_server(self._handle_connection, path=self.socket_path)
+        logger.info(f"🧠 Lip-sync model server listening on {self.socket_path}")
+        if warmup_languages:
+            await self.executor.warmup(warmup_languages)
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            await self.executor.close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        tasks: Dict[Any, asyncio.Task] = {}  # request id -> task
+        try:
+            while True:
+                header, data = await read_message(reader)
+                if header.get("op") == "cancel":
+                    task = tasks.get(header.get("target"))
+                    if task:
+                        task.cancel()
+                    continue
+                request_id = header.get("id")
+                task = asyncio.create_task(self._handle_request(writer, header, data))
+                tasks[request_id] = task
+                task.add_done_callback(lambda _, request_id=request_id: tasks.pop(request_id, None))
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            for task in list(tasks.values()):
+                task.cancel()
+            writer.close()
+
+    async def _handle_request(self, writer: asyncio.StreamWriter, header: dict, data: bytes) -> None:
+        request_id = header.get("id")
+        response = {"id": request_id}
+        try:
+            match header.get("op"):
+                case "align":
+                    response["result"] = await self.executor.submit(
+                        data,
+                        transcript=header.get("transcript"),
+                        language=header.get("language"),
+                        timeout=header.get("timeout"),
+                        fast=header.get("fast", False)
+                    )
+                case "warmup":
+                    await self.executor.warmup(header.get("languages", []))
+                    response["result"] = self.executor.snapshot()
+                case "status":
+                    response["result"] = self.executor.snapshot()
+                case op:
+                    raise ValueError(f"Unknown operation: {op}")
+        except LipSyncBusyError as e:
+            response.update(error=str(e), error_type="busy")
+        except LipSyncTimeoutError as e:
+            response.update(error=str(e), error_type="timeout")
+        except Exception as e:
+            response.update(error=str(e), error_type="error")
+
+        # Lets clients see the server's load without polling "status"
+        response["load"] = {"queue_depth": self.executor.queue_depth, "running": self.executor.running}
+        writer.write(encode_message(response))
+        await writer.drain()
+
+
+class RemoteInferenceExecutor:
+    """
+    InferenceExecutor stand-in that forwards jobs to a ModelServer.
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, timeout: float = 30.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.model_state = ModelState.UNLOADED
+        self.model_error: Optional[str] = None
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._connect_lock = asyncio.Lock()
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = count()
+        self._last_snapshot: dict = {}
+        self._in_flight = 0  # align requests sent by this client and not answered yet
+        self._server_load = {"queue_depth": 0, "running": 0}  # as of the last response
+
+    @property
+    def is_ready(self) -> bool:
+        return self.model_state == ModelState.READY
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Jobs waiting on the server: the last reported depth, or more when this
+        client has more requests outstanding than the server reported running,
+        since reports stop arriving while the server is slow to answer.
+        """
+        return max(self._server_load["queue_depth"], self._in_flight - self._server_load["running"], 0)
+
+    @property
+    def running(self) -> int:
+        return min(self._server_load["running"], self._in_flight) if self._in_flight else 0
+
+    async def _ensure_connected(self) -> None:
+        async with self._connect_lock:
+            if self._writer and not self._writer.is_closing():
+                return
+            self._reader, self._writer = await asyncio.open_unix_connection(self.socket_path)
+            self._reader_task = asyncio.create_task(self._read_responses())
+
+    async def _read_responses(self) -> None:
+        try:
+            while True:
+                header, _ = await read_message(self._reader)
+                if "load" in header:
+                    self._server_load = header["load"]
+                future = self._pending.pop(header.get("id"), None)
+                if future and not future.done():
+                    future.set_result(header)
+        except (asyncio.IncompleteReadError, ConnectionResetError) as e:
+            logger.warning(f"Lost connection to the lip-sync model server: {e}")
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Lip-sync model server connection closed"))
+            self._pending.clear()
+            if self._writer:
+                self._writer.close()
+            self._writer = None
+
+    async def _request(self, header: dict, data: bytes = b"", timeout: Optional[float] = None) -> dict:
+        await self._ensure_connected()
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._writer.write(encode_message({**header, "id": request_id}, data))
+        try:
+            await self._writer.drain()
+            response = await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            self._cancel_remote(request_id)
+            raise LipSyncTimeoutError("Lip-sync model server did not answer in time")
+        except asyncio.CancelledError:
+            self._cancel_remote(request_id)
+            raise
+        finally:
+            self._pending.pop(request_id, None)
+
+        match response.get("error_type"):
+            case None:
+                return response.get("result")
+            case "busy":
+                raise LipSyncBusyError(response["error"])
+            case "timeout":
+                raise LipSyncTimeoutError(response["error"])
+            case _:
+                raise RuntimeError(response["error"])
+
+    def _cancel_remote(self, request_id: int) -> None:
+        """
+        Tell the server to drop a request this client stopped waiting for.
+        """
+        if self._writer and not self._writer.is_closing():
+            self._writer.write(encode_message({"op": "cancel", "target": request_id}))
+
+    async def submit(
+            self,
+            pcm: bytes,
+            transcript: Optional[str] = None,
+            language: Optional[str] = None,
+            timeout: Optional[float] = None,
+            on_start: Optional[Callable[[], Any]] = None,
+            fast: bool = False
+    ) -> dict:
+        # The server doesn't report when a job starts, so ``on_start`` is not called
+        timeout = timeout or self.timeout
+        self._in_flight += 1
+        try:
+            result = await self._request(
+                {"op": "align", "transcript": transcript, "language": language, "timeout": timeout, "fast": fast},
+                pcm,
+                # leave the server a moment to report its own deadline first
+                timeout=timeout + 1.0
+            )
+        finally:
+            self._in_flight -= 1
+        self.model_state = ModelState.READY
+        return result
+
+    async def warmup(self, languages: List[str], connect_timeout: float = 60.0, warmup_timeout: float = 600.0) -> None:
+        self.model_state = ModelState.LOADING
+        try:
+            # the supervised server may still be starting up
+            deadline = time.monotonic() + connect_timeout
+            while True:
+                try:
+                    await self._ensure_connected()
+                    break
+                except OSError:
+                    if time.monotonic() > deadline:
+                        raise
+                    await asyncio.sleep(1.0)
+            self._last_snapshot = await self._request({"op": "warmup", "languages": languages}, timeout=warmup_timeout)
+        except Exception as e:
+            logger.exception("Lip-sync model server warmup failed")
+            self.model_state = ModelState.FAILED
+            self.model_error = str(e)
+            return
+        self.model_state = self._last_snapshot.get("model_state", ModelState.READY)
+        self.model_error = None
+
+    def snapshot(self) -> dict:
+        return {
+            "socket": self.socket_path,
+            "model_state": self.model_state,
+            "queue_depth": self.queue_depth,
+            "running": self.running,
+            "in_flight": self._in_flight,
+            "server": self._last_snapshot,
+        }
+
+    async def close(self) -> None:
+        if self._reader_task:
+            self._reader_task.cancel()
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+            self._reader_task = None
+
+
+class ModelServerSupervisor:
+    """
+    Runs the model server as a child process and restarts it when it exits.
+    """
+
+    def __init__(self, args: List[str], max_backoff: float = 30.0):
+        self.args = args
+        self.max_backoff = max_backoff
+        self._process: Optional[subprocess.Popen] = None
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._supervise, name="lipsync-model-server", daemon=True)
+        self._thread.start()
+
+    def _supervise(self) -> None:
+        backoff = 1.0
+        while not self._stopping.is_set():
+            started_at = time.monotonic()
+            logging.info(f"Starting lip-sync model server: {' '.join(self.args)}")
+            self._process = subprocess.Popen(self.args)
+            exit_code = self._process.wait()
+            if self._stopping.is_set():
+                return
+            # a server that stayed up for a while gets a fresh backoff
+            backoff = 1.0 if time.monotonic() - started_at > 60 else min(backoff * 2, self.max_backoff)
+            logging.warning(f"Lip-sync model server exited with code {exit_code}, restarting in {backoff:.0f}s")
+            self._stopping.wait(backoff)
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._process and self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+
+
+def model_server_command(
+        socket_path: str,
+        workers: int,
+        queue_size: int,
+        timeout: float,
+        torch_threads: int,
+        model_size: str,
+        compute_type: str,
+        batch_window_ms: int,
+        max_batch_size: int,
+        warmup_language: Optional[str] = None,
+        fast_model_size: Optional[str] = None,
+        fast_compute_type: str = "int8"
+) -> List[str]:
+    """
+    Command line that starts a model server with the given executor settings.
+    """
+    args = [
+        sys.executable, "-m", "gemini_live_avatar.model_server",
+        "--socket", socket_path,
+        "--workers", str(workers),
+        "--queue-size", str(queue_size),
+        "--timeout", str(timeout),
+        "--torch-threads", str(torch_threads),
+        "--model-size", model_size,
+        "--compute-type", compute_type,
+        "--batch-window-ms", str(batch_window_ms),
+        "--max-batch-size", str(max_batch_size),
+    ]
+    if warmup_language:
+        args += ["--warmup-language", warmup_language]
+    if fast_model_size:
+        args += ["--fast-model-size", fast_model_size, "--fast-compute-type", fast_compute_type]
+    return args
+
+
+def main(
+    socket_path: Annotated[str, typer.Option("--socket", help="Unix socket to listen on")] = DEFAULT_SOCKET_PATH,
+    workers: Annotated[int, typer.Option("--workers", help="Lip-sync worker processes")] = 1,
+    queue_size: Annotated[int, typer.Option("--queue-size", help="Maximum pending lip-sync jobs")] = 64,
+    timeout: Annotated[float, typer.Option("--timeout", help="Seconds a lip-sync job may wait and run")] = 30.0,
+    torch_threads: Annotated[int, typer.Option("--torch-threads", help="torch threads per worker")] = 0,
+    model_size: Annotated[str, typer.Option("--model-size", help="Whisper model size")] = "small",
+    compute_type: Annotated[str, typer.Option("--compute-type", help="Whisper compute type")] = "float32",
+    batch_window_ms: Annotated[int, typer.Option("--batch-window-ms", help="Micro-batching window (0 disables)")] = 0,
+    max_batch_size: Annotated[int, typer.Option("--max-batch-size", help="Maximum jobs per batch")] = 8,
+    warmup_language: Annotated[Optional[str], typer.Option("--warmup-language", help="Warm up the models for this language")] = None,
+    fast_model_size: Annotated[Optional[str], typer.Option("--fast-model-size", help="Fallback Whisper model for jobs marked fast")] = None,
+    fast_compute_type: Annotated[str, typer.Option("--fast-compute-type", help="Compute type of the fallback model")] = "int8",
+) -> None:
+    """
+    Run the shared lip-sync model server.
+    """
+    executor = InferenceExecutor(
+        workers=workers,
+        queue_size=queue_size,
+        timeout=timeout,
+        torch_threads=torch_threads,
+        model_size=model_size,
+        compute_type=compute_type,
+        batch_window=batch_window_ms / 1000,
+        max_batch_size=max_batch_size,
+        fast_model_size=fast_model_size,
+        fast_compute_type=fast_compute_type
+    )
+    server = ModelServer(executor, socket_path)
+    asyncio.run(server.serve([warmup_language] if warmup_language else None))
+
+
+if __name__ == "__main__":
+    typer.run(main)
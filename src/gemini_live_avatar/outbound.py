@@ -0,0 +1,84 @@
+"""
+Outbound message coalescing.
+
+In text mode Gemini streams many tiny text deltas, and sending each one as its
+own WebSocket frame costs a JSON encode and a frame per delta. ``TextCoalescer``
+holds deltas back for a short window (or until enough text has built up) and
+sends them as one ``text`` message. Every other message for the session goes
+through ``send``, which flushes the held text first, so the browser sees the
+same order as before.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SendFn = Callable[[dict], Awaitable[None]]
+
+
+class TextCoalescer:
+    def __init__(self, send: SendFn, flush_interval: float = 0.04, max_chars: int = 1024):
+        self._send = send
+        self.flush_interval = flush_interval
+        self.max_chars = max_chars
+        self._parts: List[str] = []
+        self._size = 0
+        self._timer: Optional[asyncio.Task] = None  # pending delayed flush, None once it starts sending
+        self._lock = asyncio.Lock()  # keeps delayed and direct sends in call order
+
+    async def add(self, text: str) -> None:
+        """
+        Queue a text delta; it is sent when the window closes or the size limit is reached.
+        """
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.max_chars:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def flush(self) -> None:
+        self._cancel_timer()
+        async with self._lock:
+            await self._send_pending()
+
+    async def send(self, message: dict) -> None:
+        """
+        Send a message right away, after any text still held back.
+        """
+        self._cancel_timer()
+        async with self._lock:
+            await self._send_pending()
+            await self._send(message)
+
+    def close(self) -> None:
+        """
+        Drop held text and the pending flush, for when the socket is gone.
+        """
+        self._cancel_timer()
+        self._parts.clear()
+        self._size = 0
+
+    async def _send_pending(self) -> None:
+        if not self._parts:
+            return
+        text = "".join(self._parts)
+        self._parts.clear()
+        self._size = 0
+        await self._send({"type": "text", "data": text})
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        self._timer = None
+        try:
+            async with self._lock:
+                await self._send_pending()
+        except Exception as e:
+            logger.warning(f"Could not send coalesced text: {e}")
+
+    def _cancel_timer(self) -> None:
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
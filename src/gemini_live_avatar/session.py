@@ -16,13 +16,17 @@
 Session management for Gemini Multimodal Live Proxy Server
 """
 
-from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Coroutine, Dict, Any, Optional, Union
 import asyncio
 
 from google.genai.live import AsyncSession
 
-from gemini_live_avatar.mcp_server import MCPClient
+from gemini_live_avatar.mcp_server import MCPClient, PooledMCPClient
+from gemini_live_avatar.metrics import TurnTimeline
+
+MAX_PENDING_INPUT = 500  # Realtime inputs kept while the Live session reconnects, oldest dropped first
 
 
 @dataclass
@@ -33,8 +37,47 @@ class SessionState:
     current_tool_execution: Optional[asyncio.Task] = None
     current_audio_stream: Optional[Any] = None
     live_session: Optional[AsyncSession] = None
-    mcp_server_client: Optional[MCPClient] = None
+    mcp_server_client: Optional[Union[MCPClient, PooledMCPClient]] = None
     received_model_response: bool = False  # Track if we've received a model response in current turn
+    binary_frames: bool = False  # Media is exchanged as binary frames instead of base64 JSON
+    audio_buffer: bytearray = field(default_factory=bytearray)  # 24 kHz PCM of the current audio turn
+    turn_transcript: list[str] = field(default_factory=list)  # Gemini output transcription for the current turn
+    aligner: Optional[Any] = None  # StreamingAligner for the current turn when segment-wise lip-sync is on
+    viseme_analyzer: Optional[Any] = None  # VisemeAnalyzer of the model-free lip-sync backend
+    text_coalescer: Optional[Any] = None  # TextCoalescer merging outbound text deltas in text mode
+    audio_ingest: Optional[Any] = None  # AudioIngest gating and regrouping microphone audio
+    input_flush_handle: Optional[asyncio.TimerHandle] = None  # Sends a partly filled audio frame when input pauses
+    input_audio_lock: asyncio.Lock = field(default_factory=asyncio.Lock)  # Keeps upstream microphone audio in order
+    video_ingest: Optional[Any] = None  # VideoIngest rate limiting and de-duplicating camera frames
+    frame_transcoder: Optional[Any] = None  # FrameTranscoder shrinking camera frames before they are sent
+    background_tasks: set[asyncio.Task] = field(default_factory=set)
+    tool_executor: Optional[Any] = None  # ToolExecutor running this session's function calls
+    resumption_handle: Optional[str] = None  # Latest Live session resumption handle
+    live_connected: asyncio.Event = field(default_factory=asyncio.Event)  # Set while a Live session is usable
+    pending_input: deque = field(default_factory=lambda: deque(maxlen=MAX_PENDING_INPUT))  # Input buffered during a reconnect
+    pending_tool_responses: list = field(default_factory=list)  # Function responses finished during a reconnect
+    timeline: TurnTimeline = field(default_factory=TurnTimeline)  # Stage timestamps of the current turn
+
+    def next_turn_timeline(self) -> TurnTimeline:
+        """Close the current turn's timeline and start a fresh one"""
+        timeline, self.timeline = self.timeline, TurnTimeline()
+        timeline.mark("turn_complete")
+        return timeline
+
+    def create_background_task(self, coro: Coroutine) -> asyncio.Task:
+        """Run a coroutine tied to this session's lifetime"""
+        task = asyncio.create_task(coro)
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+        return task
+
+    async def cancel_background_tasks(self) -> None:
+        """Cancel and await every pending background task"""
+        tasks = list(self.background_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.background_tasks.clear()
 
 # Global session storage
 active_sessions: Dict[str, SessionState] = {}
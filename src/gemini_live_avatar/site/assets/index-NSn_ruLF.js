@@ -0,0 +1,51 @@
+class I{constructor(e){this.videoElement=e??null,this.currentStream=null,this.isWebcamActive=!1,this.isScreenActive=!1,this.frameCapture=null,this.frameCallback=null,this.usingFrontCamera=!0}async startWebcam(e=!0){try{let t=await navigator.mediaDevices.getUserMedia({video:{width:1280,height:720,facingMode:e?"user":"environment"}});return this.handleNewStream(t),this.isWebcamActive=!0,this.usingFrontCamera=e,this.dispatch("stream-start",{source:"webcam"}),!0}catch(t){return console.error("Error accessing webcam:",t),!1}}async startScreenShare(){try{let e=await navigator.mediaDevices.getDisplayMedia({video:!0});return this.handleNewStream(e),this.isScreenActive=!0,e.getVideoTracks()[0].addEventListener("ended",()=>{this.stopAll()}),this.dispatch("stream-start",{source:"screen"}),!0}catch(e){return console.error("Error sharing screen:",e),!1}}async switchCamera(){if(!this.isWebcamActive)return!1;let e=!this.usingFrontCamera;await this.stopAll();let t=await this.startWebcam(e);if(t&&this.frameCallback)this.startFrameCapture(this.frameCallback);return t}handleNewStream(e){if(this.currentStream)this.stopAll();if(this.currentStream=e,this.videoElement)this.videoElement.srcObject=e,this.videoElement.classList.remove("hidden")}stopAll(){if(this.currentStream)this.currentStream.getTracks().forEach((e)=>e.stop()),this.currentStream=null;if(this.videoElement)this.videoElement.srcObject=null,this.videoElement.classList.add("hidden");if(this.isWebcamActive||this.isScreenActive)this.dispatch("stream-stop");this.isWebcamActive=!1,this.isScreenActive=!1,this.stopFrameCapture()}startFrameCapture(e){this.frameCallback=e;let t=()=>{if(!this.currentStream||!this.videoElement)return;let n=document.createElement("canvas"),s=n.getContext("2d");n.width=this.videoElement.videoWidth,n.height=this.videoElement.videoHeight,s.drawImage(this.videoElement,0,0,n.width,n.height),n.toBlob(async(a)=>{if(a&&this.frameCallback)this.frameCallback(await a.arrayBuffer())},"image/jpeg",0.8)};this.frameCapture=setInterval(t,1000)}stopFrameCapture(){if(this.frameCapture)clearInterval(this.frameCapture),this.frameCapture=null}dispatch(e,t={}){window.dispatchEvent(new CustomEvent(e,{detail:t}))}}import{TalkingHead as oe}from"talkinghead";function ae(e){let n={morphTargets:"ARKit,Oculus+Visemes,mouthOpen,mouthSmile,eyesClosed,eyesLookUp,eyesLookDown",textureSizeLimit:"1024",textureFormat:"png"};try{let s=new URL(e);if(!s.hostname.includes("models.readyplayer.me"))return console.warn("❌ Not a valid Ready Player Me URL."),null;return Object.entries(n).forEach(([a,l])=>{if(!s.searchParams.has(a))s.searchParams.set(a,l)}),s.toString()}catch(s){return console.error("⚠️ Invalid URL provided:",s.message),null}}class P{constructor(e,t={}){this.nodeAvatar=e,this.config=t,this.head=null,this.isStreaming=!1,this.turnAudioMs=0,this.turnEnded=!1,this.playbackDrained=!1,this.onTranscript=(n)=>{},this.onLoading=(n,s)=>{console.log(`Avatar loading: ${n}`,s?`Progress: ${s.percent}%`:"")}}async load(){let{ttsApikey:e,lipsyncModules:t=["en"],cameraView:n="upper",lightAmbientIntensity:s=1,avatarPath:a="https://models.readyplayer.me/64bfa15f0e72c63d7c3934a6.glb",body:l="F",avatarMood:h="neutral",ttsLang:u,ttsVoice:i,lipsyncLang:o="en"}=this.config;this.onLoading("start");try{this.head=new oe(this.nodeAvatar,{ttsEndpoint:"https://texttospeech.googleapis.com/v1beta1/text:synthesize",ttsApikey:e,lipsyncModules:t,cameraView:n,lightAmbientIntensity:s,modelFPS:60}),await this.head.showAvatar({url:ae(a),body:l,avatarMood:h,ttsLang:u,ttsVoice:i,lipsyncLang:o},(r)=>{if(r.lengthComputable){let m=Math.min(100,Math.round(r.loaded/r.total*100));this.onLoading("progress",{percent:m})}}),this.onLoading("complete")}catch(r){console.error("❌ Failed to load avatar:",r),this.onLoading("error",{error:r})}}speakText(e){this.head?.speakText(e)}async speakAudio(e,t={}){try{if(console.log("\uD83C\uDFA4 Avatar speaking audio data:",e),!this.isStreaming)console.log("Starting audio stream..."),await this.head.streamStart({sampleRate:24000,mood:"happy",lipsyncType:t.visemes?"visemes":"words",gain:3},()=>{console.log("Audio playback started.")},()=>{console.log("Audio playback ended."),this.isStreaming=!1,this.playbackDrained=!0},(n)=>{if(console.log("subtitleText: ",n),n)this.onTranscript(n)});if(this.turnEnded)this.resetTurn();this.playbackDrained=!1,this.turnAudioMs+=e.length/24000*1000,this.head.streamAudio({audio:e,words:t.words,wtimes:t.wtimes||[],wdurations:t.wdurations||[],...t.visemes?{visemes:t.visemes,vtimes:t.vtimes,vdurations:t.vdurations}:{}})}catch(n){console.error("❌ Error speaking audio data:",n)}}applyWords(e){if(!this.head||!e?.words?.length)return;if(this.playbackDrained){console.log("Dropping word timings for audio that already played.");return}let t=this.turnAudioMs;this.head.streamAudio({audio:new Int16Array(0),words:e.words,wtimes:e.wtimes.map((n)=>n-t),wdurations:e.wdurations})}endTurn(){this.turnEnded=!0}resetTurn(){this.turnAudioMs=0,this.turnEnded=!1}playGesture(e,t=3){if(!this.head){console.error("❌ Avatar not loaded, cannot play gesture.");return}this.head.playGesture(e,t)}setLighting(e){if(!this.head){console.error("❌ Avatar not loaded, cannot set lighting.");return}this.head.setLighting(e)}}var G={AUDIO:1,IMAGE:2};function ce(e){let t="",n=new Uint8Array(e);for(let s=0;s<n.byteLength;s++)t+=String.fromCharCode(n[s]);return window.btoa(t)}function le(e,t){let n=new Uint8Array(t),s=new Uint8Array(5+n.byteLength),a=new DataView(s.buffer);return a.setUint8(0,e),a.setUint32(1,0),s.set(n,5),s.buffer}function de(e){let t=new DataView(e),n=t.getUint8(0),s=t.getUint32(1),a=5+s,l=s?JSON.parse(new TextDecoder().decode(new Uint8Array(e,5,s))):null;return{kind:n,metadata:l,payload:e.slice(a)}}class _{constructor(e=null){if(!e)throw Error("WebSocket endpoint is required.");this.endpoint=e,this.ws=null,this.isSpeaking=!1,this.binaryFrames=!1,this.shouldReconnect=!0,this.reconnectDelay=1000,this.maxRetries=5,this.retryCount=0,this.reconnectTimeout=null,this.onReady=()=>{},this.onError=(t)=>console.error("WebSocket error:",t),this.onClose=()=>console.warn("WebSocket connection closed."),this.onMessage=(t)=>this._defaultMessageHandler(t),this.onMessageParsed=()=>{},this.onTurnComplete=()=>{},this.onFunctionCall=()=>{},this.onFunctionResponse=()=>{},this.onInterrupted=()=>{},this.onAudioData=()=>{},this.onAudioWords=()=>{},this.onTextContent=()=>{},this.connect()}connect(){console.log(`\uD83C\uDF10 Connecting to ${this.endpoint}`),this.ws=new WebSocket(this.endpoint),this.ws.binaryType="arraybuffer",this.binaryFrames=!1,this.ws.onopen=()=>{console.log("✅ WebSocket connected."),this.retryCount=0,this.reconnectDelay=1000,this.onReady()},this.ws.onerror=(e)=>{console.error("❌ WebSocket error:",e),this.onError(e)},this.ws.onclose=(e)=>{if(console.warn("\uD83D\uDD0C WebSocket closed:",e.reason||e.code),this.onClose(e),this.shouldReconnect&&this.retryCount<this.maxRetries)this.retryCount++,this.reconnectTimeout=setTimeout(()=>{console.log(`\uD83D\uDD01 Attempting to reconnect... (try ${this.retryCount})`),this.connect(),this.reconnectDelay*=2},this.reconnectDelay);else if(this.retryCount>=this.maxRetries)console.error("\uD83D\uDEAB Max reconnection attempts reached. Giving up.")},this.ws.onmessage=this.onMessage}_handleBinaryFrame(e){let{kind:t,metadata:n,payload:s}=de(e);if(t===G.AUDIO)this.onAudioData({audio:s,...n||{}});else console.log("Received unknown frame kind:",t)}_defaultMessageHandler(e){try{if(e.data instanceof ArrayBuffer){this._handleBinaryFrame(e.data);return}let t=JSON.parse(e.data);if(this.onMessageParsed(t),t.type==="config"){if(t.framing?.includes("binary"))this.sendMessage({type:"config",data:{framing:"binary"}})}else if(t.type==="config_ack")this.binaryFrames=t.data?.framing==="binary";else if(t.type==="interrupted")this.isSpeaking=!1,this.onInterrupted(t?.data);else if(t.type==="audio")this.onAudioData(t?.data);else if(t.type==="audio_words")this.onAudioWords(t?.data);else if(t.type==="text")this.onTextContent(t?.data);else if(t.type==="turn_complete")this.onTurnComplete();else if(t.type==="function_call")this.onFunctionCall(t?.data);else if(t.type==="function_response")this.onFunctionResponse(t?.data);else console.log("Received unknown message type:",t.type)}catch(t){console.error("❌ Parsing error:",t),this.onError({message:`Error parsing response: ${t.message}`,error_type:"client_error"})}}sendMessage(e){if(this.ws.readyState===WebSocket.OPEN)console.log(`\uD83D\uDE80 Sending message [${e.type}]`),this.ws.send(JSON.stringify(e));else{let t=this.ws.readyState,n=["CONNECTING","OPEN","CLOSING","CLOSED"];this.onError(`WebSocket is not open (State: ${n[t]||"UNKNOWN"})`)}}async ensureConnected(){if(this.ws.readyState===WebSocket.OPEN)return;return new Promise((e,t)=>{let n=setTimeout(()=>t(Error("Timeout")),5000),s=()=>{clearTimeout(n),l(),e()},a=(h)=>{clearTimeout(n),l(),t(h)},l=()=>{this.ws.removeEventListener("open",s),this.ws.removeEventListener("error",a)};this.ws.addEventListener("open",s),this.ws.addEventListener("error",a)})}disconnect(){if(this.shouldReconnect=!1,clearTimeout(this.reconnectTimeout),this.ws)console.log("\uD83D\uDD0C Manually disconnecting..."),this.ws.close()}sendMedia(e,t,n){if(this.binaryFrames&&this.ws.readyState===WebSocket.OPEN)this.ws.send(le(t,n));else this.sendMessage({type:e,data:ce(n)})}sendAudioChunk(e){this.sendMedia("audio",G.AUDIO,e)}sendImage(e){this.sendMedia("image",G.IMAGE,e)}sendTextMessage(e){this.sendMessage({type:"text",data:e})}sendEndMessage(){this.sendMessage({type:"end"})}}var K={exports:{}};(function(e){var t=Object.prototype.hasOwnProperty,n="~";function s(){}Object.create&&(s.prototype=Object.create(null),new s().__proto__||(n=!1));function a(i,o,r){this.fn=i,this.context=o,this.once=r||!1}function l(i,o,r,m,v){if(typeof r!="function")throw TypeError("The listener must be a function");var f=new a(r,m||i,v),p=n?n+o:o;return i._events[p]?i._events[p].fn?i._events[p]=[i._events[p],f]:i._events[p].push(f):(i._events[p]=f,i._eventsCount++),i}function h(i,o){--i._eventsCount===0?i._events=new s:delete i._events[o]}function u(){this._events=new s,this._eventsCount=0}u.prototype.eventNames=function(){var i=[],o,r;if(this._eventsCount===0)return i;for(r in o=this._events)t.call(o,r)&&i.push(n?r.slice(1):r);return Object.getOwnPropertySymbols?i.concat(Object.getOwnPropertySymbols(o)):i},u.prototype.listeners=function(i){var o=n?n+i:i,r=this._events[o];if(!r)return[];if(r.fn)return[r.fn];for(var m=0,v=r.length,f=Array(v);m<v;m++)f[m]=r[m].fn;return f},u.prototype.listenerCount=function(i){var o=n?n+i:i,r=this._events[o];return r?r.fn?1:r.length:0},u.prototype.emit=function(i,o,r,m,v,f){var p=n?n+i:i;if(!this._events[p])return!1;var c=this._events[p],A=arguments.length,x,d;if(c.fn){switch(c.once&&this.removeListener(i,c.fn,void 0,!0),A){case 1:return c.fn.call(c.context),!0;case 2:return c.fn.call(c.context,o),!0;case 3:return c.fn.call(c.context,o,r),!0;case 4:return c.fn.call(c.context,o,r,m),!0;case 5:return c.fn.call(c.context,o,r,m,v),!0;case 6:return c.fn.call(c.context,o,r,m,v,f),!0}for(d=1,x=Array(A-1);d<A;d++)x[d-1]=arguments[d];c.fn.apply(c.context,x)}else{var re=c.length,S;for(d=0;d<re;d++)switch(c[d].once&&this.removeListener(i,c[d].fn,void 0,!0),A){case 1:c[d].fn.call(c[d].context);break;case 2:c[d].fn.call(c[d].context,o);break;case 3:c[d].fn.call(c[d].context,o,r);break;case 4:c[d].fn.call(c[d].context,o,r,m);break;default:if(!x)for(S=1,x=Array(A-1);S<A;S++)x[S-1]=arguments[S];c[d].fn.apply(c[d].context,x)}}return!0},u.prototype.on=function(i,o,r){return l(this,i,o,r,!1)},u.prototype.once=function(i,o,r){return l(this,i,o,r,!0)},u.prototype.removeListener=function(i,o,r,m){var v=n?n+i:i;if(!this._events[v])return this;if(!o)return h(this,v),this;var f=this._events[v];if(f.fn)f.fn===o&&(!m||f.once)&&(!r||f.context===r)&&h(this,v);else{for(var p=0,c=[],A=f.length;p<A;p++)(f[p].fn!==o||m&&!f[p].once||r&&f[p].context!==r)&&c.push(f[p]);c.length?this._events[v]=c.length===1?c[0]:c:h(this,v)}return this},u.prototype.removeAllListeners=function(i){var o;return i?(o=n?n+i:i,this._events[o]&&h(this,o)):(this._events=new s,this._eventsCount=0),this},u.prototype.off=u.prototype.removeListener,u.prototype.addListener=u.prototype.on,u.prefixed=n,u.EventEmitter=u,e.exports=u})(K);var q=K.exports;var R=new Map;function X(e,t){let n=new Blob([`${t}`],{type:"application/javascript"});return URL.createObjectURL(n)}var Y=`
+class AudioProcessingWorklet extends AudioWorkletProcessor {
+  // send and clear buffer every 2048 samples, 
+  // which at 16khz is about 8 times a second
+  buffer = new Int16Array(2048);
+
+  // current write index
+  bufferWriteIndex = 0;
+
+  constructor() {
+    super();
+  }
+
+  process(inputs) {
+    if (inputs[0].length) {
+      const channel0 = inputs[0][0];
+      this.processChunk(channel0);
+    }
+    return true;
+  }
+
+  sendAndClearBuffer() {
+    this.port.postMessage({
+      event: "chunk",
+      data: {
+        int16arrayBuffer: this.buffer.slice(0, this.bufferWriteIndex).buffer,
+      },
+    });
+    this.bufferWriteIndex = 0;
+  }
+
+  processChunk(float32Array) {
+    const l = float32Array.length;
+    
+    for (let i = 0; i < l; i++) {
+      // convert float32 -1 to 1 to int16 -32768 to 32767
+      const int16Value = float32Array[i] * 32768;
+      this.buffer[this.bufferWriteIndex++] = int16Value;
+      if(this.bufferWriteIndex >= this.buffer.length) {
+        this.sendAndClearBuffer();
+      }
+    }
+
+    if(this.bufferWriteIndex >= this.buffer.length) {
+      this.sendAndClearBuffer();
+    }
+  }
+}
+
+registerProcessor('audio-recorder-worklet', AudioProcessingWorklet);
+`;async function he({sampleRate:e}){let t=new(window.AudioContext||window.webkitAudioContext)({sampleRate:e});return await t.resume(),t}class W extends q{constructor(){super();this.sampleRate=16000,this.stream=void 0,this.audioContext=void 0,this.source=void 0,this.recording=!1,this.recordingWorklet=void 0,this.starting=null,this.isMuted=!1}async start(){if(!navigator.mediaDevices||!navigator.mediaDevices.getUserMedia)throw Error("Could not request user media");this.starting=new Promise(async(e,t)=>{this.stream=await navigator.mediaDevices.getUserMedia({audio:!0}),this.audioContext=await he({sampleRate:this.sampleRate}),this.source=this.audioContext.createMediaStreamSource(this.stream);let n="audio-recorder-worklet",s=Y;if(!R.has(this.audioContext))R.set(this.audioContext,{});let a=R.get(this.audioContext);if(!a[n]){let l=X(n,s);await this.audioContext.audioWorklet.addModule(l),a[n]={node:new AudioWorkletNode(this.audioContext,n),handlers:[]}}this.recordingWorklet=a[n].node,this.recordingWorklet.port.onmessage=async(l)=>{let h=l.data.data.int16arrayBuffer;if(h)this.emit("data",h)},this.source.connect(this.recordingWorklet),this.recording=!0,e(),this.starting=null})}stop(){let e=()=>{this.source?.disconnect(),this.stream?.getTracks().forEach((t)=>t.stop()),this.stream=void 0,this.recordingWorklet=void 0};if(this.starting){this.starting.then(e);return}e()}mute(){if(this.source&&this.recordingWorklet&&!this.isMuted)this.source.disconnect(this.recordingWorklet),this.isMuted=!0}unmute(){if(this.source&&this.recordingWorklet&&this.isMuted)this.source.connect(this.recordingWorklet),this.isMuted=!1}}class j{constructor(e,t=null){this.context=e,this.sampleRate=24000,this.audioQueue=[],this.isPlaying=!1,this.currentSource=null,this.gainNode=this.context.createGain(),this.gainNode.connect(this.context.destination),this.addPCM16=this.addPCM16.bind(this),this.onComplete=()=>{},this.playbackTimeout=null,this.lastPlaybackTime=0,this.avatar=t}addPCM16(e){let t=new Float32Array(e.length/2),n=new DataView(e.buffer);for(let a=0;a<e.length/2;a++)try{let l=n.getInt16(a*2,!0);t[a]=l/32768}catch(l){console.error(l)}let s=this.context.createBuffer(1,t.length,this.sampleRate);if(s.getChannelData(0).set(t),this.audioQueue.push(s),!this.isPlaying)this.isPlaying=!0,this.lastPlaybackTime=this.context.currentTime,this.playNextBuffer();this.checkPlaybackStatus()}checkPlaybackStatus(){if(this.playbackTimeout)clearTimeout(this.playbackTimeout);this.playbackTimeout=setTimeout(()=>{if(this.context.currentTime-this.lastPlaybackTime>1&&this.audioQueue.length>0&&this.isPlaying)console.log("Playback appears to have stalled, restarting..."),this.playNextBuffer();if(this.isPlaying)this.checkPlaybackStatus()},1000)}playNextBuffer(){if(this.audioQueue.length===0){this.isPlaying=!1;return}this.lastPlaybackTime=this.context.currentTime;try{let e=this.audioQueue.shift(),t=this.context.createBufferSource();if(t.buffer=e,t.connect(this.gainNode),this.currentSource)try{this.currentSource.disconnect()}catch(n){}this.currentSource=t,t.onended=()=>{if(this.lastPlaybackTime=this.context.currentTime,this.audioQueue.length>0)setTimeout(()=>this.playNextBuffer(),0);else this.isPlaying=!1,this.onComplete()},t.start(0)}catch(e){if(console.error("Error during playback:",e),this.audioQueue.length>0)setTimeout(()=>this.playNextBuffer(),100);else this.isPlaying=!1}}stop(){if(this.isPlaying=!1,this.playbackTimeout)clearTimeout(this.playbackTimeout),this.playbackTimeout=null;if(this.currentSource)try{this.currentSource.stop(),this.currentSource.disconnect()}catch(e){}this.audioQueue=[],this.gainNode.gain.linearRampToValueAtTime(0,this.context.currentTime+0.1),setTimeout(()=>{this.gainNode.disconnect(),this.gainNode=this.context.createGain(),this.gainNode.connect(this.context.destination)},200)}async resume(){if(this.context.state==="suspended")await this.context.resume();if(this.lastPlaybackTime=this.context.currentTime,this.gainNode.gain.setValueAtTime(1,this.context.currentTime),this.audioQueue.length>0&&!this.isPlaying)this.isPlaying=!0,this.playNextBuffer()}complete(){if(this.audioQueue.length>0)return;if(this.playbackTimeout)clearTimeout(this.playbackTimeout),this.playbackTimeout=null;this.onComplete()}}var Z=document.getElementById("text"),ue=document.getElementById("btnSend"),ee=document.getElementById("mic"),B=document.getElementById("camera"),D=document.getElementById("screenShare"),k=document.getElementById("videoPreview"),fe=document.getElementById("avatar"),E=document.getElementById("loading"),Q=document.getElementById("outputBox"),C=document.getElementById("liveTranscript"),y=null,L=!1,me=!1,F=!1,N=!1,b=new I(k),g=new _("ws://localhost:8080/api/ws/live"),z=new W,ne=new(window.AudioContext||window.webkitAudioContext)({sampleRate:24000}),pe=new j(ne),T="",V=0,J=-1,O=!1,U=-1,H=[];function M(e,t){e.classList.toggle("pulse-effect",t)}function w(e,t){let n=document.createElement("div"),s={user:{label:"user@console",color:"text-cyan-400",msgColor:"text-green-300"},gemini:{label:"gemini@core",color:"text-purple-400",msgColor:"text-green-300"},debug:{label:"system@debug",color:"text-yellow-400",msgColor:"text-yellow-200"},error:{label:"system@error",color:"text-red-400",msgColor:"text-red-300"}},{label:a,color:l,msgColor:h}=s[e]||{label:"unknown",color:"text-gray-400",msgColor:"text-gray-300"};n.innerHTML=`<span class="${l}">${a}</span>: <span class="${h}">${t}</span>`,Q.appendChild(n),Q.scrollTop=Q.scrollHeight}function se(e){let t=e.getBoundingClientRect();k.style.position="fixed",k.style.left=`${t.left+t.width/2-150}px`,k.style.top=`${t.top-300}px`,k.classList.remove("hidden"),k.classList.add("opacity-100")}g.onReady=()=>w("debug","✅ Gemini API is ready.");g.onTextContent=(e)=>{if(e.trim())T+=e};var te=[];function ge(e){let t=atob(e),n=new Uint8Array(t.length);for(let s=0;s<t.length;s++)n[s]=t.charCodeAt(s);return n.buffer}g.onTurnComplete=()=>{if(w("debug","\uD83D\uDD04 Turn complete."),T.trim())if(y)me=!0,w("gemini",T),y.speakText(T);else w("debug","⚠️ Avatar not loaded, skipping speech.");if(y?.endTurn(),g.isSpeaking=!1,T="",J=V,pe.complete(),te.length>0)te.length=0;C.innerHTML="",H=[],U=-1,C.classList.add("hidden")};g.onAudioData=async(e)=>{try{let{audio:t,words:n}=e;if(!g.isSpeaking||J!==V)w("debug","\uD83D\uDD0A Playing audio data..."),g.isSpeaking=!0,J=V;let s=t instanceof ArrayBuffer?t:ge(t),a=new Int16Array(s),l=new Float32Array(a.length);for(let h=0;h<a.length;h++)l[h]=a[h]/32768;await y.speakAudio(a,{...n||{},...e.visemes||{}})}catch(t){console.error("Error playing audio:",t)}};g.onAudioWords=(e)=>{y?.applyWords(e)};g.onInterrupted=()=>{y?.resetTurn()};g.onFunctionCall=(e)=>{if(w("debug",`\uD83D\uDD27 Function call: ${e.name} with args ${JSON.stringify(e.args)}, response: ${e.result}`),e.name==="turn_on_the_lights"){y.playGesture("thumbup",3);let t=e.args?.color||16711680;y.setLighting({lightAmbientColor:t,lightAmbientIntensity:5,lightDirectColor:t,lightDirectIntensity:20})}else if(e.name==="turn_off_the_lights")y.playGesture("thumbdown",3),y.setLighting({lightAmbientColor:16777215,lightAmbientIntensity:2,lightDirectColor:8947882,lightDirectIntensity:30,lightDirectPhi:0.1,lightDirectTheta:2,lightSpotColor:3377407,lightSpotIntensity:0,lightSpotPhi:0.1,lightSpotTheta:4,lightSpotDispersion:0})};g.onMessageParsed=async(e)=>{if(e.type==="config"){y=new P(fe,{ttsEndpoint:"https://texttospeech.googleapis.com/v1beta1/text:synthesize",ttsApikey:e.ttsApikey,lipsyncModules:["en"],cameraView:"upper",lightAmbientIntensity:1,ttsLang:e.ttsLang,ttsVoice:e.ttsVoice,avatarPath:e.avatarPath}),y.onTranscript=(t)=>{if(t.trim()){if(C.classList.contains("hidden"))C.classList.remove("hidden");let n=`word-${H.length}`,s=document.createElement("span");if(s.className="word",s.id=n,s.textContent=t,C.appendChild(s),C.scrollTop=C.scrollHeight,U>=0){let a=document.getElementById(`word-${U}`);if(a)a.classList.remove("active")}s.classList.add("active"),U=H.length,H.push(t)}},y.onLoading=(t,n)=>{if(t==="start")E.textContent="Loading...",E.style.display="block";else if(t==="progress")E.textContent=`Loading ${n.percent}%`;else if(t==="complete")E.style.display="none"};try{await y.load()}catch(t){console.error("❌ Avatar failed to load:",t),E.style.display="none",w("debug",`❌ Avatar loading error: ${t.message}`)}}else if(e.type==="error")w("error",`❌ Error from Server: ${e.data?.message}`);else if(e.type==="debug")w("debug",`ℹ️ Info from Server: ${e.data?.message}`)};window.addEventListener("stream-start",(e)=>{w("debug",`\uD83D\uDCE1 Stream started: ${e.detail.source}`)});window.addEventListener("stream-stop",()=>{w("debug","\uD83D\uDED1 Stream stopped"),k.classList.add("hidden"),k.classList.remove("opacity-100"),F=!1,N=!1,M(B,!1),M(D,!1)});function ie(){let e=Z.value.trim();if(e)g.sendTextMessage(e),w("user",e),Z.value=""}ue.addEventListener("click",ie);Z.addEventListener("keydown",(e)=>{if(e.key==="Enter")e.preventDefault(),ie()});B.addEventListener("click",async()=>{if(b.isWebcamActive)b.stopAll(),F=!1;else if(await b.startWebcam(!0))F=!0,se(B),b.startFrameCapture((n)=>{g.sendImage(n)});M(B,F)});D.addEventListener("click",async()=>{if(b.isScreenActive)b.stopAll(),N=!1;else if(await b.startScreenShare())N=!0,se(D),b.startFrameCapture((n)=>{g.sendImage(n)});M(D,N)});document.addEventListener("visibilitychange",()=>{let e=document.visibilityState==="visible";if(y?.head?.[e?"start":"stop"]?.(),!e&&!L)b.stopAll()});async function ye(){try{await ne.resume(),await z.start(),O=!1,V++,z.on("data",(e)=>{if(!O)w("debug","\uD83C\uDFA4 Recording started, sending audio chunks..."),O=!0;g.sendAudioChunk(e)}),L=!0}catch(e){console.error("Error starting recording:",e),w("debug",`❌ Error starting recording: ${e.message}`)}}function we(){z.stop(),L=!1,O=!1,w("debug","\uD83C\uDFA4 Recording stopped, audio sent to Gemini API."),g.sendEndMessage()}ee.addEventListener("click",async()=>{if(L)we();else await ye();M(ee,L)});
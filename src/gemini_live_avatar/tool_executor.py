@@ -0,0 +1,259 @@
+"""
+Concurrent execution of Gemini function calls.
+
+The function calls of one tool call run concurrently, bounded by a shared
+concurrency limit. Each call gets its own timeout (per tool name, with a
+default) and can be cancelled on its own when Gemini reports it cancelled or
+the user interrupts the turn. Results are reported as soon as each call
+finishes, while the FunctionResponses returned to Gemini keep the order of the
+original calls.
+
+Results of read-only tools can be cached by tool name and canonicalized
+arguments. Caching is opt-in per tool through a ``tool_cache`` section in the
+MCP server config file::
+
+    "tool_cache": {
+        "max_entries": 1024,
+        "tools": {"get_currency_country": {"ttl": 3600}}
+    }
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from google.genai import types
+
+from gemini_live_avatar.metrics import TOOL_LATENCY
+
+logger = logging.getLogger(__name__)
+
+RunToolFn = Callable[[types.FunctionCall], Awaitable[Any]]
+ResultCallback = Callable[[types.FunctionCall, Any], Awaitable[None]]
+
+
+class ToolExecutor:
+    def __init__(
+            self,
+            run_tool: RunToolFn,
+            max_concurrency: int = 4,
+            default_timeout: float = 30.0,
+            tool_timeouts: Optional[Dict[str, float]] = None
+    ):
+        self.run_tool = run_tool
+        self.default_timeout = default_timeout
+        self.tool_timeouts = tool_timeouts or {}
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._running: Dict[str, asyncio.Task] = {}  # call id -> task
+        self._withdrawn: Set[str] = set()  # call ids Gemini cancelled itself, answered with no response
+
+    def timeout_for(self, tool_name: str) -> float:
+        return self.tool_timeouts.get(tool_name, self.default_timeout)
+
+    async def _run_call(self, function_call: types.FunctionCall, on_result: Optional[ResultCallback]) -> Any:
+        timeout = self.timeout_for(function_call.name)
+        async with self._semaphore:
+            try:
+                with TOOL_LATENCY.time(function_call.name):
+                    result = await asyncio.wait_for(self.run_tool(function_call), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"⏱️ Tool {function_call.name} timed out after {timeout}s")
+                result = f"Error executing function `{function_call.name}`: timed out after {timeout}s"
+            except Exception as tool_err:
+                logger.exception(f"❌ Error during tool execution: {tool_err}")
+                result = f"Error executing function `{function_call.name}`: {tool_err}"
+
+        if on_result:
+            await on_result(function_call, result)
+        return result
+
+    async def execute(
+            self,
+            function_calls: List[types.FunctionCall],
+            on_result: Optional[ResultCallback] = None
+    ) -> List[types.FunctionResponse]:
+        """
+        Run the calls concurrently and return their FunctionResponses in call order.
+
+        Calls Gemini cancelled by id are left out of the responses; calls cancelled
+        for any other reason still get one, so Gemini isn't left waiting for them.
+        """
+        tasks = []
+        keys = []
+        for index, function_call in enumerate(function_calls):
+            task = asyncio.create_task(self._run_call(function_call, on_result))
+            key = function_call.id or f"{id(function_calls)}:{index}"
+            self._running[key] = task
+            tasks.append(task)
+            keys.append(key)
+
+        try:
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+        finally:
+            for key in [key for key, task in self._running.items() if task in tasks]:
+                del self._running[key]
+            withdrawn = self._withdrawn.intersection(keys)
+            self._withdrawn.difference_update(keys)
+
+        responses = []
+        for function_call, key, result in zip(function_calls, keys, results):
+            if isinstance(result, asyncio.CancelledError):
+                logger.info(f"🚫 Tool call {function_call.name} ({function_call.id}) was cancelled")
+                if key in withdrawn:
+                    continue
+                result = f"Function `{function_call.name}` was cancelled before it finished"
+            elif isinstance(result, BaseException):
+                result = f"Error executing function `{function_call.name}`: {result}"
+            responses.append(types.FunctionResponse(
+                name=function_call.name,
+                id=function_call.id,
+                response={"output": result}
+            ))
+        return responses
+
+    def cancel(self, call_ids: Optional[Iterable[str]] = None) -> int:
+        """
+        Cancel the running calls with the given ids, or every running call. Returns how many were cancelled.
+
+        Ids come from Gemini's tool call cancellation, so those calls get no response;
+        cancelling every call (e.g. on an interruption) still answers each of them.
+        """
+        if call_ids is None:
+            keys = list(self._running)
+        else:
+            keys = [i for i in call_ids if i in self._running]
+            self._withdrawn.update(keys)
+        for key in keys:
+            self._running[key].cancel()
+        return len(keys)
+
+    @property
+    def running(self) -> int:
+        return len(self._running)
+
+
+@dataclass
+class ToolCacheStats:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evictions: int = 0
+
+
+class ToolResultCache:
+    """
+    LRU cache of tool results with a TTL per tool.
+
+    Only tools listed in ``ttls`` are cached. Concurrent calls with the same key
+    share one execution, and failed calls are never cached.
+    """
+
+    def __init__(self, ttls: Dict[str, float], max_entries: int = 1024):
+        self.ttls = ttls
+        self.max_entries = max_entries
+        self.stats: Dict[str, ToolCacheStats] = {name: ToolCacheStats() for name in ttls}
+        self._entries: "OrderedDict[str, tuple[str, float, Any]]" = OrderedDict()  # key -> (tool, expiry, result)
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @classmethod
+    def from_json_config(cls, config_path: str) -> Optional["ToolResultCache"]:
+        """
+        Build the cache from the ``tool_cache`` section of an MCP config file, or None when it has none.
+        """
+        config = json.loads(Path(config_path).read_text()).get("tool_cache")
+        if not config or not config.get("tools"):
+            return None
+        ttls = {name: float(policy.get("ttl", 300.0)) for name, policy in config["tools"].items()}
+        return cls(ttls, max_entries=config.get("max_entries", 1024))
+
+    def is_cacheable(self, tool_name: str) -> bool:
+        return tool_name in self.ttls
+
+    @staticmethod
+    def key_for(tool_name: str, tool_args: Optional[Dict]) -> str:
+        return tool_name + ":" + json.dumps(tool_args or {}, sort_keys=True, separators=(",", ":"), default=str)
+
+    def _lookup(self, key: str, tool_name: str) -> tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        _, expires_at, result = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.stats[tool_name].expired += 1
+            return False, None
+        self._entries.move_to_end(key)
+        return True, result
+
+    def _store(self, key: str, tool_name: str, result: Any) -> None:
+        self._entries[key] = (tool_name, time.monotonic() + self.ttls[tool_name], result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            _, (evicted_tool, _, _) = self._entries.popitem(last=False)
+            self.stats[evicted_tool].evictions += 1
+
+    async def get_or_run(self, tool_name: str, tool_args: Optional[Dict], run: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached result for this call, or run it and cache the result.
+        """
+        key = self.key_for(tool_name, tool_args)
+        stats = self.stats[tool_name]
+        found, result = self._lookup(key, tool_name)
+        if found:
+            stats.hits += 1
+            return result
+
+        inflight = self._inflight.get(key)
+        if inflight:
+            try:
+                result = await asyncio.shield(inflight)
+                stats.hits += 1
+                return result
+            except asyncio.CancelledError:
+                # Only swallow the cancellation of the call we were sharing, not our own
+                if not inflight.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+        stats.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await run()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody else may be waiting; don't log "exception was never retrieved"
+            future.exception()
+            raise
+        else:
+            self._store(key, tool_name, result)
+            future.set_result(result)
+            return result
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def snapshot(self) -> dict:
+        tools = {}
+        for name, stats in self.stats.items():
+            lookups = stats.hits + stats.misses
+            tools[name] = {
+                "ttl": self.ttls[name],
+                "hits": stats.hits,
+                "misses": stats.misses,
+                "expired": stats.expired,
+                "evictions": stats.evictions,
+                "hit_rate": stats.hits / lookups if lookups else 0.0,
+            }
+        return {"entries": len(self._entries), "max_entries": self.max_entries, "tools": tools}
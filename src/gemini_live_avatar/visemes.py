@@ -0,0 +1,110 @@
+"""
+Model-free lip-sync from the PCM Gemini returns.
+
+Audio is cut into short frames and each frame's RMS energy, zero-crossing rate
+and spectral centroid are computed in one vectorized pass. Quiet frames are
+silence, noisy high-crossing frames are fricatives, and voiced frames map to a
+vowel viseme by their centroid, with an openness taken from their energy
+relative to the recent peak. Consecutive frames with the same viseme are
+merged into the ``visemes``/``vtimes``/``vdurations`` timeline TalkingHead
+plays with ``lipsyncType: "visemes"``.
+
+Each chunk is analysed on its own, so the timeline can be sent along with the
+chunk while the turn is still streaming.
+"""
+
+import numpy as np
+
+# Vowel visemes by spectral centroid (Hz): rounded back vowels are darkest, front vowels brightest
+VOWEL_CENTROIDS = (800.0, 1200.0, 2000.0, 2800.0)
+VOWEL_VISEMES = ("U", "O", "aa", "E", "I")
+NASAL_VISEME = "nn"
+FRICATIVE_VISEMES = ("FF", "SS")
+SILENCE = -1
+
+
+def empty_visemes() -> dict:
+    return {"visemes": [], "vtimes": [], "vdurations": [], "vopenness": []}
+
+
+class VisemeAnalyzer:
+    def __init__(
+            self,
+            sample_rate: int = 24000,
+            frame_ms: int = 20,
+            silence_threshold: float = 500.0,
+            fricative_zcr: float = 0.25,
+            sibilant_centroid: float = 4000.0,
+            nasal_openness: float = 0.2,
+            peak_decay: float = 0.9
+    ):
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.frame_samples = sample_rate * frame_ms // 1000
+        self.silence_threshold = silence_threshold
+        self.fricative_zcr = fricative_zcr
+        self.sibilant_centroid = sibilant_centroid
+        self.nasal_openness = nasal_openness
+        self.peak_decay = peak_decay
+        self.labels = np.array(VOWEL_VISEMES + (NASAL_VISEME,) + FRICATIVE_VISEMES)
+        self._window = np.hanning(self.frame_samples).astype(np.float32)
+        self._frequencies = np.fft.rfftfreq(self.frame_samples, 1 / sample_rate).astype(np.float32)
+        self._peak = 0.0  # loudest recent frame RMS, decays per analysed chunk
+
+    def reset(self) -> None:
+        self._peak = 0.0
+
+    def _frames(self, pcm: bytes) -> np.ndarray:
+        samples = np.frombuffer(pcm, dtype=np.int16, count=len(pcm) // 2).astype(np.float32)
+        n_frames = -(-samples.size // self.frame_samples)
+        padded = np.zeros(n_frames * self.frame_samples, dtype=np.float32)
+        padded[:samples.size] = samples
+        return padded.reshape(n_frames, self.frame_samples)
+
+    def features(self, pcm: bytes) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Per-frame RMS energy, zero-crossing rate and spectral centroid (Hz).
+        """
+        frames = self._frames(pcm)
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (self.frame_samples - 1)
+        magnitudes = np.abs(np.fft.rfft(frames * self._window, axis=1))
+        total = magnitudes.sum(axis=1)
+        centroid = (magnitudes @ self._frequencies) / np.maximum(total, 1e-9)
+        return rms, zcr, centroid
+
+    def analyze(self, pcm: bytes, offset_ms: int = 0) -> dict:
+        """
+        Viseme timeline of ``pcm`` with times in milliseconds from ``offset_ms``.
+        """
+        if len(pcm) < 2:
+            return empty_visemes()
+
+        rms, zcr, centroid = self.features(pcm)
+        self._peak = max(self._peak * self.peak_decay, float(rms.max()), self.silence_threshold * 4)
+        openness = np.clip(rms / self._peak, 0.0, 1.0)
+
+        codes = np.digitize(centroid, VOWEL_CENTROIDS)
+        codes = np.where(openness < self.nasal_openness, len(VOWEL_VISEMES), codes)
+        fricative = zcr >= self.fricative_zcr
+        codes = np.where(fricative, len(VOWEL_VISEMES) + 1 + (centroid >= self.sibilant_centroid), codes)
+        codes = np.where(rms < self.silence_threshold, SILENCE, codes)
+
+        # Merge runs of equal codes, then drop silent runs
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(codes)) + 1))
+        lengths = np.diff(np.concatenate((starts, [codes.size])))
+        run_codes = codes[starts]
+        run_openness = np.maximum.reduceat(openness, starts)
+        voiced = run_codes != SILENCE
+
+        duration_ms = len(pcm) * 1000 // (self.sample_rate * 2)
+        times = starts[voiced] * self.frame_ms
+        durations = np.minimum(lengths[voiced] * self.frame_ms, duration_ms - times)
+        return {
+            "visemes": self.labels[run_codes[voiced]].tolist(),
+            "vtimes": (times + offset_ms).tolist(),
+            "vdurations": durations.tolist(),
+            "vopenness": np.round(run_openness[voiced].astype(np.float64), 2).tolist(),
+        }
+
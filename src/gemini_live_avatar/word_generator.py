@@ -1,45 +1,98 @@
-import os
-import tempfile
-import wave
-
+import numpy as np
 import torch
 import whisperx
 import logging
 from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Union
 from gemini_live_avatar.singleton import Singleton
 
 logger = logging.getLogger(__name__)
 
+WHISPER_SAMPLE_RATE = 16000
+BATCH_GAP_SECONDS = 1.0  # silence between jobs concatenated into one batch
+
+BatchItem = Tuple[bytes, Optional[str], Optional[str]]  # (pcm, transcript, language)
+
+
+def pcm_to_float32(pcm: bytes, sample_rate: int = 24000, target_rate: int = WHISPER_SAMPLE_RATE) -> np.ndarray:
+    """
+    Convert mono int16 PCM to float32 in [-1, 1) at ``target_rate`` using vectorized
+    linear interpolation, which is what WhisperX expects in place of an ffmpeg decode.
+    """
+    samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+    if sample_rate == target_rate or samples.size == 0:
+        return samples
+
+    n_out = int(samples.size * target_rate / sample_rate)
+    positions = np.arange(n_out, dtype=np.float64) * (sample_rate / target_rate)
+    return np.interp(positions, np.arange(samples.size), samples).astype(np.float32)
+
+
 class WordGenerator(metaclass=Singleton):
-    def __init__(self, model_size: str = "small", compute_type: str = "float32"):
+    def __init__(
+            self,
+            model_size: str = "small",
+            compute_type: str = "float32",
+            fast_model_size: Optional[str] = None,
+            fast_compute_type: str = "int8"
+    ):
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        logger.info(f"📥 Loading Whisper model on {self.device}")
-        self.model = whisperx.load_model(model_size, device=self.device, compute_type=compute_type)
+        self.model = self.get_whisper_model(model_size, self.device, compute_type)
+        self.fast_model_size = fast_model_size
+        self.fast_compute_type = fast_compute_type
+
+    def transcription_model(self, fast: bool = False):
+        """
+        The Whisper model used for transcription; ``fast`` picks the smaller fallback model when one is configured.
+        """
+        if fast and self.fast_model_size:
+            return self.get_whisper_model(self.fast_model_size, self.device, self.fast_compute_type)
+        return self.model
 
-    def generate_from_bytes(self, audio_bytes: bytes) -> dict:
+    def generate_from_bytes(self, audio_bytes: bytes, sample_rate: int = 24000) -> dict:
+        """
+        Accepts raw PCM audio bytes (mono, 16-bit, 24000Hz) and performs transcription
+        and alignment entirely in memory.
         """
-        Accepts raw PCM audio bytes (mono, 16-bit, 24000Hz), wraps them in a proper WAV file,
-        and performs transcription and alignment.
+        return self.generate_from_pcm(audio_bytes, sample_rate)
+
+    def generate_from_pcm(
+            self,
+            pcm: bytes,
+            sample_rate: int = 24000,
+            transcript: Optional[str] = None,
+            language: Optional[str] = None,
+            fast: bool = False
+    ) -> dict:
         """
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
-            tmp_path = tmp.name
-
-        try:
-            # Write the WAV file with proper header
-            with wave.open(tmp_path, "wb") as wf:
-                wf.setnchannels(1)  # mono
-                wf.setsampwidth(2)  # 16-bit
-                wf.setframerate(24000)  # 24 kHz
-                wf.writeframes(audio_bytes)
-            return self.generate(tmp_path)
-
-        finally:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+        Align raw int16 PCM without touching disk or spawning ffmpeg.
+
+        When the transcript is already known (e.g. Gemini's output transcription) and
+        a language is given, Whisper transcription is skipped and only forced alignment
+        runs. Otherwise the audio is transcribed first, with the fast model if ``fast``.
+        """
+        audio = pcm_to_float32(pcm, sample_rate)
+        if transcript and transcript.strip() and language:
+            return self.align_transcript(audio, transcript, language)
+        return self._transcribe_and_align(audio, fast)
+
+    def align_transcript(self, audio: np.ndarray, transcript: str, language: str) -> dict:
+        """
+        Force-align a known transcript against 16 kHz float32 audio.
+        """
+        segments = [{
+            "text": transcript.strip(),
+            "start": 0.0,
+            "end": audio.size / WHISPER_SAMPLE_RATE
+        }]
+        return self._align(segments, language, audio)
 
     def generate(self, audio_path: str) -> dict:
+        return self._transcribe_and_align(whisperx.load_audio(audio_path))
+
+    def _transcribe_and_align(self, audio: np.ndarray, fast: bool = False) -> dict:
         logger.info("🧠 Transcribing audio...")
-        result = self.model.transcribe(audio_path)
+        result = self.transcription_model(fast).transcribe(audio)
         segments = result.get("segments", [])
         if not segments:
             raise ValueError("❌ No segments found in transcription. Check the audio quality.")
@@ -48,7 +101,9 @@ class WordGenerator(metaclass=Singleton):
         for seg in segments:
             logger.debug(f" - [{seg['start']} - {seg['end']}] {seg['text']}")
 
-        language = result["language"]
+        return self._align(segments, result["language"], audio)
+
+    def _align(self, segments: list, language: str, audio: np.ndarray) -> dict:
         logger.info(f"🎯 Getting alignment model for language: {language}")
         align_model, metadata = self.get_alignment_model(language, self.device)
 
@@ -57,7 +112,7 @@ class WordGenerator(metaclass=Singleton):
             segments,
             align_model,
             metadata,
-            audio_path,
+            audio,
             self.device,
             return_char_alignments=False
         )
@@ -65,6 +120,85 @@ class WordGenerator(metaclass=Singleton):
         logger.info("🧩 Parsing aligned phonemes...")
         return self._parse_alignment(aligned)
 
+    def generate_batch(
+            self,
+            items: List[BatchItem],
+            sample_rate: int = 24000,
+            fast: bool = False
+    ) -> List[Union[dict, Exception]]:
+        """
+        Align several PCM clips with one transcribe/align pass per language.
+
+        Clips are grouped by language (the given one when a transcript is known,
+        otherwise the detected one), concatenated with short silences in between,
+        processed together and split back into per-clip word timings. A failure
+        only affects the clips of its group.
+        """
+        if len(items) == 1:
+            pcm, transcript, language = items[0]
+            try:
+                return [self.generate_from_pcm(pcm, sample_rate, transcript, language, fast)]
+            except Exception as e:
+                return [e]
+
+        model = self.transcription_model(fast)
+        audios = [pcm_to_float32(pcm, sample_rate) for pcm, _, _ in items]
+        groups: Dict[Tuple[str, bool], List[int]] = {}
+        for index, (audio, (_, transcript, language)) in enumerate(zip(audios, items)):
+            known = bool(transcript and transcript.strip() and language)
+            group_language = language if known else model.detect_language(audio)
+            groups.setdefault((group_language, known), []).append(index)
+
+        results: List[Union[dict, Exception]] = [None] * len(items)
+        for (language, known), indexes in groups.items():
+            logger.info(f"📦 Aligning batch of {len(indexes)} clips for language: {language}")
+            try:
+                transcripts = [items[i][1] for i in indexes] if known else None
+                parts = self._align_group([audios[i] for i in indexes], language, transcripts, model)
+                for index, part in zip(indexes, parts):
+                    results[index] = part
+            except Exception as e:
+                logger.exception("Batched alignment failed")
+                for index in indexes:
+                    results[index] = e
+        return results
+
+    def _align_group(
+            self,
+            audios: List[np.ndarray],
+            language: str,
+            transcripts: Optional[List[str]],
+            model=None
+    ) -> List[dict]:
+        gap = np.zeros(int(BATCH_GAP_SECONDS * WHISPER_SAMPLE_RATE), dtype=np.float32)
+        spans = []
+        offset = 0.0
+        for audio in audios:
+            duration = audio.size / WHISPER_SAMPLE_RATE
+            spans.append((offset, offset + duration))
+            offset += duration + BATCH_GAP_SECONDS
+        joined = np.concatenate([part for audio in audios for part in (audio, gap)])
+
+        if transcripts:
+            segments = [
+                {"text": text.strip(), "start": start, "end": end}
+                for text, (start, end) in zip(transcripts, spans)
+            ]
+        else:
+            segments = (model or self.model).transcribe(joined, language=language, batch_size=len(audios)).get("segments", [])
+            if not segments:
+                raise ValueError("❌ No segments found in transcription. Check the audio quality.")
+
+        align_model, metadata = self.get_alignment_model(language, self.device)
+        aligned = whisperx.align(segments, align_model, metadata, joined, self.device, return_char_alignments=False)
+        return self._split_alignment(aligned, spans)
+
+    @staticmethod
+    @lru_cache(maxsize=2)
+    def get_whisper_model(model_size: str, device: str, compute_type: str):
+        logger.info(f"📥 Loading Whisper {model_size} ({compute_type}) on {device}")
+        return whisperx.load_model(model_size, device=device, compute_type=compute_type)
+
     @staticmethod
     @lru_cache(maxsize=4)
     def get_alignment_model(language: str, device: str):
@@ -80,6 +214,9 @@ class WordGenerator(metaclass=Singleton):
 
         for segment in aligned_data.get("segments", []):
             for word in segment.get("words", []):
+                # Forced alignment leaves digits, symbols and some punctuation without times
+                if "start" not in word:
+                    continue
                 word_text = word["word"]
                 start = float(word["start"])
                 end = float(word["end"])
@@ -89,3 +226,25 @@ class WordGenerator(metaclass=Singleton):
                 words_buffer["wdurations"].append(int((end - start) * 1000))
 
         return words_buffer
+
+    def _split_alignment(self, aligned_data: dict, spans: List[Tuple[float, float]]) -> List[dict]:
+        """
+        Assign the words of a concatenated alignment back to each clip, in clip time.
+        """
+        buffers = [{"words": [], "wtimes": [], "wdurations": []} for _ in spans]
+        boundaries = [start for start, _ in spans[1:]]
+
+        for segment in aligned_data.get("segments", []):
+            for word in segment.get("words", []):
+                if "start" not in word:
+                    continue
+                start = float(word["start"])
+                end = float(word["end"])
+                index = int(np.searchsorted(boundaries, start, side="right"))
+                clip_start = spans[index][0]
+
+                buffers[index]["words"].append(word["word"])
+                buffers[index]["wtimes"].append(int((start - clip_start) * 1000))
+                buffers[index]["wdurations"].append(int((end - start) * 1000))
+
+        return buffers
@@ -0,0 +1,32 @@
+import struct
+
+import pytest
+
+from gemini_live_avatar.framing import FRAME_HEADER, FrameError, FrameKind, decode_frame, encode_frame
+
+
+def test_round_trip_with_metadata():
+    payload = bytes(range(256)) * 4
+    metadata = {"words": {"words": ["hi"], "wtimes": [0], "wdurations": [120]}}
+    frame = encode_frame(FrameKind.AUDIO, payload, metadata)
+    assert decode_frame(frame) == (FrameKind.AUDIO, metadata, payload)
+
+
+def test_round_trip_without_metadata():
+    frame = encode_frame(FrameKind.IMAGE, b"\xff\xd8jpeg")
+    assert len(frame) == FRAME_HEADER.size + 6
+    assert decode_frame(frame) == (FrameKind.IMAGE, None, b"\xff\xd8jpeg")
+
+
+def test_empty_payload():
+    assert decode_frame(encode_frame(FrameKind.AUDIO, b"")) == (FrameKind.AUDIO, None, b"")
+
+
+@pytest.mark.parametrize("frame, message", [
+    (b"\x01\x00", "too short"),
+    (struct.pack("!BI", 9, 0) + b"data", "Unknown frame kind"),
+    (struct.pack("!BI", 1, 100) + b"{}", "exceeds frame size"),
+])
+def test_malformed_frames_raise_frame_error(frame, message):
+    with pytest.raises(FrameError, match=message):
+        decode_frame(frame)
@@ -0,0 +1,94 @@
+import asyncio
+
+from fake_live import FakeLiveScript, fake_connect
+from google.genai import types
+
+from gemini_live_avatar.live_pool import LiveSessionPool, config_fingerprint
+
+MODEL = "gemini-live-test"
+
+
+def live_config(voice="Puck"):
+    return types.LiveConnectConfig(
+        response_modalities=["AUDIO"],
+        speech_config=types.SpeechConfig(voice_config=types.VoiceConfig(
+            prebuilt_voice_config=types.PrebuiltVoiceConfig(voice_name=voice)
+        ))
+    )
+
+
+def pool_with(size=2, max_age=480.0):
+    return LiveSessionPool(fake_connect(FakeLiveScript(connect_ms=5)), size=size, max_age=max_age, retry_delay=0.01)
+
+
+async def wait_for_idle(pool, key, count):
+    for _ in range(200):
+        if len(pool._idle.get(key, ())) >= count:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"pool never reached {count} idle sessions")
+
+
+def test_first_acquire_misses_then_pool_refills_and_hits():
+    async def main():
+        pool = pool_with(size=2)
+        config = live_config()
+        key = config_fingerprint(MODEL, config)
+        try:
+            async with pool.acquire(MODEL, config) as first:
+                assert first.session_number
+            await wait_for_idle(pool, key, 2)
+            async with pool.acquire(MODEL, config):
+                pass
+            await wait_for_idle(pool, key, 2)
+            return pool.snapshot()
+        finally:
+            await pool.close()
+
+    snapshot = asyncio.run(main())
+    assert snapshot["misses"] == 1
+    assert snapshot["hits"] == 1
+    assert snapshot["connect_failures"] == 0
+
+
+def test_sessions_are_not_shared_across_config_fingerprints():
+    async def main():
+        pool = pool_with(size=1)
+        puck, kore = live_config("Puck"), live_config("Kore")
+        try:
+            async with pool.acquire(MODEL, puck):
+                pass
+            await wait_for_idle(pool, config_fingerprint(MODEL, puck), 1)
+            async with pool.acquire(MODEL, kore):
+                pass
+            return pool.snapshot()
+        finally:
+            await pool.close()
+
+    snapshot = asyncio.run(main())
+    assert config_fingerprint(MODEL, live_config("Puck")) != config_fingerprint(MODEL, live_config("Kore"))
+    assert len(snapshot["idle"]) == 2
+    assert snapshot["hits"] == 0
+    assert snapshot["misses"] == 2
+
+
+def test_expired_sessions_are_never_handed_out():
+    async def main():
+        pool = pool_with(size=1, max_age=0.05)
+        config = live_config()
+        key = config_fingerprint(MODEL, config)
+        try:
+            async with pool.acquire(MODEL, config):
+                pass
+            await wait_for_idle(pool, key, 1)
+            pool._idle[key][0].created_at -= 1.0
+            async with pool.acquire(MODEL, config):
+                pass
+            return pool.snapshot()
+        finally:
+            await pool.close()
+
+    snapshot = asyncio.run(main())
+    assert snapshot["hits"] == 0
+    assert snapshot["misses"] == 2
+    assert snapshot["expired"] >= 1
@@ -0,0 +1,28 @@
+import asyncio
+import time
+
+import pytest
+from mcp import StdioServerParameters
+
+from gemini_live_avatar.mcp_server import MCPClientPool, MCPUnavailableError
+
+
+def test_sessions_fail_fast_while_the_server_is_down():
+    pool = MCPClientPool(
+        StdioServerParameters(command="/nonexistent/mcp-server"),
+        min_backoff=60.0,
+        connect_timeout=30.0
+    )
+
+    async def main():
+        try:
+            with pytest.raises(MCPUnavailableError):
+                await pool.get_tools_names()
+            started = time.monotonic()
+            with pytest.raises(MCPUnavailableError):
+                await pool.get_tools_names()
+            return time.monotonic() - started
+        finally:
+            await pool.close()
+
+    assert asyncio.run(main()) < 1.0
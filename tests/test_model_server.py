@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from gemini_live_avatar.inference import LipSyncTimeoutError, ModelState
+from gemini_live_avatar.model_server import ModelServer, RemoteInferenceExecutor
+
+
+class StuckExecutor:
+    """Executor whose jobs never finish, recording the ones the server cancels."""
+
+    queue_depth = 0
+    running = 0
+
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.cancelled = asyncio.Event()
+
+    async def submit(self, pcm, **kwargs):
+        self.started.set()
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            self.cancelled.set()
+            raise
+
+    async def warmup(self, languages):
+        await self.submit(b"")
+
+    def snapshot(self):
+        return {}
+
+    async def close(self):
+        pass
+
+
+async def serve(tmp_path):
+    executor = StuckExecutor()
+    server = ModelServer(executor, str(tmp_path / "lipsync.sock"))
+    server_task = asyncio.create_task(server.serve())
+    client = RemoteInferenceExecutor(server.socket_path)
+    for _ in range(100):
+        try:
+            await client._ensure_connected()
+            break
+        except OSError:
+            await asyncio.sleep(0.01)
+    return executor, client, server_task
+
+
+async def shutdown(client, server_task):
+    await client.close()
+    server_task.cancel()
+    await asyncio.gather(server_task, return_exceptions=True)
+
+
+def test_cancelled_request_is_dropped_on_the_server(tmp_path):
+    async def main():
+        executor, client, server_task = await serve(tmp_path)
+        try:
+            job = asyncio.create_task(client.submit(b"\0" * 320, timeout=30.0))
+            await asyncio.wait_for(executor.started.wait(), 1.0)
+            job.cancel()
+            await asyncio.wait_for(executor.cancelled.wait(), 1.0)
+        finally:
+            await shutdown(client, server_task)
+
+    asyncio.run(main())
+
+
+def test_timed_out_request_is_dropped_on_the_server(tmp_path):
+    async def main():
+        executor, client, server_task = await serve(tmp_path)
+        try:
+            with pytest.raises(LipSyncTimeoutError):
+                await client._request({"op": "align"}, b"\0" * 320, timeout=0.05)
+            await asyncio.wait_for(executor.cancelled.wait(), 1.0)
+        finally:
+            await shutdown(client, server_task)
+
+    asyncio.run(main())
+
+
+def test_warmup_is_bounded(tmp_path):
+    async def main():
+        executor, client, server_task = await serve(tmp_path)
+        try:
+            await client.warmup(["en"], warmup_timeout=0.05)
+            await asyncio.wait_for(executor.cancelled.wait(), 1.0)
+            return client.model_state
+        finally:
+            await shutdown(client, server_task)
+
+    assert asyncio.run(main()) == ModelState.FAILED
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+from mcp import types as mcp_types
+
+from gemini_live_avatar.mcp_server import MCPClient, MCPToolError
+from gemini_live_avatar.tool_executor import ToolResultCache
+
+
+class FakeSession:
+    def __init__(self, results):
+        self.results = list(results)
+
+    async def call_tool(self, name, arguments=None):
+        return self.results.pop(0)
+
+
+def tool_result(text, is_error=False):
+    return mcp_types.CallToolResult.model_validate(
+        {"content": [{"type": "text", "text": text}], "isError": is_error}
+    )
+
+
+def test_failed_call_is_retried():
+    cache = ToolResultCache({"lookup": 60.0})
+    calls = []
+
+    async def flaky():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            raise MCPToolError("upstream unavailable")
+        return "ok"
+
+    async def main():
+        with pytest.raises(MCPToolError):
+            await cache.get_or_run("lookup", {"q": 1}, flaky)
+        assert await cache.get_or_run("lookup", {"q": 1}, flaky) == "ok"
+        assert await cache.get_or_run("lookup", {"q": 1}, flaky) == "ok"
+
+    asyncio.run(main())
+    assert len(calls) == 2
+    assert cache.stats["lookup"].hits == 1
+
+
+def test_mcp_error_result_raises_and_is_not_cached():
+    client = MCPClient()
+    client.session = FakeSession([tool_result("quota exceeded", is_error=True), tool_result("COP")])
+    cache = ToolResultCache({"get_currency_country": 3600.0})
+    args = {"country": "Colombia"}
+
+    async def run():
+        return await client.execute_tool("get_currency_country", args)
+
+    async def main():
+        with pytest.raises(MCPToolError, match="quota exceeded"):
+            await cache.get_or_run("get_currency_country", args, run)
+        return await cache.get_or_run("get_currency_country", args, run)
+
+    assert asyncio.run(main()) == "COP"
+
+
+def test_concurrent_calls_share_one_execution():
+    cache = ToolResultCache({"lookup": 60.0})
+    calls = []
+
+    async def run():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_run("lookup", {"q": 1}, run) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["ok"] * 5
+    assert len(calls) == 1
+    assert cache.stats["lookup"].misses == 1
+    assert cache.stats["lookup"].hits == 4
+
+
+def test_waiters_retry_when_the_shared_call_is_cancelled():
+    cache = ToolResultCache({"lookup": 60.0})
+    calls = []
+
+    async def run():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    async def main():
+        owner = asyncio.create_task(cache.get_or_run("lookup", {"q": 1}, run))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_run("lookup", {"q": 1}, run))
+        await asyncio.sleep(0)
+        owner.cancel()
+        return await waiter
+
+    assert asyncio.run(main()) == "ok"
+    assert len(calls) == 2
@@ -0,0 +1,88 @@
+import asyncio
+
+from google.genai import types
+
+from gemini_live_avatar.tool_executor import ToolExecutor
+
+
+def call(name, call_id):
+    return types.FunctionCall(name=name, id=call_id, args={})
+
+
+async def slow_tool(function_call):
+    await asyncio.sleep(10)
+    return "done"
+
+
+def test_interrupted_calls_still_get_a_response():
+    async def main():
+        executor = ToolExecutor(slow_tool)
+        execution = asyncio.create_task(executor.execute([call("a", "1"), call("b", "2")]))
+        await asyncio.sleep(0.01)
+        assert executor.cancel() == 2
+        return await execution
+
+    responses = asyncio.run(main())
+    assert [r.id for r in responses] == ["1", "2"]
+    assert all("cancelled" in r.response["output"] for r in responses)
+
+
+def test_calls_cancelled_by_gemini_are_left_out():
+    async def main():
+        executor = ToolExecutor(slow_tool)
+        execution = asyncio.create_task(executor.execute([call("a", "1"), call("b", "2")]))
+        await asyncio.sleep(0.01)
+        assert executor.cancel(["1"]) == 1
+        await asyncio.sleep(0.01)
+        executor.cancel()
+        return await execution
+
+    responses = asyncio.run(main())
+    assert [r.id for r in responses] == ["2"]
+
+
+def test_call_that_times_out_gets_an_error_response():
+    async def main():
+        executor = ToolExecutor(slow_tool, default_timeout=5.0, tool_timeouts={"slow": 0.01})
+        return await executor.execute([call("slow", "1")])
+
+    responses = asyncio.run(main())
+    assert "timed out after 0.01s" in responses[0].response["output"]
+
+
+def test_results_keep_call_order_and_report_as_they_finish():
+    async def run_tool(function_call):
+        await asyncio.sleep(float(function_call.id) / 100)
+        return function_call.name
+
+    finished = []
+
+    async def on_result(function_call, result):
+        finished.append(result)
+
+    async def main():
+        executor = ToolExecutor(run_tool)
+        return await executor.execute([call("late", "3"), call("early", "1")], on_result=on_result)
+
+    responses = asyncio.run(main())
+    assert finished == ["early", "late"]
+    assert [r.response["output"] for r in responses] == ["late", "early"]
+
+
+def test_concurrency_is_bounded():
+    active = []
+    peak = []
+
+    async def run_tool(function_call):
+        active.append(function_call.id)
+        peak.append(len(active))
+        await asyncio.sleep(0.01)
+        active.remove(function_call.id)
+        return "ok"
+
+    async def main():
+        executor = ToolExecutor(run_tool, max_concurrency=2)
+        return await executor.execute([call("t", str(i)) for i in range(6)])
+
+    assert len(asyncio.run(main())) == 6
+    assert max(peak) == 2
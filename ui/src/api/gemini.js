@@ -1,3 +1,38 @@
+// Binary frame layout shared with src/gemini_live_avatar/framing.py:
+// [kind u8][metadata length u32 big-endian][metadata JSON][payload]
+const FRAME_HEADER_SIZE = 5;
+export const FrameKind = { AUDIO: 1, IMAGE: 2 };
+
+function arrayBufferToBase64(buffer) {
+  let binary = "";
+  const bytes = new Uint8Array(buffer);
+  for (let i = 0; i < bytes.byteLength; i++) {
+    binary += String.fromCharCode(bytes[i]);
+  }
+  return window.btoa(binary);
+}
+
+export function encodeFrame(kind, payload) {
+  const body = new Uint8Array(payload);
+  const frame = new Uint8Array(FRAME_HEADER_SIZE + body.byteLength);
+  const view = new DataView(frame.buffer);
+  view.setUint8(0, kind);
+  view.setUint32(1, 0);
+  frame.set(body, FRAME_HEADER_SIZE);
+  return frame.buffer;
+}
+
+export function decodeFrame(buffer) {
+  const view = new DataView(buffer);
+  const kind = view.getUint8(0);
+  const metaLength = view.getUint32(1);
+  const start = FRAME_HEADER_SIZE + metaLength;
+  const metadata = metaLength
+    ? JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, FRAME_HEADER_SIZE, metaLength)))
+    : null;
+  return { kind, metadata, payload: buffer.slice(start) };
+}
+
 export default class GeminiAPI {
   constructor(endpoint = null) {
     if (!endpoint) {
@@ -7,6 +42,7 @@ export default class GeminiAPI {
     this.endpoint = endpoint;
     this.ws = null;
     this.isSpeaking = false;
+    this.binaryFrames = false;
 
     // Reconnection settings
     this.shouldReconnect = true;
@@ -26,6 +62,7 @@ export default class GeminiAPI {
     this.onFunctionResponse = () => {};
     this.onInterrupted = () => {};
     this.onAudioData = () => {};
+    this.onAudioWords = () => {};
     this.onTextContent = () => {};
 
     this.connect();
@@ -34,6 +71,8 @@ export default class GeminiAPI {
   connect() {
     console.log(`🌐 Connecting to ${this.endpoint}`);
     this.ws = new WebSocket(this.endpoint);
+    this.ws.binaryType = "arraybuffer";
+    this.binaryFrames = false;
 
     this.ws.onopen = () => {
       console.log("✅ WebSocket connected.");
@@ -65,15 +104,37 @@ export default class GeminiAPI {
     this.ws.onmessage = this.onMessage;
   }
 
+  _handleBinaryFrame(buffer) {
+    const { kind, metadata, payload } = decodeFrame(buffer);
+    if (kind === FrameKind.AUDIO) {
+      this.onAudioData({ audio: payload, ...(metadata || {}) });
+    } else {
+      console.log('Received unknown frame kind:', kind);
+    }
+  }
+
   _defaultMessageHandler(event) {
     try {
+      if (event.data instanceof ArrayBuffer) {
+        this._handleBinaryFrame(event.data);
+        return;
+      }
       const data = JSON.parse(event.data);
       this.onMessageParsed(data);
-        if (data.type === 'interrupted') {
+        if (data.type === 'config') {
+            // Ask for binary media frames when the server offers them
+            if (data.framing?.includes('binary')) {
+                this.sendMessage({ type: "config", data: { framing: "binary" } });
+            }
+        } else if (data.type === 'config_ack') {
+            this.binaryFrames = data.data?.framing === 'binary';
+        } else if (data.type === 'interrupted') {
             this.isSpeaking = false;
             this.onInterrupted(data?.data);
         } else if (data.type === 'audio') {
             this.onAudioData(data?.data);
+        } else if (data.type === 'audio_words') {
+            this.onAudioWords(data?.data);
         } else if (data.type === 'text') {
             this.onTextContent(data?.data);
         } else if (data.type === 'turn_complete') {
@@ -142,12 +203,20 @@ export default class GeminiAPI {
     }
   }
 
-  sendAudioChunk(base64Audio) {
-    this.sendMessage({ type: "audio", data: base64Audio });
+  sendMedia(type, kind, buffer) {
+    if (this.binaryFrames && this.ws.readyState === WebSocket.OPEN) {
+      this.ws.send(encodeFrame(kind, buffer));
+    } else {
+      this.sendMessage({ type, data: arrayBufferToBase64(buffer) });
+    }
+  }
+
+  sendAudioChunk(audioBuffer) {
+    this.sendMedia("audio", FrameKind.AUDIO, audioBuffer);
   }
 
-  sendImage(base64Image) {
-    this.sendMessage({ type: "image", data: base64Image });
+  sendImage(imageBuffer) {
+    this.sendMedia("image", FrameKind.IMAGE, imageBuffer);
   }
 
   sendTextMessage(text) {
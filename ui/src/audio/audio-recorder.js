@@ -17,16 +17,6 @@ import EventEmitter3 from 'eventemitter3';
 import { createWorkletFromSrc, registeredWorklets } from "./audioworklet-registry.js";
 import AudioRecordingWorklet from "./audio-recording-worklet.js";
 
-function arrayBufferToBase64(buffer) {
-  var binary = "";
-  var bytes = new Uint8Array(buffer);
-  var len = bytes.byteLength;
-  for (var i = 0; i < len; i++) {
-    binary += String.fromCharCode(bytes[i]);
-  }
-  return window.btoa(binary);
-}
-
 export async function audioContext({ sampleRate }) {
   const context = new (window.AudioContext || window.webkitAudioContext)({ sampleRate });
   await context.resume();
@@ -79,8 +69,7 @@ export default class AudioRecorder extends EventEmitter3 {
         const arrayBuffer = ev.data.data.int16arrayBuffer;
 
         if (arrayBuffer) {
-          const arrayBufferString = arrayBufferToBase64(arrayBuffer);
-          this.emit("data", arrayBufferString);
+          this.emit("data", arrayBuffer);
         }
       };
       this.source.connect(this.recordingWorklet);
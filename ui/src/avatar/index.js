@@ -43,6 +43,9 @@ export default class Avatar {
     this.config = config;
     this.head = null;
     this.isStreaming = false;
+    this.turnAudioMs = 0; // ms of audio queued in the current turn
+    this.turnEnded = false;
+    this.playbackDrained = false; // every queued sample has played
     this.onTranscript = (currentWord) => {}
     this.onLoading = (status, progress) => {
       console.log(`Avatar loading: ${status}`, progress ? `Progress: ${progress.percent}%` : "");
@@ -113,13 +116,15 @@ export default class Avatar {
       if (!this.isStreaming) {
           console.log("Starting audio stream...");
           await this.head.streamStart(
-              {sampleRate: 24000, mood: "happy", lipsyncType: "words", gain: 3.0},
+              // Model-free lip-sync sends visemes instead of word timings
+              {sampleRate: 24000, mood: "happy", lipsyncType: opts.visemes ? "visemes" : "words", gain: 3.0},
               () => {
                 console.log("Audio playback started.");
               },
               () => {
                 console.log("Audio playback ended.");
                 this.isStreaming = false;
+                this.playbackDrained = true;
               },
               (subtitleText) => {
                 console.log("subtitleText: ", subtitleText);
@@ -129,12 +134,21 @@ export default class Avatar {
               }
           );
       }
-     console.log(opts);
+      if (this.turnEnded) {
+        this.resetTurn();
+      }
+      this.playbackDrained = false;
+      this.turnAudioMs += (audioData.length / 24000) * 1000;
       this.head.streamAudio({
         audio: audioData,
         words : opts.words,
         wtimes : opts.wtimes || [],
         wdurations : opts.wdurations || [],
+        ...(opts.visemes ? {
+          visemes: opts.visemes,
+          vtimes: opts.vtimes,
+          vdurations: opts.vdurations,
+        } : {}),
       });
       // this.head.speakAudio(audioData, opts);
     }
@@ -143,6 +157,40 @@ export default class Avatar {
     }
   }
 
+  /**
+   * Apply word timings received after the turn's audio was already streamed.
+   * Timings are relative to the start of the turn, so they are rebased onto
+   * the end of the audio queued so far. Segment-wise alignment may deliver
+   * several of these per turn. Timings that arrive once playback has drained
+   * describe audio that already played and are dropped.
+   * @param {{words: string[], wtimes: number[], wdurations: number[]}} timings
+   */
+  applyWords(timings) {
+    if (!this.head || !timings?.words?.length) {
+      return;
+    }
+    if (this.playbackDrained) {
+      console.log("Dropping word timings for audio that already played.");
+      return;
+    }
+    const offset = this.turnAudioMs;
+    this.head.streamAudio({
+      audio: new Int16Array(0),
+      words: timings.words,
+      wtimes: timings.wtimes.map((t) => t - offset),
+      wdurations: timings.wdurations,
+    });
+  }
+
+  endTurn() {
+    this.turnEnded = true;
+  }
+
+  resetTurn() {
+    this.turnAudioMs = 0;
+    this.turnEnded = false;
+  }
+
   /**
    * Make the avatar play a gesture.
    * @param gesture
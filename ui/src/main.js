@@ -151,6 +151,7 @@ geminiApi.onTurnComplete = () => {
             logMessage("debug", "⚠️ Avatar not loaded, skipping speech.");
         }
     }
+    avatar?.endTurn();
     geminiApi.isSpeaking = false;
     currentTurnText = "";
     lastAudioTurn = currentTurn;
@@ -182,13 +183,8 @@ geminiApi.onAudioData = async (audioMesage) => {
       lastAudioTurn = currentTurn;
     }
 
-    // Ensure audioData is base64 string
-    if (typeof audioData !== "string") {
-      console.error("Expected base64-encoded audio string, got:", typeof audioData);
-      return;
-    }
-    // Decode base64 to ArrayBuffer
-    const arrayBuffer = base64ToArrayBuffer(audioData);
+    // Binary frames carry the PCM as an ArrayBuffer, JSON messages as base64
+    const arrayBuffer = audioData instanceof ArrayBuffer ? audioData : base64ToArrayBuffer(audioData);
     const int16Array = new Int16Array(arrayBuffer);
     const float32Array = new Float32Array(int16Array.length);
     //
@@ -212,7 +208,7 @@ geminiApi.onAudioData = async (audioMesage) => {
   // source.start();
   // console.log("Speaking audio with words:", audioWords);
 
-  await avatar.speakAudio(int16Array, audioWords);
+  await avatar.speakAudio(int16Array, {...(audioWords || {}), ...(audioMesage.visemes || {})});
 
 
   } catch (error) {
@@ -221,6 +217,15 @@ geminiApi.onAudioData = async (audioMesage) => {
 };
 
 
+geminiApi.onAudioWords = (words) => {
+    // Streamed turns: audio already played, the lip-sync timings arrive afterwards
+    avatar?.applyWords(words);
+};
+
+geminiApi.onInterrupted = () => {
+    avatar?.resetTurn();
+};
+
 geminiApi.onFunctionCall = (fn) => {
     logMessage("debug", `🔧 Function call: ${fn.name} with args ${JSON.stringify(fn.args)}, response: ${fn.result}`);
     // Handle function calls here if needed
@@ -367,8 +372,8 @@ cameraBtn.addEventListener("click", async () => {
         if (started) {
             isUsingCamera = true;
             showPreviewAboveButton(cameraBtn);
-            mediaHandler.startFrameCapture((base64Image) => {
-                geminiApi.sendImage(base64Image);
+            mediaHandler.startFrameCapture((imageBuffer) => {
+                geminiApi.sendImage(imageBuffer);
             });
         }
     }
@@ -385,8 +390,8 @@ screenBtn.addEventListener("click", async () => {
         if (started) {
             isSharingScreen = true;
             showPreviewAboveButton(screenBtn);
-            mediaHandler.startFrameCapture((base64Image) => {
-                geminiApi.sendImage(base64Image);
+            mediaHandler.startFrameCapture((imageBuffer) => {
+                geminiApi.sendImage(imageBuffer);
             });
         }
     }
@@ -408,12 +413,12 @@ async function startRecording() {
         await audioRecorder.start();
         hasShownSpeakingMessage = false;
         currentTurn++;
-        audioRecorder.on('data', (base64Data) => {
+        audioRecorder.on('data', (audioBuffer) => {
             if (!hasShownSpeakingMessage) {
                 logMessage('debug', '🎤 Recording started, sending audio chunks...');
                 hasShownSpeakingMessage = true;
             }
-            geminiApi.sendAudioChunk(base64Data);
+            geminiApi.sendAudioChunk(audioBuffer);
         });
         isUsingMic = true;
     } catch (error) {
@@ -103,9 +103,12 @@ export default class MediaHandler {
 
       context.drawImage(this.videoElement, 0, 0, canvas.width, canvas.height);
 
-      // Convert to JPEG and base64 encode
-      const base64Image = canvas.toDataURL("image/jpeg", 0.8).split(",")[1];
-      this.frameCallback(base64Image);
+      // Convert to JPEG and hand over the raw bytes
+      canvas.toBlob(async (blob) => {
+        if (blob && this.frameCallback) {
+          this.frameCallback(await blob.arrayBuffer());
+        }
+      }, "image/jpeg", 0.8);
     };
 
     this.frameCapture = setInterval(captureFrame, 1000); // 1 FPS